@@ -2,6 +2,8 @@
 
 import bcrypt
 
+from telemetry import BCRYPT_DURATION
+
 
 def hash_password(password: str) -> str:
     """
@@ -16,7 +18,8 @@ def hash_password(password: str) -> str:
     # bcrypt only handles 72 bytes max, truncate if needed
     password_bytes = password.encode("utf-8")[:72]
     salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
+    with BCRYPT_DURATION.labels("hash").time():
+        hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode("utf-8")
 
 
@@ -34,6 +37,7 @@ def verify_password(password: str, hashed: str) -> bool:
     try:
         password_bytes = password.encode("utf-8")[:72]
         hashed_bytes = hashed.encode("utf-8")
-        return bcrypt.checkpw(password_bytes, hashed_bytes)
+        with BCRYPT_DURATION.labels("verify").time():
+            return bcrypt.checkpw(password_bytes, hashed_bytes)
     except (ValueError, TypeError):
         return False
@@ -0,0 +1,116 @@
+"""
+Offline recommender vs LLM advisory latency benchmark.
+
+Times the catalog recommender over seeded random profiles, then the LLM
+path (AdvisoryService.get_recommendations, hybrid mode, cache off) against
+the fake OpenAI-compatible server, or the configured provider with --live.
+
+Usage:
+    python -m benchmarks.advisory_offline [--profiles 5000] [--llm-calls 20] [--llm-latency 1.2] [--live]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+
+PORT = 8090
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def random_profiles(recommender, count: int, seed: int = 42) -> list:
+    """Profiles drawn from catalog tags, synonyms and held-certification aliases."""
+    from models.advisory import AdvisoryRequest
+
+    rng = random.Random(seed)
+    vocabulary = sorted({s for c in recommender.catalog for s in c.skills} | set(recommender.synonyms))
+    held_names = [name for c in recommender.catalog for name in [c.name, *c.aliases]]
+    return [
+        AdvisoryRequest(
+            skills=rng.sample(vocabulary, rng.randint(1, 6)),
+            current_certifications=rng.sample(held_names, rng.randint(0, 2)),
+        )
+        for _ in range(count)
+    ]
+
+
+def report(label: str, seconds: list[float], unit: str, scale: float) -> None:
+    seconds.sort()
+    print(
+        f"{label:<22}{len(seconds):>8}"
+        f"{percentile(seconds, 50) * scale:>12.1f}{percentile(seconds, 95) * scale:>12.1f}"
+        f"{percentile(seconds, 99) * scale:>12.1f}  {unit}"
+    )
+
+
+async def main(profiles: int, llm_calls: int, llm_latency: float, live: bool) -> None:
+    from services.offline_recommender import BUNDLED_CATALOG, OfflineRecommender
+
+    started = time.perf_counter()
+    recommender = OfflineRecommender.from_file(BUNDLED_CATALOG)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"catalog: {len(recommender.catalog)} certifications, "
+          f"{len(recommender.idf)} terms, loaded and indexed in {build_ms:.1f} ms")
+    print(f"{'path':<22}{'calls':>8}{'p50':>12}{'p95':>12}{'p99':>12}")
+
+    requests = random_profiles(recommender, profiles)
+    offline: list[float] = []
+    for request in requests:
+        started = time.perf_counter()
+        recommender.recommend(request)
+        offline.append(time.perf_counter() - started)
+    report("offline recommender", offline, "us", 1e6)
+
+    from services.advisory_service import AdvisoryService
+
+    server = task = None
+    if not live:
+        from benchmarks.fake_openai import FakeUpstream, start_server
+
+        upstream = FakeUpstream(latency=llm_latency, jitter=llm_latency / 4,
+                                failure_rate=0.0, hang_rate=0.0)
+        server, task = await start_server(upstream, PORT)
+
+    service = AdvisoryService()
+    llm: list[float] = []
+    try:
+        for request in requests[:llm_calls]:
+            started = time.perf_counter()
+            await service.get_recommendations(request)
+            llm.append(time.perf_counter() - started)
+    finally:
+        await service.aclose()
+        if server is not None:
+            server.should_exit = True
+            await task
+    report("llm (live)" if live else "llm (fake upstream)", llm, "ms", 1e3)
+
+    speedup = percentile(sorted(llm), 50) / percentile(sorted(offline), 50)
+    print(f"median speedup: {speedup:,.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profiles", type=int, default=5000)
+    parser.add_argument("--llm-calls", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=1.2,
+                        help="Fake upstream seconds per completion")
+    parser.add_argument("--live", action="store_true",
+                        help="Call the configured OpenAI endpoint instead of the fake one")
+    args = parser.parse_args()
+
+    # Must be in place before config is imported
+    os.environ["ADVISORY_CACHE_ENABLED"] = "false"
+    os.environ["ADVISORY_MODE"] = "hybrid"
+    if not args.live:
+        os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+        os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+        os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{PORT}/v1"
+
+    asyncio.run(main(args.profiles, args.llm_calls, args.llm_latency, args.live))
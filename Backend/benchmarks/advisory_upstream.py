@@ -0,0 +1,118 @@
+"""
+Advisory upstream resilience benchmark.
+
+Runs AdvisoryService against the fake OpenAI-compatible server (started
+in-process) through five phases: healthy, failing, hanging, probing and recovered.
+For each phase it reports client latency, how many requests fell back, and
+how many calls actually reached the upstream, which shows the concurrency
+limit, the per-call deadline and the circuit breaker at work.
+
+Usage:
+    python -m benchmarks.advisory_upstream [--requests 200] [--concurrency 40]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+PORT = 8089
+
+# Must be in place before config is imported
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{PORT}/v1"
+os.environ["ADVISORY_CACHE_ENABLED"] = "false"
+os.environ["ADVISORY_MODE"] = "llm"  # Fallbacks stay empty, so they can be counted
+os.environ.setdefault("ADVISORY_TIMEOUT_SECONDS", "1.0")
+os.environ.setdefault("ADVISORY_BREAKER_RESET_SECONDS", "2.0")
+
+from benchmarks.fake_openai import FakeUpstream, start_server  # noqa: E402
+from config import get_settings  # noqa: E402
+from models.advisory import AdvisoryRequest  # noqa: E402
+from services.advisory_service import AdvisoryService  # noqa: E402
+
+HEALTHY = {"latency": 0.3, "failure_rate": 0.0, "hang_rate": 0.0}
+
+# (label, upstream knobs, wait out the open period first)
+PHASES = [
+    ("healthy", HEALTHY, False),
+    ("failing (503)", {**HEALTHY, "failure_rate": 1.0}, False),
+    ("hanging", {**HEALTHY, "hang_rate": 1.0}, True),
+    ("probing", HEALTHY, True),
+    ("recovered", HEALTHY, False),
+]
+
+
+async def run_phase(service: AdvisoryService, total: int, concurrency: int) -> dict:
+    """Send total requests with bounded concurrency; collect latencies."""
+    latencies: list[float] = []
+    fallbacks = 0
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        nonlocal fallbacks
+        async with gate:
+            started = time.perf_counter()
+            result = await service.get_recommendations_with_fallback(
+                AdvisoryRequest(skills=[f"skill-{i}", "aws"])
+            )
+            latencies.append(time.perf_counter() - started)
+            if not result.recommendations:
+                fallbacks += 1
+
+    await asyncio.gather(*(one(i) for i in range(total)))
+    latencies.sort()
+    return {
+        "fallbacks": fallbacks,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "max": latencies[-1],
+    }
+
+
+async def main(total: int, concurrency: int) -> None:
+    settings = get_settings()
+    upstream = FakeUpstream(latency=0.3, jitter=0.05, failure_rate=0.0, hang_rate=0.0)
+    server, server_task = await start_server(upstream, PORT)
+
+    service = AdvisoryService()
+    print(
+        f"limit={settings.ADVISORY_MAX_CONCURRENCY} in flight, "
+        f"deadline={settings.ADVISORY_TIMEOUT_SECONDS}s, "
+        f"breaker={settings.ADVISORY_BREAKER_FAILURE_THRESHOLD} failures / "
+        f"{settings.ADVISORY_BREAKER_RESET_SECONDS}s"
+    )
+    print(
+        f"{'phase':<16}{'fallback':>10}{'upstream':>10}{'peak':>6}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}  breaker"
+    )
+    try:
+        for label, knobs, wait_reset in PHASES:
+            for key, value in knobs.items():
+                setattr(upstream, key, value)
+            if wait_reset:
+                # Let the open period lapse so the next call is a half-open probe
+                await asyncio.sleep(settings.ADVISORY_BREAKER_RESET_SECONDS)
+
+            before, upstream.max_in_flight = upstream.requests, 0
+            result = await run_phase(service, total, concurrency)
+            print(
+                f"{label:<16}{result['fallbacks']:>10}{upstream.requests - before:>10}"
+                f"{upstream.max_in_flight:>6}{result['p50'] * 1000:>10.1f}"
+                f"{result['p95'] * 1000:>10.1f}{result['max'] * 1000:>10.1f}  "
+                f"{service.breaker.state}"
+            )
+    finally:
+        await service.aclose()
+        server.should_exit = True
+        await server_task
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=40)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
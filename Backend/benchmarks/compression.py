@@ -0,0 +1,167 @@
+"""
+Response compression benchmark.
+
+For a certification-list-shaped JSON body of each size, reports the
+compressed size and cost per encoding (br only when brotli is installed)
+and the cost of a cache hit. Then, while a batch of uncached large
+responses is being compressed, measures the latency of a trivial
+endpoint with compression inline vs offloaded to the threadpool, which
+shows how long the event loop is blocked.
+
+Usage:
+    python -m benchmarks.compression [--rows 1000 10000] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+# Settings without defaults must exist for config to import
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from starlette.applications import Starlette  # noqa: E402
+from starlette.responses import PlainTextResponse, Response  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+from middleware.compression import CompressionMiddleware  # noqa: E402
+
+
+def certification_payload(rows: int, seed: int = 5) -> bytes:
+    """JSON shaped like GET /certs (same fields, realistic repetition)."""
+    rng = random.Random(seed)
+    vendors = ["AWS", "Microsoft", "Google Cloud", "Cisco", "CompTIA", "Oracle"]
+    return json.dumps([
+        {
+            "vendor_oem": rng.choice(vendors),
+            "certification_name": f"Certification {rng.randrange(300)}",
+            "credential_id": f"{rng.getrandbits(40):x}" if rng.random() < 0.7 else None,
+            "date_obtained": f"202{rng.randrange(5)}-0{rng.randrange(1, 10)}-1{rng.randrange(10)}",
+            "expiry_date": f"202{rng.randrange(5, 10)}-0{rng.randrange(1, 10)}-1{rng.randrange(10)}",
+            "id": f"CERT-2026-{i:04d}",
+            "employee_id": (employee := rng.randrange(2000)),
+            "employee_name": f"Employee {employee}",
+            "employee_email": f"employee{employee}@example.com",
+            "file_path": f"uploads/blobs/{(digest := f'{rng.getrandbits(256):064x}')[:2]}/{digest}.pdf",
+            "file_sha256": digest,
+            "file_mime_type": "application/pdf",
+            "thumbnail_path": None,
+            "preview_path": None,
+            "status": rng.choice(["active", "expired", "in_progress", "never_expires"]),
+            "validated_by": 2 if rng.random() < 0.6 else None,
+            "validated_at": "2026-05-01T09:30:00",
+            "created_at": "2026-04-01T08:00:00",
+        }
+        for i in range(rows)
+    ], separators=(",", ":")).encode()
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def encoding_costs(body: bytes) -> None:
+    middleware = CompressionMiddleware(app=None)
+    for encoding, encode in middleware._encoders.items():
+        compressed = encode(body)
+        seconds = best_of(lambda: encode(body))
+        middleware._encode(body, encoding)  # Populate the cache
+        hit = best_of(lambda: middleware._encode(body, encoding))
+        print(f"  {encoding:<5}{len(compressed) / 1024:>10.0f} KiB{len(body) / len(compressed):>8.1f}:1"
+              f"{seconds * 1000:>10.1f} ms{hit * 1000:>12.2f} ms")
+
+
+async def _get(app, path: str) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"accept-encoding", b"gzip")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    done = asyncio.Event()
+
+    async def receive():
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and not message.get("more_body"):
+            done.set()
+
+    await app(scope, receive, send)
+
+
+async def loop_blocking(body: bytes, concurrency: int, offload_size: int) -> tuple[float, float]:
+    """(max ping ms, total seconds) while `concurrency` uncached bodies compress."""
+    counter = 0
+
+    async def big(request):
+        nonlocal counter
+        counter += 1  # Vary the body so nothing is served from the cache
+        return Response(body + b" " * counter, media_type="application/json")
+
+    async def ping(request):
+        return PlainTextResponse("pong")
+
+    app = CompressionMiddleware(
+        Starlette(routes=[Route("/big", big), Route("/ping", ping)]),
+        offload_size=offload_size,
+        cache_entries=0,
+    )
+    stop = False
+    worst = 0.0
+
+    async def pinger():
+        nonlocal worst
+        while not stop:
+            started = time.perf_counter()
+            await _get(app, "/ping")
+            await asyncio.sleep(0)
+            worst = max(worst, time.perf_counter() - started)
+
+    task = asyncio.create_task(pinger())
+    await asyncio.sleep(0.01)
+    started = time.perf_counter()
+    await asyncio.gather(*(_get(app, "/big") for _ in range(concurrency)))
+    total = time.perf_counter() - started
+    stop = True
+    await task
+    return worst * 1000, total
+
+
+async def main(sizes: list[int], concurrency: int) -> None:
+    for rows in sizes:
+        body = certification_payload(rows)
+        print(f"\n{rows} rows, {len(body) / 1024:.0f} KiB JSON")
+        print(f"  {'enc':<5}{'size':>14}{'ratio':>10}{'compress':>13}{'cache hit':>15}")
+        encoding_costs(body)
+
+        inline = await loop_blocking(body, concurrency, offload_size=1 << 62)
+        offloaded = await loop_blocking(body, concurrency, offload_size=64 * 1024)
+        print(f"  {concurrency} concurrent gzip responses: worst /ping "
+              f"{inline[0]:.1f} ms inline vs {offloaded[0]:.1f} ms offloaded "
+              f"(batch {inline[1] * 1000:.0f} vs {offloaded[1] * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.concurrency))
@@ -0,0 +1,233 @@
+"""
+Seeded synthetic data generator.
+
+Fills the configured database (DATABASE_PATH) with employees,
+certifications and audit logs. The same seed and counts always produce
+the same rows (bar the bcrypt salt of the one shared password hash), so
+benchmark runs on different machines or commits see identical data. Certification names and vendors come from the bundled
+advisory catalog. Rows are streamed in batches with the secondary
+indexes dropped, then the indexes are rebuilt (about 30 s per million
+certifications plus two million audit logs).
+
+Usage:
+    python -m benchmarks.datagen --db data/bench.db [--employees 5000]
+        [--certifications 1000000] [--audit-logs 2000000] [--seed 42]
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from itertools import accumulate, islice
+from pathlib import Path
+from typing import Iterator
+
+BATCH_SIZE = 50_000
+DEPARTMENTS = [
+    "Engineering", "Infrastructure", "Security", "Data", "Support",
+    "Consulting", "Sales Engineering", "Finance", "Operations", "Product",
+]
+MANAGER_SHARE = 0.05
+# Every generated employee can log in with this password
+BENCHMARK_PASSWORD = "Bench@#2026"
+
+# Same window for every run regardless of when it happens
+_END = datetime(2026, 6, 30)
+_START = _END - timedelta(days=6 * 365)
+_HOUR_MICROS = 3600 * 1_000_000
+_DAY_MICROS = 24 * _HOUR_MICROS
+
+
+def _batched(rows: Iterator[tuple], size: int = BATCH_SIZE) -> Iterator[list[tuple]]:
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _catalog() -> list[tuple[str, str]]:
+    from services.offline_recommender import BUNDLED_CATALOG
+
+    data = json.loads(Path(BUNDLED_CATALOG).read_text())
+    return [(c["vendor"], c["name"]) for c in data["certifications"]]
+
+
+def _employees(rng: random.Random, count: int, password_hash: str) -> Iterator[tuple]:
+    created = datetime(2020, 1, 1).isoformat(sep=" ")
+    for n in range(1, count + 1):
+        role = "manager" if rng.random() < MANAGER_SHARE else "employee"
+        yield (
+            n, f"employee{n}@example.com", password_hash, f"Employee {n}",
+            role, rng.choice(DEPARTMENTS), created, created,
+        )
+
+
+def _certifications(rng: random.Random, count: int, employees: int, sequences: dict) -> Iterator[tuple]:
+    # Integer arithmetic on encoded values throughout: datetime objects and
+    # randrange() would triple the cost per row
+    from database.codecs import datetime_to_micros
+
+    catalog = _catalog()
+    start = datetime_to_micros(_START)
+    span_seconds = int((_END - _START).total_seconds())
+    year_starts = [datetime_to_micros(datetime(y, 1, 1)) for y in range(_START.year + 1, _END.year + 1)]
+    uniform = rng.random
+    for _ in range(count):
+        created = start + int(uniform() * span_seconds) * 1_000_000
+        obtained = created // _DAY_MICROS - int(uniform() * 60)
+        expiry = None if uniform() < 0.2 else obtained + 365 * (1 + int(uniform() * 3))
+        validated = uniform() < 0.7
+        validated_at = created + (1 + int(uniform() * 239)) * _HOUR_MICROS if validated else None
+
+        year = _START.year + bisect_right(year_starts, created)
+        sequences[year] = sequences.get(year, 0) + 1
+        vendor, name = catalog[int(uniform() * len(catalog))]
+        employee_id = 1 + int(uniform() * employees)
+        yield (
+            f"CERT-{year}-{sequences[year]:04d}", employee_id, f"Employee {employee_id}",
+            f"employee{employee_id}@example.com", vendor, name,
+            f"{rng.getrandbits(48):012X}" if uniform() < 0.8 else None,
+            obtained, expiry, 1 + int(uniform() * employees) if validated else None,
+            validated_at, created, created,
+        )
+
+
+def _audit_logs(rng: random.Random, count: int, employees: int, sequences: dict) -> Iterator[tuple]:
+    from database.codecs import datetime_to_micros
+
+    actions = [
+        ("LOGIN", "auth", 0.45), ("VIEW", "certification", 0.25), ("UPLOAD", "certification", 0.12),
+        ("VALIDATE", "certification", 0.08), ("ADVISORY", "advisory", 0.06),
+        ("DELETE", "certification", 0.02), ("EXPORT", "certification", 0.02),
+    ]
+    cumulative = list(accumulate(w for _, _, w in actions))
+    years = sorted(sequences)
+    step = (_END - _START).total_seconds() * 1_000_000 / max(count, 1)
+    start = datetime_to_micros(_START)
+    uniform = rng.random
+    for n in range(count):
+        action, entity_type, _ = actions[bisect_right(cumulative, uniform() * cumulative[-1])]
+        employee = 1 + int(uniform() * employees)
+        entity_id = None
+        if entity_type == "certification" and years:
+            year = years[int(uniform() * len(years))]
+            entity_id = f"CERT-{year}-{1 + int(uniform() * sequences[year]):04d}"
+        yield (
+            start + int(n * step), "manager" if action == "VALIDATE" else "employee",
+            f"employee{employee}@example.com", action, entity_type, entity_id,
+            None, f"10.{employee % 256}.{int(uniform() * 256)}.{1 + int(uniform() * 254)}",
+        )
+
+
+def generate(
+    employees: int = 2_000,
+    certifications: int = 50_000,
+    audit_logs: int = 100_000,
+    seed: int = 42,
+) -> dict:
+    """
+    Replace the contents of the configured database with generated rows.
+
+    Args:
+        employees: Employee count (ids 1..employees, ~5% managers)
+        certifications: Certification count, spread over six years
+        audit_logs: Audit log count, in timestamp order
+        seed: Random seed; equal arguments give identical databases
+
+    Returns:
+        Dict with the row counts and generation seconds
+    """
+    from auth.password import hash_password
+    from database.connection import get_db
+    from database.migrations import create_tables
+
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    create_tables()
+    password_hash = hash_password(BENCHMARK_PASSWORD)  # One bcrypt, shared by everyone
+    sequences: dict[int, int] = {}
+
+    with get_db() as conn:
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA journal_mode = MEMORY")
+        for table in ("audit_logs", "certifications", "employees", "cert_sequence"):
+            conn.execute(f"DELETE FROM {table}")
+        conn.execute("DELETE FROM sqlite_sequence WHERE name IN ('employees', 'audit_logs')")
+        # Bulk load without secondary indexes; create_tables() rebuilds them
+        for (name,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%' "
+            "AND tbl_name IN ('certifications', 'audit_logs')"
+        ).fetchall():
+            conn.execute(f"DROP INDEX {name}")
+
+        for batch in _batched(_employees(rng, employees, password_hash)):
+            conn.executemany(
+                """
+                INSERT INTO employees (
+                    id, email, password_hash, name, role, department, created_at, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                batch,
+            )
+        for batch in _batched(_certifications(rng, certifications, employees, sequences)):
+            conn.executemany(
+                """
+                INSERT INTO certifications (
+                    id, employee_id, employee_name, employee_email, vendor_oem,
+                    certification_name, credential_id, date_obtained, expiry_date,
+                    validated_by, validated_at, created_at, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                batch,
+            )
+        # Keep CertificationRepository.generate_cert_id() from reusing ids
+        conn.executemany(
+            "INSERT INTO cert_sequence (year, last_number) VALUES (?, ?)",
+            sorted(sequences.items()),
+        )
+        for batch in _batched(_audit_logs(rng, audit_logs, employees, sequences)):
+            conn.executemany(
+                """
+                INSERT INTO audit_logs (
+                    timestamp, actor_role, actor_email, action, entity_type,
+                    entity_id, notes, ip_address
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                batch,
+            )
+
+    create_tables()
+    with get_db() as conn:
+        conn.execute("ANALYZE")
+
+    return {
+        "employees": employees,
+        "certifications": certifications,
+        "audit_logs": audit_logs,
+        "seed": seed,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", required=True, help="Database file to (re)create")
+    parser.add_argument("--employees", type=int, default=2_000)
+    parser.add_argument("--certifications", type=int, default=50_000)
+    parser.add_argument("--audit-logs", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Must be in place before config is imported
+    os.environ["DATABASE_PATH"] = args.db
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ.setdefault("DB_SLOW_QUERY_MS", "0")  # Bulk statements are slow by design
+
+    summary = generate(args.employees, args.certifications, args.audit_logs, args.seed)
+    print(f"{args.db}: {summary['employees']} employees, {summary['certifications']} certifications, "
+          f"{summary['audit_logs']} audit logs in {summary['seconds']} s (seed {summary['seed']})")
@@ -0,0 +1,187 @@
+"""
+ISO text vs integer date storage benchmark.
+
+Seeds a database with the legacy TEXT date schema, copies it, migrates the
+copy with create_tables() (timed), then compares both layouts: table and
+index sizes, a full certification read with date decoding, a 90-day expiry
+range scan and a deep audit log page.
+
+Usage:
+    python -m benchmarks.date_storage [--certs 100000] [--audit 200000]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Must be in place before config is imported
+_tmp = Path(tempfile.mkdtemp(prefix="certtrack-bench-"))
+LEGACY_DB = _tmp / "legacy.db"
+MIGRATED_DB = _tmp / "migrated.db"
+os.environ["DATABASE_PATH"] = str(MIGRATED_DB)
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from database import codecs  # noqa: E402
+from database.migrations import create_tables  # noqa: E402
+
+# Schema as it was before the integer encoding
+LEGACY_SCHEMA = """
+    CREATE TABLE certifications (
+        id TEXT PRIMARY KEY, employee_id INTEGER NOT NULL, employee_name TEXT NOT NULL,
+        employee_email TEXT NOT NULL, vendor_oem TEXT NOT NULL,
+        certification_name TEXT NOT NULL, credential_id TEXT,
+        date_obtained TEXT NOT NULL, expiry_date TEXT, file_path TEXT,
+        file_sha256 TEXT, file_mime_type TEXT, thumbnail_path TEXT, preview_path TEXT,
+        validated_by INTEGER, validated_at TEXT,
+        created_at TEXT DEFAULT (datetime('now')), updated_at TEXT DEFAULT (datetime('now'))
+    );
+    CREATE TABLE audit_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT DEFAULT (datetime('now')),
+        actor_role TEXT NOT NULL, actor_email TEXT NOT NULL, action TEXT NOT NULL,
+        entity_type TEXT NOT NULL, entity_id TEXT, notes TEXT, ip_address TEXT
+    );
+    CREATE INDEX idx_certs_employee ON certifications(employee_id);
+    CREATE INDEX idx_certs_expiry ON certifications(expiry_date);
+    CREATE INDEX idx_audit_actor ON audit_logs(actor_email);
+    CREATE INDEX idx_audit_entity ON audit_logs(entity_type, entity_id);
+"""
+
+RANGE_START = date(2027, 1, 1)
+RANGE_DAYS = 90
+
+
+def seed_legacy(certs: int, audit: int, seed: int = 11) -> None:
+    """Create the legacy database with ISO text dates."""
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1)
+
+    def moment() -> str:
+        return str(start + timedelta(seconds=rng.randrange(4 * 365 * 86400)))
+
+    conn = sqlite3.connect(LEGACY_DB)
+    conn.executescript(LEGACY_SCHEMA)
+    rows = []
+    for i in range(certs):
+        obtained = date(2020, 1, 1) + timedelta(days=rng.randrange(6 * 365))
+        expiry = obtained + timedelta(days=rng.choice([365, 730, 1095])) if rng.random() < 0.8 else None
+        validated = moment() if rng.random() < 0.6 else None
+        rows.append((
+            f"CERT-{i:07d}", rng.randrange(5000), "Employee", "employee@example.com", "AWS",
+            "Solutions Architect", None, obtained.isoformat(),
+            expiry.isoformat() if expiry else None, validated and 1, validated, moment(), moment(),
+        ))
+    conn.executemany(
+        """
+        INSERT INTO certifications (
+            id, employee_id, employee_name, employee_email, vendor_oem, certification_name,
+            credential_id, date_obtained, expiry_date, validated_by, validated_at,
+            created_at, updated_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    conn.executemany(
+        """
+        INSERT INTO audit_logs (timestamp, actor_role, actor_email, action, entity_type, entity_id)
+        VALUES (?, 'manager', 'manager@example.com', 'VALIDATE', 'certification', ?)
+        """,
+        [(moment(), f"CERT-{rng.randrange(max(certs, 1)):07d}") for _ in range(audit)],
+    )
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def object_sizes(path: Path) -> dict[str, int]:
+    conn = sqlite3.connect(path)
+    sizes = dict(conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"))
+    conn.close()
+    return sizes
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def workloads(path: Path, legacy: bool) -> dict[str, float]:
+    """Seconds per workload against one layout."""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    end = RANGE_START + timedelta(days=RANGE_DAYS)
+    if legacy:
+        bounds = (RANGE_START.isoformat(), end.isoformat())
+        day = lambda v: date.fromisoformat(v) if v else None  # noqa: E731
+        moment = lambda v: datetime.fromisoformat(v) if v else None  # noqa: E731
+    else:
+        bounds = (codecs.date_to_days(RANGE_START), codecs.date_to_days(end))
+        day = lambda v: codecs.days_to_date(v) if v is not None else None  # noqa: E731
+        moment = lambda v: codecs.micros_to_datetime(v) if v is not None else None  # noqa: E731
+
+    def read_all():
+        for row in conn.execute("SELECT * FROM certifications ORDER BY created_at DESC"):
+            day(row["date_obtained"]), day(row["expiry_date"])
+            moment(row["validated_at"]), moment(row["created_at"])
+
+    def expiry_range():
+        conn.execute(
+            "SELECT id, expiry_date FROM certifications WHERE expiry_date BETWEEN ? AND ?", bounds
+        ).fetchall()
+
+    def audit_page():
+        conn.execute(
+            "SELECT * FROM audit_logs ORDER BY timestamp DESC, id DESC LIMIT 100 OFFSET 5000"
+        ).fetchall()
+
+    results = {
+        "read all + decode": best_of(read_all, 5),
+        "expiry 90-day range": best_of(expiry_range, 20),
+        "audit page (offset 5000)": best_of(audit_page, 5),
+    }
+    conn.close()
+    return results
+
+
+def main(certs: int, audit: int) -> None:
+    seed_legacy(certs, audit)
+    shutil.copy(LEGACY_DB, MIGRATED_DB)
+
+    started = time.perf_counter()
+    create_tables()
+    migrate_seconds = time.perf_counter() - started
+    conn = sqlite3.connect(MIGRATED_DB)
+    conn.execute("VACUUM")
+    conn.close()
+    print(f"{certs} certifications, {audit} audit rows; migrated in {migrate_seconds:.2f} s")
+
+    before, after = object_sizes(LEGACY_DB), object_sizes(MIGRATED_DB)
+    print(f"\n{'object':<28}{'text KiB':>10}{'int KiB':>10}")
+    for name in ("certifications", "idx_certs_expiry", "audit_logs", "idx_audit_timestamp"):
+        print(f"{name:<28}{before.get(name, 0) / 1024:>10.0f}{after.get(name, 0) / 1024:>10.0f}")
+
+    legacy, migrated = workloads(LEGACY_DB, legacy=True), workloads(MIGRATED_DB, legacy=False)
+    print(f"\n{'workload':<28}{'text ms':>10}{'int ms':>10}{'speedup':>9}")
+    for name, seconds in legacy.items():
+        print(f"{name:<28}{seconds * 1000:>10.1f}{migrated[name] * 1000:>10.1f}"
+              f"{seconds / migrated[name]:>8.1f}x")
+    shutil.rmtree(_tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--certs", type=int, default=100000)
+    parser.add_argument("--audit", type=int, default=200000)
+    args = parser.parse_args()
+    main(args.certs, args.audit)
@@ -0,0 +1,212 @@
+"""
+Fake OpenAI-compatible chat completions server.
+
+Answers ``POST /v1/chat/completions`` (plain and ``stream: true``) with a
+valid advisory JSON payload after a configurable delay, and fails a
+configurable share of calls, so timeouts, the concurrency limit and the
+circuit breaker can be exercised without a real provider. Knobs can be
+changed at runtime with ``POST /_control`` (same field names as the flags);
+``GET /_control`` returns them plus request counters.
+
+Usage:
+    python -m benchmarks.fake_openai [--port 8089] [--latency 0.5] [--failure-rate 0.1]
+
+Then start the API with OPENAI_BASE_URL=http://127.0.0.1:8089/v1.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+ADVISORY_PAYLOAD = {
+    "recommendations": [
+        {
+            "certification_name": "AWS Certified Solutions Architect - Associate",
+            "vendor": "AWS",
+            "difficulty": "Intermediate",
+            "reason": "Builds on existing cloud skills with architecture design.",
+            "estimated_prep_time": "2-3 months",
+        },
+        {
+            "certification_name": "Certified Kubernetes Administrator (CKA)",
+            "vendor": "CNCF",
+            "difficulty": "Intermediate",
+            "reason": "Validates container orchestration skills used in production.",
+            "estimated_prep_time": "2 months",
+        },
+        {
+            "certification_name": "HashiCorp Certified: Terraform Associate",
+            "vendor": "HashiCorp",
+            "difficulty": "Beginner",
+            "reason": "Covers infrastructure as code across cloud providers.",
+            "estimated_prep_time": "1 month",
+        },
+    ],
+    "confidence": "high",
+    "clarification_needed": None,
+}
+
+# Characters per streamed delta
+STREAM_CHUNK_CHARS = 24
+
+
+class FakeUpstream:
+    """Mutable knobs and counters shared by the handlers."""
+
+    def __init__(self, latency: float, jitter: float, failure_rate: float, hang_rate: float):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.hang_rate = hang_rate
+        self.requests = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def knobs(self) -> dict:
+        return {
+            "latency": self.latency,
+            "jitter": self.jitter,
+            "failure_rate": self.failure_rate,
+            "hang_rate": self.hang_rate,
+        }
+
+    def delay(self) -> float:
+        if random.random() < self.hang_rate:
+            return 3600.0  # Effectively never answers
+        return max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+
+
+def build_app(upstream: FakeUpstream) -> Starlette:
+    """Build the fake server around a FakeUpstream."""
+
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "fake-model")
+        upstream.requests += 1
+        upstream.in_flight += 1
+        upstream.max_in_flight = max(upstream.max_in_flight, upstream.in_flight)
+        try:
+            delay = upstream.delay()
+            if random.random() < upstream.failure_rate:
+                await asyncio.sleep(delay / 2)
+                upstream.failures += 1
+                return JSONResponse(
+                    status_code=503,
+                    content={"error": {"message": "fake upstream failure", "type": "server_error"}},
+                )
+
+            content = json.dumps(ADVISORY_PAYLOAD)
+            if body.get("stream"):
+                return StreamingResponse(
+                    _stream_chunks(upstream, model, content, delay),
+                    media_type="text/event-stream",
+                )
+
+            await asyncio.sleep(delay)
+            return JSONResponse({
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 400, "completion_tokens": 200, "total_tokens": 600},
+            })
+        finally:
+            upstream.in_flight -= 1
+
+    async def control(request: Request):
+        if request.method == "POST":
+            for key, value in (await request.json()).items():
+                if key in upstream.knobs():
+                    setattr(upstream, key, float(value))
+        return JSONResponse({
+            **upstream.knobs(),
+            "requests": upstream.requests,
+            "failures": upstream.failures,
+            "max_in_flight": upstream.max_in_flight,
+        })
+
+    return Starlette(routes=[
+        Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+        Route("/_control", control, methods=["GET", "POST"]),
+    ])
+
+
+async def _stream_chunks(upstream: FakeUpstream, model: str, content: str, delay: float):
+    """Spread the delay over the deltas, like a token stream."""
+    pieces = [content[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+    step = delay / len(pieces)
+    for i, piece in enumerate(pieces):
+        await asyncio.sleep(step)
+        delta = {"role": "assistant", "content": piece} if i == 0 else {"content": piece}
+        yield _sse_chunk(model, delta, None)
+    yield _sse_chunk(model, {}, "stop")
+    yield "data: [DONE]\n\n"
+
+
+def _sse_chunk(model: str, delta: dict, finish_reason) -> str:
+    chunk = {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+async def start_server(upstream: FakeUpstream, port: int):
+    """
+    Serve the fake upstream on the running event loop (for in-process harnesses).
+
+    Returns:
+        (uvicorn.Server, serving task); set ``server.should_exit`` and await
+        the task to stop it
+    """
+    import uvicorn
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            build_app(upstream),
+            host="127.0.0.1",
+            port=port,
+            log_level="warning",
+            timeout_graceful_shutdown=1,  # Hung fake calls never finish on their own
+        )
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server, task
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the upstream knobs on a parser (shared with other harnesses)."""
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per completion")
+    parser.add_argument("--jitter", type=float, default=0.1, help="+/- seconds of uniform noise")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of 503 responses")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Share of calls that never answer")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    add_arguments(parser)
+    args = parser.parse_args()
+    upstream = FakeUpstream(args.latency, args.jitter, args.failure_rate, args.hang_rate)
+    uvicorn.run(build_app(upstream), host=args.host, port=args.port, log_level="warning")
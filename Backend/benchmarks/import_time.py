@@ -0,0 +1,126 @@
+"""
+Cold-start import cost benchmark.
+
+Imports the app in fresh interpreters under ``python -X importtime``,
+keeps the fastest of several runs per module, and reports the total plus
+the self time summed per top-level package. Exits non-zero when a module
+that must stay lazy (the LangChain/OpenAI stack, Pillow, ...) is imported
+at startup, or when ``--compare`` finds a regression against a saved run.
+
+Usage:
+    python -m benchmarks.import_time [--runs 5] [--top 15]
+    python -m benchmarks.import_time --save before.json
+    python -m benchmarks.import_time --compare before.json [--tolerance 0.25]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Imported on demand only; loading any of these at startup is a regression
+LAZY_MODULES = ("langchain_core", "langchain_openai", "openai", "httpx", "PIL", "pypdfium2", "numpy")
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure_once(module: str) -> dict[str, tuple[int, int]]:
+    """Import module in a fresh interpreter; returns {name: (self_us, cumulative_us)}."""
+    env = dict(os.environ)
+    # Settings without defaults must exist for config to import
+    env.setdefault("JWT_SECRET_KEY", "benchmark")
+    env.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            timings[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return timings
+
+
+def measure(module: str, runs: int) -> dict:
+    """Best-of-runs timings, summarized per package."""
+    best: dict[str, tuple[int, int]] = {}
+    for _ in range(runs):
+        for name, (self_us, cumulative_us) in measure_once(module).items():
+            previous = best.get(name)
+            if previous is None or cumulative_us < previous[1]:
+                best[name] = (self_us, cumulative_us)
+
+    packages: dict[str, float] = defaultdict(float)
+    for name, (self_us, _) in best.items():
+        packages[name.split(".")[0]] += self_us / 1000
+
+    return {
+        "module": module,
+        "total_ms": round(best[module][1] / 1000, 1),
+        "modules_imported": len(best),
+        "lazy_violations": sorted({n.split(".")[0] for n in best} & set(LAZY_MODULES)),
+        "packages": {k: round(v, 1) for k, v in sorted(packages.items(), key=lambda kv: -kv[1])},
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_ms: float) -> list[str]:
+    """Regressions larger than both the relative tolerance and min_ms."""
+    def regressed(now: float, before: float) -> bool:
+        return now - before > min_ms and now > before * (1 + tolerance)
+
+    problems = []
+    if regressed(current["total_ms"], baseline["total_ms"]):
+        problems.append(f"total {baseline['total_ms']} -> {current['total_ms']} ms")
+    for package, ms in current["packages"].items():
+        before = baseline["packages"].get(package, 0.0)
+        if regressed(ms, before):
+            problems.append(f"{package} {before} -> {ms} ms")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Packages to list")
+    parser.add_argument("--save", type=Path, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, help="Fail on regressions against a saved JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative growth")
+    parser.add_argument("--min-ms", type=float, default=20.0, help="Ignore smaller absolute growth")
+    args = parser.parse_args()
+
+    current = measure(args.module, args.runs)
+    print(f"import {current['module']}: {current['total_ms']} ms, "
+          f"{current['modules_imported']} modules (best of {args.runs})")
+    print(f"{'package':<28}{'self ms':>10}")
+    for package, ms in list(current["packages"].items())[:args.top]:
+        print(f"{package:<28}{ms:>10.1f}")
+
+    if args.save:
+        args.save.write_text(json.dumps(current, indent=2))
+
+    failed = False
+    if current["lazy_violations"]:
+        print(f"FAIL: imported at startup: {', '.join(current['lazy_violations'])}")
+        failed = True
+    if args.compare:
+        problems = compare(current, json.loads(args.compare.read_text()), args.tolerance, args.min_ms)
+        for problem in problems:
+            print(f"FAIL: regression: {problem}")
+        failed = failed or bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
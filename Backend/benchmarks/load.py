@@ -0,0 +1,368 @@
+"""
+End-to-end load test harness.
+
+Generates a database (benchmarks.datagen), starts the fake
+OpenAI-compatible server (benchmarks.fake_openai) and the app under
+uvicorn as subprocesses on free local ports, then runs virtual users
+against it over HTTP for a fixed duration:
+
+  employee  login, then rounds of: list own certs, upload a PDF,
+            list own certs, ask for advisory recommendations
+  manager   login, then rounds of: list all certs, validate an
+            uploaded cert, read the audit log
+
+Users log in again every --rounds-per-login rounds. Reports per-endpoint
+throughput, errors and p50/p95/p99 latency, plus the upstream counters.
+Everything runs offline on one machine.
+
+Usage:
+    python -m benchmarks.load [--users 50] [--managers 0.1] [--duration 60]
+        [--workers 1] [--latency 0.8] [--failure-rate 0.05] [--save results.json]
+        [--app-env ADVISORY_MODE=llm ...]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+
+import httpx
+
+from benchmarks.advisory_offline import percentile
+from benchmarks.datagen import BENCHMARK_PASSWORD
+from benchmarks.fake_openai import add_arguments
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+SKILLS = [
+    "python", "aws", "azure", "kubernetes", "docker", "terraform", "linux", "networking",
+    "security", "sql", "java", "gcp", "devops", "machine learning", "data engineering",
+]
+VENDOR_CERTS = [
+    ("AWS", "AWS Certified Developer - Associate"),
+    ("Microsoft", "Azure Administrator Associate"),
+    ("CNCF", "Certified Kubernetes Administrator"),
+    ("HashiCorp", "Terraform Associate"),
+    ("CompTIA", "Security+"),
+]
+
+
+def minimal_pdf(n: int) -> bytes:
+    """One-page PDF; the comment makes every upload a distinct blob."""
+    return (
+        b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+        b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+        b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 300 200]>>endobj\n"
+        b"trailer<</Root 1 0 R>>\n%load " + str(n).encode() + b"\n%%EOF\n"
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Recorder:
+    """Latencies and outcomes per endpoint label (measurement window only)."""
+
+    def __init__(self):
+        self.recording = False
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.statuses: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            if self.recording:
+                self.errors[label] += 1
+            return None
+        if self.recording:
+            self.latencies[label].append(time.perf_counter() - started)
+            self.statuses[label][response.status_code] += 1
+            if response.status_code >= 400:
+                self.errors[label] += 1
+        return response
+
+    def report(self, seconds: float) -> dict:
+        endpoints = {}
+        for label in sorted(self.latencies.keys() | self.errors.keys()):
+            values = sorted(self.latencies[label])
+            endpoints[label] = {
+                "count": len(values),
+                "rps": round(len(values) / seconds, 2),
+                "errors": self.errors[label],
+                "statuses": dict(self.statuses[label]),
+                **{
+                    f"p{pct}_ms": round(percentile(values, pct) * 1000, 1) if values else None
+                    for pct in (50, 95, 99)
+                },
+                "max_ms": round(values[-1] * 1000, 1) if values else None,
+            }
+        return endpoints
+
+
+class Scenarios:
+    """Scripted user journeys sharing one HTTP client."""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, args: argparse.Namespace):
+        self.client = client
+        self.recorder = recorder
+        self.args = args
+        self.uploaded: deque[str] = deque(maxlen=10_000)  # Validation candidates
+        self.uploads = 0
+
+    async def login(self, email: str) -> dict:
+        response = await self.recorder.request(
+            self.client, "POST /auth/login", "POST", "/auth/login",
+            json={"email": email, "password": BENCHMARK_PASSWORD},
+        )
+        if response is None or response.status_code != 200:
+            return {}
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def think(self, rng: random.Random) -> None:
+        if self.args.think_ms:
+            await asyncio.sleep(rng.expovariate(1000 / self.args.think_ms))
+
+    async def employee_round(self, headers: dict, rng: random.Random) -> None:
+        record = self.recorder.request
+        await record(self.client, "GET /certs/my", "GET", "/certs/my", headers=headers)
+        await self.think(rng)
+
+        self.uploads += 1
+        vendor, name = rng.choice(VENDOR_CERTS)
+        response = await record(
+            self.client, "POST /certs", "POST", "/certs", headers=headers,
+            data={"vendor_oem": vendor, "certification_name": name,
+                  "date_obtained": "2026-01-15", "expiry_date": "2029-01-15"},
+            files={"file": ("certificate.pdf", minimal_pdf(self.uploads), "application/pdf")},
+        )
+        if response is not None and response.status_code == 200:
+            self.uploaded.append(response.json()["id"])
+        await self.think(rng)
+
+        await record(self.client, "GET /certs/my", "GET", "/certs/my", headers=headers)
+        await self.think(rng)
+
+        await record(
+            self.client, "POST /advisory", "POST", "/advisory", headers=headers,
+            json={"skills": rng.sample(SKILLS, rng.randint(1, 4)), "current_certifications": []},
+        )
+        await self.think(rng)
+
+    async def manager_round(self, headers: dict, rng: random.Random) -> None:
+        record = self.recorder.request
+        await record(self.client, "GET /certs", "GET", "/certs", headers=headers)
+        await self.think(rng)
+
+        if self.uploaded:
+            cert_id = self.uploaded.popleft()
+            await record(
+                self.client, "POST /certs/{id}/validate", "POST",
+                f"/certs/{cert_id}/validate", headers=headers,
+            )
+            await self.think(rng)
+
+        await record(self.client, "GET /audit", "GET", "/audit?limit=100", headers=headers)
+        await self.think(rng)
+
+    async def user(self, email: str, manager: bool, seed: int, stop: asyncio.Event) -> None:
+        rng = random.Random(seed)
+        run_round = self.manager_round if manager else self.employee_round
+        while not stop.is_set():
+            headers = await self.login(email)
+            if not headers:
+                await asyncio.sleep(0.5)
+                continue
+            for _ in range(self.args.rounds_per_login):
+                if stop.is_set():
+                    return
+                await run_round(headers, rng)
+
+
+def accounts(db_path: str, users: int, managers: float) -> list[tuple[str, bool]]:
+    """Distinct generated accounts for the virtual users."""
+    manager_count = min(users, max(1, round(users * managers))) if managers > 0 else 0
+    conn = sqlite3.connect(db_path)
+    chosen = [
+        (email, True) for (email,) in conn.execute(
+            "SELECT email FROM employees WHERE role = 'manager' ORDER BY id LIMIT ?", (manager_count,)
+        )
+    ]
+    chosen += [
+        (email, False) for (email,) in conn.execute(
+            "SELECT email FROM employees WHERE role = 'employee' ORDER BY id LIMIT ?",
+            (users - len(chosen),),
+        )
+    ]
+    conn.close()
+    return chosen
+
+
+def start_process(command: list[str], env: dict, log_path: Path) -> subprocess.Popen:
+    log = open(log_path, "wb")
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+async def wait_until_up(url: str, process: subprocess.Popen, log_path: Path, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                break
+            try:
+                if (await client.get(url)).status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    tail = log_path.read_text(errors="replace")[-2000:]
+    raise SystemExit(f"{url} did not come up; last log lines:\n{tail}")
+
+
+def print_report(endpoints: dict, seconds: float) -> None:
+    print(f"\n{'endpoint':<28}{'count':>8}{'rps':>9}{'errors':>8}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for label, stats in endpoints.items():
+        cells = [stats[key] for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")]
+        print(f"{label:<28}{stats['count']:>8}{stats['rps']:>9.1f}{stats['errors']:>8}"
+              + "".join(f"{c:>10.1f}" if c is not None else f"{'-':>10}" for c in cells))
+    total = sum(s["count"] for s in endpoints.values())
+    print(f"{'total':<28}{total:>8}{total / seconds:>9.1f}{sum(s['errors'] for s in endpoints.values()):>8}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    workdir = Path(tempfile.mkdtemp(prefix="certtrack-load-"))
+    db_path = args.db or str(workdir / "load.db")
+    env = {
+        **os.environ,
+        "JWT_SECRET_KEY": "load-test",
+        "OPENAI_API_KEY": "sk-load-test",
+        "DATABASE_PATH": db_path,
+    }
+
+    if not Path(db_path).exists():
+        print(f"generating {args.certifications} certifications for {args.employees} employees...")
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.datagen", "--db", db_path,
+             "--employees", str(args.employees), "--certifications", str(args.certifications),
+             "--audit-logs", str(args.audit_logs), "--seed", str(args.seed)],
+            cwd=BACKEND_DIR, env=env, check=True,
+        )
+
+    upstream_port, app_port = free_port(), free_port()
+    upstream_url = f"http://127.0.0.1:{upstream_port}"
+    app_env = {
+        **env,
+        "OPENAI_BASE_URL": f"{upstream_url}/v1",
+        "UPLOAD_DIR": str(workdir / "uploads"),
+        "RATE_LIMIT_ENABLED": "false",  # Every virtual user shares 127.0.0.1
+        "LOG_LEVEL": "WARNING",
+    }
+    for item in args.app_env:
+        key, _, value = item.partition("=")
+        app_env[key] = value
+
+    processes = []
+    try:
+        upstream_log, app_log = workdir / "upstream.log", workdir / "app.log"
+        processes.append(start_process(
+            [sys.executable, "-m", "benchmarks.fake_openai", "--port", str(upstream_port),
+             "--latency", str(args.latency), "--jitter", str(args.jitter),
+             "--failure-rate", str(args.failure_rate), "--hang-rate", str(args.hang_rate)],
+            env, upstream_log,
+        ))
+        await wait_until_up(f"{upstream_url}/_control", processes[-1], upstream_log)
+        processes.append(start_process(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+             "--port", str(app_port), "--workers", str(args.workers), "--log-level", "warning",
+             "--no-access-log"],
+            app_env, app_log,
+        ))
+        await wait_until_up(f"http://127.0.0.1:{app_port}/health", processes[-1], app_log)
+
+        recorder = Recorder()
+        limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{app_port}", limits=limits, timeout=args.request_timeout
+        ) as client:
+            scenarios = Scenarios(client, recorder, args)
+            stop = asyncio.Event()
+            chosen = accounts(db_path, args.users, args.managers)
+            users = [
+                asyncio.create_task(scenarios.user(email, manager, args.seed + i, stop))
+                for i, (email, manager) in enumerate(chosen)
+            ]
+            print(f"{len(users)} users ({sum(manager for _, manager in chosen)} managers), "
+                  f"{args.warmup:.0f} s warm-up, {args.duration:.0f} s measured, "
+                  f"{args.workers} worker(s)")
+            await asyncio.sleep(args.warmup)
+            recorder.recording = True
+            started = time.perf_counter()
+            await asyncio.sleep(args.duration)
+            recorder.recording = False
+            elapsed = time.perf_counter() - started
+            stop.set()
+            await asyncio.gather(*users, return_exceptions=True)
+
+            upstream = (await client.get(f"{upstream_url}/_control")).json()
+
+        endpoints = recorder.report(elapsed)
+        print_report(endpoints, elapsed)
+        print(f"\nupstream: {upstream['requests']} calls, {upstream['failures']} failures, "
+              f"max {upstream['max_in_flight']} in flight")
+
+        if args.save:
+            args.save.parent.mkdir(parents=True, exist_ok=True)
+            args.save.write_text(json.dumps({
+                "config": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+                "seconds": round(elapsed, 2),
+                "endpoints": endpoints,
+                "upstream": upstream,
+            }, indent=2))
+            print(f"saved {args.save}")
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        print(f"logs: {workdir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=50, help="Concurrent virtual users")
+    parser.add_argument("--managers", type=float, default=0.1, help="Share of users that are managers")
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=10, help="Unmeasured seconds first")
+    parser.add_argument("--rounds-per-login", type=int, default=5)
+    parser.add_argument("--think-ms", type=float, default=200, help="Mean pause between actions (0 = none)")
+    parser.add_argument("--request-timeout", type=float, default=60)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--db", help="Reuse this database; generated if missing")
+    parser.add_argument("--employees", type=int, default=2_000)
+    parser.add_argument("--certifications", type=int, default=20_000)
+    parser.add_argument("--audit-logs", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--app-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Extra app setting (repeatable), e.g. ADVISORY_CACHE_ENABLED=false")
+    parser.add_argument("--save", type=Path, help="Write the report as JSON")
+    add_arguments(parser)  # Fake upstream --latency/--jitter/--failure-rate/--hang-rate
+    parser.set_defaults(latency=0.8, jitter=0.2, failure_rate=0.02)
+    asyncio.run(main(parser.parse_args()))
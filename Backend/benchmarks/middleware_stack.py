@@ -0,0 +1,191 @@
+"""
+Middleware stack throughput benchmark.
+
+Compares the pure-ASGI middleware stack against the previous
+BaseHTTPMiddleware implementations by driving a trivial Starlette app
+in-process (no sockets), so the numbers isolate middleware overhead.
+
+Usage:
+    python -m benchmarks.middleware_stack [--requests 20000] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Callable
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from middleware import (
+    RateLimitMiddleware,
+    RequestLoggerMiddleware,
+    RequestSizeLimitMiddleware,
+)
+
+
+# ========== Previous implementations (for the "before" column) ==========
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    """Timestamp-list limiter as it was before the pure-ASGI rewrite."""
+
+    def __init__(self, app, requests_per_minute: int = 100):
+        super().__init__(app)
+        self.requests_per_minute = requests_per_minute
+        self.requests: dict[str, list[float]] = {}
+
+    async def dispatch(self, request: Request, call_next: Callable):
+        forwarded = request.headers.get("x-forwarded-for")
+        client_ip = forwarded.split(",")[0].strip() if forwarded else request.client.host
+        now = time.time()
+        window = [ts for ts in self.requests.get(client_ip, []) if ts > now - 60]
+        if len(window) >= self.requests_per_minute:
+            return JSONResponse(status_code=429, content={"detail": "Too many requests."})
+        window.append(now)
+        self.requests[client_ip] = window
+        return await call_next(request)
+
+
+class LegacyRequestLoggerMiddleware(BaseHTTPMiddleware):
+    """BaseHTTPMiddleware request logger."""
+
+    async def dispatch(self, request: Request, call_next: Callable):
+        start_time = time.time()
+        forwarded = request.headers.get("x-forwarded-for")
+        client_ip = forwarded.split(",")[0].strip() if forwarded else request.client.host
+        response = await call_next(request)
+        duration_ms = (time.time() - start_time) * 1000
+        logging.getLogger("certtrack.requests").info(
+            f"{request.method} {request.url.path} [{response.status_code}] "
+            f"{duration_ms:.2f}ms IP:{client_ip}"
+        )
+        return response
+
+
+class LegacyRequestSizeLimitMiddleware(BaseHTTPMiddleware):
+    """Content-Length-only size limiter."""
+
+    def __init__(self, app, max_size: int = 10 * 1024 * 1024):
+        super().__init__(app)
+        self.max_size = max_size
+
+    async def dispatch(self, request: Request, call_next: Callable):
+        content_length = request.headers.get("content-length")
+        if content_length and int(content_length) > self.max_size:
+            return JSONResponse(status_code=413, content={"detail": "Request too large."})
+        return await call_next(request)
+
+
+# ========== Harness ==========
+
+
+async def _ping(request: Request):
+    return PlainTextResponse("pong")
+
+
+async def _echo(request: Request):
+    body = await request.body()
+    return PlainTextResponse(str(len(body)))
+
+
+def build_app(legacy: bool, rate_limit: bool = True) -> Starlette:
+    """Build the benchmark app with either middleware stack (same order as main.py)."""
+    app = Starlette(routes=[
+        Route("/ping", _ping),
+        Route("/echo", _echo, methods=["POST"]),
+    ])
+    limit = 10**9  # never reject; we are measuring the happy path
+    if legacy:
+        app.add_middleware(LegacyRequestLoggerMiddleware)
+        if rate_limit:
+            app.add_middleware(LegacyRateLimitMiddleware, requests_per_minute=limit)
+        app.add_middleware(LegacyRequestSizeLimitMiddleware)
+    else:
+        app.add_middleware(RequestLoggerMiddleware)
+        if rate_limit:
+            app.add_middleware(RateLimitMiddleware, requests_per_minute=limit)
+        app.add_middleware(RequestSizeLimitMiddleware)
+    return app
+
+
+async def _call(app, method: str, path: str, body: bytes) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    sent_body = False
+    response_done = asyncio.Event()
+
+    async def receive():
+        # Mirrors uvicorn: body first, then block until the response completes
+        nonlocal sent_body
+        if not sent_body:
+            sent_body = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and not message.get("more_body"):
+            response_done.set()
+
+    await app(scope, receive, send)
+
+
+async def measure(app, method: str, path: str, body: bytes, total: int, concurrency: int) -> float:
+    """Return requests per second for ``total`` requests at ``concurrency``."""
+    per_worker = total // concurrency
+
+    async def worker():
+        for _ in range(per_worker):
+            await _call(app, method, path, body)
+
+    await _call(app, method, path, body)  # warm-up (builds middleware stack)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return per_worker * concurrency / (time.perf_counter() - start)
+
+
+async def main(total: int, concurrency: int, rate_limit: bool) -> None:
+    logging.getLogger("certtrack.requests").setLevel(logging.WARNING)
+    cases = [
+        ("GET /ping", "GET", "/ping", b""),
+        ("POST /echo 64KB", "POST", "/echo", b"x" * 65536),
+    ]
+    print(f"{'case':<18}{'before rps':>14}{'after rps':>14}{'speedup':>10}")
+    for label, method, path, body in cases:
+        before = await measure(
+            build_app(legacy=True, rate_limit=rate_limit), method, path, body, total, concurrency
+        )
+        after = await measure(
+            build_app(legacy=False, rate_limit=rate_limit), method, path, body, total, concurrency
+        )
+        print(f"{label:<18}{before:>14.0f}{after:>14.0f}{after / before:>9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--no-rate-limit",
+        action="store_true",
+        help="Leave the rate limiter out of both stacks (the old one is O(n) per request)",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, not args.no_rate_limit))
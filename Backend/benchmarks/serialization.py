@@ -0,0 +1,132 @@
+"""
+Certification list serialization benchmark.
+
+Seeds a throwaway database and serializes the same rows three ways:
+  validated  - CertificationResponse(**row), then FastAPI's response_model
+               validate + serialize (the previous list endpoint path)
+  trusted    - model_construct from rows, same FastAPI path
+  direct     - rows -> dicts -> TypeAdapter.dump_json (the list endpoints now)
+
+All three outputs are checked to be byte-identical. Rows include non-ASCII
+and control characters, mixed-case email domains and NULLs.
+
+Usage:
+    python -m benchmarks.serialization [--rows 10000 100000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+# Must be in place before config is imported
+_tmp = tempfile.mkdtemp(prefix="certtrack-bench-")
+os.environ["DATABASE_PATH"] = str(Path(_tmp) / "bench.db")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from database import init_db  # noqa: E402
+from database.codecs import date_to_days, iso_to_days, iso_to_micros  # noqa: E402
+from database.connection import get_db  # noqa: E402
+from database.repositories.certification_repo import CertificationRepository  # noqa: E402
+from routers.certification_router import certification_router  # noqa: E402
+
+NAMES = ["Ana Müller", "José Núñez", "李雷", "Zoë \"Z\" O'Neil", "Tab\tSeparated", "Line\nBreak"]
+VENDORS = ["AWS", "Microsoft", "Google Cloud", "Cisco", "CompTIA"]
+
+
+def seed(rows: int, seed_value: int = 7) -> None:
+    """Replace all certifications with rows generated from a fixed seed."""
+    rng = random.Random(seed_value)
+    data = []
+    for i in range(rows):
+        employee = rng.randrange(max(rows // 20, 1))
+        validated = rng.random() < 0.6
+        expiry = rng.choice([None, "2023-06-30", "2027-01-15", "2030-12-31"])
+        data.append((
+            f"CERT-2026-{i:06d}",
+            employee,
+            f"{rng.choice(NAMES)} {employee}",
+            f"user{employee}@{rng.choice(['example.com', 'Example.COM'])}",
+            rng.choice(VENDORS),
+            f"Certification {rng.randrange(200)} – Level {rng.randrange(3)}",
+            rng.choice([None, f"ID-{i}", "x\u0001y"]),
+            date_to_days(date(2022, 3, 1)),
+            iso_to_days(expiry),
+            rng.choice([None, f"uploads/blobs/ab/{i:064x}.pdf"]),
+            1 if validated else None,
+            iso_to_micros("2025-05-01 09:30:00") if validated else None,
+        ))
+
+    with get_db() as conn:
+        conn.execute("DELETE FROM certifications")
+        conn.executemany(
+            """
+            INSERT INTO certifications (
+                id, employee_id, employee_name, employee_email, vendor_oem,
+                certification_name, credential_id, date_obtained, expiry_date,
+                file_path, validated_by, validated_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            data,
+        )
+
+
+def fetch_rows() -> list:
+    with get_db() as conn:
+        return conn.execute("SELECT * FROM certifications ORDER BY created_at DESC").fetchall()
+
+
+def timed(fn, repeat: int = 3) -> tuple[float, bytes]:
+    """Best-of-repeat seconds and the produced body."""
+    best, body = float("inf"), b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, body
+
+
+def main(sizes: list[int]) -> None:
+    init_db()
+    route = next(r for r in certification_router.routes if r.path == "" and "GET" in r.methods)
+    field = route.response_field
+
+    def via_fastapi(models: list) -> bytes:
+        value, errors = field.validate(models, {}, loc=("response",))
+        assert not errors
+        return field.serialize_json(value)
+
+    print(f"{'rows':>8}{'fetch ms':>10}{'validated ms':>14}{'trusted ms':>12}"
+          f"{'direct ms':>11}{'speedup':>9}  identical")
+    for size in sizes:
+        seed(size)
+        fetch, rows = timed(fetch_rows, repeat=1)
+        repo = CertificationRepository
+
+        validated, body_validated = timed(
+            lambda: via_fastapi([repo._row_to_response(r) for r in rows]), repeat=1
+        )
+        trusted, body_trusted = timed(
+            lambda: via_fastapi([repo._row_to_trusted_response(r) for r in rows])
+        )
+        direct, body_direct = timed(lambda: repo._rows_to_json(rows))
+
+        identical = body_validated == body_trusted == body_direct
+        print(
+            f"{size:>8}{fetch * 1000:>10.0f}{validated * 1000:>14.0f}{trusted * 1000:>12.0f}"
+            f"{direct * 1000:>11.0f}{validated / direct:>8.1f}x  {identical}"
+        )
+        if not identical:
+            raise SystemExit("serialized output differs between paths")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+    main(args.rows)
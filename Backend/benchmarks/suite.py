@@ -0,0 +1,280 @@
+"""
+Repository and service microbenchmark suite.
+
+Generates a seeded database (benchmarks.datagen), times repository
+queries, row conversion, status computation, JWT handling and bcrypt,
+and reports the median and best time per call. Results can be saved as
+JSON and compared against a saved baseline; the run exits non-zero when
+a case got slower than the tolerance allows.
+
+Usage:
+    python -m benchmarks.suite [--certifications 50000] [--filter audit]
+    python -m benchmarks.suite --save benchmarks/results/baseline.json
+    python -m benchmarks.suite --compare benchmarks/results/baseline.json [--tolerance 0.2]
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from itertools import cycle
+from pathlib import Path
+from typing import Callable
+
+# name -> (setup(ctx) returning the timed callable, calls per sample, samples)
+CASES: dict[str, tuple[Callable[[dict], Callable[[], object]], int, int]] = {}
+
+
+def case(name: str, number: int = 1, repeat: int = 5):
+    """Register a benchmark; the decorated setup returns the callable to time."""
+    def register(setup):
+        CASES[name] = (setup, number, repeat)
+        return setup
+    return register
+
+
+# ========== Cases ==========
+
+
+@case("certification_repo.get_all", repeat=3)
+def _cert_get_all(ctx):
+    from database.repositories import CertificationRepository
+    return CertificationRepository.get_all
+
+
+@case("certification_repo.get_all_json", repeat=3)
+def _cert_get_all_json(ctx):
+    from database.repositories import CertificationRepository
+    return CertificationRepository.get_all_json
+
+
+@case("certification_repo.get_by_employee", number=200)
+def _cert_get_by_employee(ctx):
+    from database.repositories import CertificationRepository
+    ids = cycle(ctx["rng"].randrange(1, ctx["dataset"]["employees"] + 1) for _ in range(1000))
+    return lambda: CertificationRepository.get_by_employee(next(ids))
+
+
+@case("certification_repo._row_to_response", number=2000)
+def _cert_row_to_response(ctx):
+    from database.connection import get_db
+    from database.repositories import CertificationRepository
+    with get_db() as conn:
+        rows = cycle(conn.execute("SELECT * FROM certifications LIMIT 1000").fetchall())
+    return lambda: CertificationRepository._row_to_response(next(rows))
+
+
+@case("audit_repo.get_all", number=50)
+def _audit_get_all(ctx):
+    from database.repositories import AuditRepository
+    return AuditRepository.get_all
+
+
+@case("audit_repo.get_all[limit=500,offset=5000]", number=20)
+def _audit_get_all_deep(ctx):
+    from database.repositories import AuditRepository
+    return lambda: AuditRepository.get_all(limit=500, offset=5000)
+
+
+@case("audit_repo.get_count", number=50)
+def _audit_get_count(ctx):
+    from database.repositories import AuditRepository
+    return AuditRepository.get_count
+
+
+@case("report_repo.get_status_counts", number=5)
+def _report_status(ctx):
+    from database.repositories import ReportRepository
+    return lambda: ReportRepository.get_status_counts(date.today())
+
+
+@case("report_repo.get_expiring_counts[days=30]", number=50)
+def _report_expiring(ctx):
+    from database.repositories import ReportRepository
+    return lambda: ReportRepository.get_expiring_counts(date.today(), 30)
+
+
+@case("report_repo.get_backlog", number=10)
+def _report_backlog(ctx):
+    from database.repositories import ReportRepository
+    return ReportRepository.get_backlog
+
+
+@case("compute_certification_status", number=100_000)
+def _status(ctx):
+    from models.certification import compute_certification_status
+    now = datetime(2026, 1, 1)
+    inputs = cycle([
+        (None, None), (None, now), (date(2020, 1, 1), now), (date(2099, 1, 1), now),
+    ])
+    return lambda: compute_certification_status(*next(inputs))
+
+
+@case("jwt.create_access_token", number=2000)
+def _jwt_encode(ctx):
+    from auth.jwt_handler import create_access_token
+    payload = {"sub": "employee1@example.com", "user_id": 1, "role": "employee", "name": "Employee 1"}
+    return lambda: create_access_token(payload)
+
+
+@case("jwt.decode_token", number=2000)
+def _jwt_decode(ctx):
+    from auth.jwt_handler import create_access_token, decode_token
+    token = create_access_token({"sub": "employee1@example.com", "user_id": 1, "role": "employee"})
+    return lambda: decode_token(token)
+
+
+@case("bcrypt.hash_password", repeat=3)
+def _bcrypt_hash(ctx):
+    from auth.password import hash_password
+    return lambda: hash_password("Bench@#2026")
+
+
+@case("bcrypt.verify_password", repeat=3)
+def _bcrypt_verify(ctx):
+    from auth.password import hash_password, verify_password
+    hashed = hash_password("Bench@#2026")
+    return lambda: verify_password("Bench@#2026", hashed)
+
+
+# ========== Runner ==========
+
+
+def run_case(fn: Callable[[], object], number: int, repeat: int) -> dict:
+    """Time `repeat` samples of `number` calls (GC off, like timeit)."""
+    fn()  # Warm-up: imports, statement cache, page cache
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append((time.perf_counter() - started) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+        "min_us": round(min(samples) * 1e6, 3),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def dataset_counts(db_path: str) -> dict:
+    conn = sqlite3.connect(db_path)
+    counts = {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("employees", "certifications", "audit_logs")
+    }
+    conn.close()
+    return counts
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_us: float) -> list[str]:
+    """Print per-case changes; returns the regressions."""
+    if current["meta"]["dataset"] != baseline["meta"]["dataset"]:
+        print(f"WARNING: dataset differs from baseline ({baseline['meta']['dataset']})")
+    problems = []
+    print(f"\n{'case':<44}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<44}{'-':>12}{format_us(result['median_us']):>12}{'new':>9}")
+            continue
+        now, then = result["median_us"], before["median_us"]
+        change = now / then - 1
+        flag = ""
+        if change > tolerance and now - then > min_us:
+            flag = "  REGRESSION"
+            problems.append(f"{name} {format_us(then)} -> {format_us(now)} ({change:+.0%})")
+        print(f"{name:<44}{format_us(then):>12}{format_us(now):>12}{change:>+9.0%}{flag}")
+    return problems
+
+
+def format_us(value: float) -> str:
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:.2f} s"
+    if value >= 1_000:
+        return f"{value / 1_000:.2f} ms"
+    return f"{value:.2f} us"
+
+
+def main(args: argparse.Namespace) -> int:
+    from benchmarks.datagen import generate
+
+    # Full-table cases exceed the slow-query threshold on every call
+    logging.getLogger("certtrack.sql").setLevel(logging.ERROR)
+    if args.generate:
+        summary = generate(args.employees, args.certifications, args.audit_logs, args.seed)
+        print(f"generated {summary['certifications']} certifications, {summary['audit_logs']} "
+              f"audit logs, {summary['employees']} employees in {summary['seconds']} s")
+    dataset = {**dataset_counts(os.environ["DATABASE_PATH"]), "seed": args.seed}
+
+    ctx = {"dataset": dataset, "rng": random.Random(args.seed)}
+    results = {}
+    print(f"\n{'case':<44}{'median':>12}{'best':>12}{'calls':>9}")
+    for name, (setup, number, repeat) in CASES.items():
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = run_case(setup(ctx), number, repeat)
+        print(f"{name:<44}{format_us(results[name]['median_us']):>12}"
+              f"{format_us(results[name]['min_us']):>12}{number * repeat:>9}")
+
+    current = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "dataset": dataset,
+        },
+        "results": results,
+    }
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(current, indent=2))
+        print(f"\nsaved {args.save}")
+
+    if args.compare:
+        problems = compare(current, json.loads(args.compare.read_text()), args.tolerance, args.min_us)
+        for problem in problems:
+            print(f"FAIL: regression: {problem}")
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", help="Database to use; generated unless it already exists "
+                                     "(default: a fresh temporary database)")
+    parser.add_argument("--employees", type=int, default=2_000)
+    parser.add_argument("--certifications", type=int, default=50_000)
+    parser.add_argument("--audit-logs", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--filter", help="Only run cases whose name contains this")
+    parser.add_argument("--save", type=Path, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, help="Fail on regressions against a saved JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown")
+    parser.add_argument("--min-us", type=float, default=1.0, help="Ignore smaller absolute slowdowns")
+    args = parser.parse_args()
+
+    db_path = args.db or str(Path(tempfile.mkdtemp(prefix="certtrack-bench-")) / "suite.db")
+    args.generate = not Path(db_path).exists()
+
+    # Must be in place before config is imported
+    os.environ["DATABASE_PATH"] = db_path
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    sys.exit(main(args))
@@ -38,22 +38,101 @@ class Settings(BaseSettings):
     OPENAI_MODEL: str = "gpt-4o-mini"
     OPENAI_TEMPERATURE: float = 0.0
     OPENAI_MAX_TOKENS: int = 1024
+    OPENAI_BASE_URL: str = ""  # Empty = api.openai.com; set for compatible/fake servers
+    ADVISORY_PREWARM: bool = True  # Import the LangChain stack in the background after startup
+
+    # ========== Advisory Upstream Resilience ==========
+    ADVISORY_MAX_CONCURRENCY: int = 8  # In-flight LLM calls per worker
+    ADVISORY_QUEUE_TIMEOUT_SECONDS: float = 2.0  # Max wait for a free slot
+    ADVISORY_TIMEOUT_SECONDS: float = 20.0  # Deadline per LLM call
+    ADVISORY_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    ADVISORY_MAX_RETRIES: int = 0  # Client retries inside one deadline
+    ADVISORY_POOL_MAX_CONNECTIONS: int = 16
+    ADVISORY_POOL_KEEPALIVE_SECONDS: float = 30.0
+    ADVISORY_BREAKER_FAILURE_THRESHOLD: int = 5
+    ADVISORY_BREAKER_RESET_SECONDS: float = 30.0
+
+    # ========== Advisory Cache ==========
+    ADVISORY_CACHE_ENABLED: bool = True
+    ADVISORY_CACHE_MEMORY_SIZE: int = 1024
+    ADVISORY_CACHE_MEMORY_TTL_SECONDS: int = 3600
+    ADVISORY_CACHE_PERSISTENT_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # ========== Offline Recommender ==========
+    # llm: LLM only | hybrid: catalog shortlist refined by the LLM, catalog
+    # result as fallback | offline: catalog only, no LLM calls
+    ADVISORY_MODE: str = "hybrid"
+    ADVISORY_CATALOG_PATH: str = ""  # Empty = bundled services/cert_catalog.json
 
     # ========== Rate Limiting ==========
     RATE_LIMIT_REQUESTS_PER_MINUTE: int = 100
     RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # memory | sqlite (shared across workers)
+    RATE_LIMIT_SQLITE_PATH: str = "data/ratelimit.db"
+    RATE_LIMIT_MAX_CLIENTS: int = 10000
 
     # ========== File Upload ==========
     MAX_UPLOAD_SIZE_MB: int = 10
     UPLOAD_DIR: str = "uploads"
     ALLOWED_MIME_TYPES: str = "application/pdf,image/png,image/jpeg"
 
+    # ========== Previews ==========
+    PREVIEWS_ENABLED: bool = True
+    PREVIEW_WORKERS: int = 2
+    THUMBNAIL_SIZE_PX: int = 320
+    PREVIEW_MAX_PX: int = 1600
+
+    # ========== Upload Garbage Collection ==========
+    GC_ENABLED: bool = True
+    GC_INTERVAL_SECONDS: int = 3600
+    GC_GRACE_SECONDS: int = 3600  # Never reclaim files younger than this
+    GC_BATCH_SIZE: int = 200
+    GC_BATCH_PAUSE_SECONDS: float = 0.5  # Caps sweeper I/O between batches
+
+    # ========== Response Compression ==========
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # Bytes; smaller bodies are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5  # br is offered only when brotli is installed
+    COMPRESSION_OFFLOAD_SIZE: int = 65536  # Bodies this large compress in the threadpool
+    COMPRESSION_CACHE_ENTRIES: int = 128  # Compressed bodies kept for identical payloads
+    COMPRESSION_CACHE_MAX_MB: int = 16
+
     # ========== CORS ==========
     CORS_ORIGINS: str = "https://*.replit.dev,https://*.repl.co,http://localhost:3000"
     CORS_ALLOW_CREDENTIALS: bool = True
 
     # ========== Logging ==========
     LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # json | text
+    LOG_QUEUE_SIZE: int = 10000  # Records buffered for the writer thread before dropping
+    LOG_SAMPLE_RATE: float = 1.0  # Share of successful GET/HEAD requests logged
+    LOG_SLOW_REQUEST_MS: float = 1000.0  # Slower requests are always logged
+
+    # ========== Metrics ==========
+    METRICS_ENABLED: bool = True
+    METRICS_BEARER_TOKEN: str = ""  # Empty = /metrics is open (restrict at the network level)
+    METRICS_MULTIPROC_DIR: str = ""  # Shared dir for --workers > 1; empty = this process only
+    METRICS_FLUSH_SECONDS: float = 5.0
+
+    # ========== SQL Instrumentation ==========
+    DB_SLOW_QUERY_MS: float = 100.0  # Logged with redacted params and query plan; 0 = off
+    DB_QUERY_BUDGET: int = 25  # Statements per request before it is flagged; 0 = off
+
+    # ========== Tracing ==========
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATE: float = 0.1  # Share of requests traced (unless traceparent decides)
+    TRACING_EXPORTER: str = "file"  # file | otlp
+    TRACING_FILE_PATH: str = "data/traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_SERVICE_NAME: str = "certtrack"
+
+    # ========== Profiling ==========
+    PROFILING_ENABLED: bool = False  # Managers can then profile requests on demand
+    PROFILING_DIR: str = "data/profiles"
+    PROFILING_INTERVAL_MS: float = 5.0  # Stack sampling interval
+    PROFILING_TRACEMALLOC_FRAMES: int = 25  # Traceback depth of allocation sites
+    PROFILING_MAX_PROFILES: int = 200  # Oldest profiles are deleted beyond this
 
     @property
     def allowed_mime_types_list(self) -> list[str]:
@@ -0,0 +1,58 @@
+"""
+Column codecs for dates and timestamps.
+
+Dates are stored as INTEGER days since 1970-01-01 and timestamps as INTEGER
+microseconds since 1970-01-01 00:00:00 UTC. Timestamps are naive UTC on the
+Python side, like the ``datetime('now')`` text they replace. Repositories
+convert at the edges; nothing above them sees the integers.
+"""
+
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# Scaling a unit delta is ~3x cheaper than constructing timedelta(microseconds=...)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Column default equivalent to now_micros()
+SQL_NOW_MICROS = "(CAST(strftime('%s', 'now') AS INTEGER) * 1000000)"
+
+
+def date_to_days(value: date) -> int:
+    """Date to days since the epoch."""
+    return value.toordinal() - _EPOCH_ORDINAL
+
+
+def days_to_date(value: int) -> date:
+    """Days since the epoch to a date."""
+    return date.fromordinal(value + _EPOCH_ORDINAL)
+
+
+def datetime_to_micros(value: datetime) -> int:
+    """Datetime to microseconds since the epoch; aware values are converted to UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def micros_to_datetime(value: int) -> datetime:
+    """Microseconds since the epoch to a naive UTC datetime."""
+    return _EPOCH + _MICROSECOND * value
+
+
+def now_micros() -> int:
+    """Current time in microseconds, at the whole-second resolution of SQL_NOW_MICROS."""
+    return int(time.time()) * 1_000_000
+
+
+def iso_to_days(value: Optional[str]) -> Optional[int]:
+    """Legacy ISO date text to days (migration helper)."""
+    return date_to_days(date.fromisoformat(value)) if value else None
+
+
+def iso_to_micros(value: Optional[str]) -> Optional[int]:
+    """Legacy ISO timestamp text to microseconds (migration helper)."""
+    return datetime_to_micros(datetime.fromisoformat(value)) if value else None
@@ -3,11 +3,15 @@ SQLite database connection management.
 """
 
 import sqlite3
+import time
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Generator
 
 from config import get_settings
+from telemetry import DB_CONNECTION_DURATION
+
+from .instrumentation import InstrumentedConnection
 
 settings = get_settings()
 
@@ -28,7 +32,8 @@ def get_db() -> Generator[sqlite3.Connection, None, None]:
         with get_db() as conn:
             cursor = conn.execute("SELECT * FROM employees")
     """
-    conn = sqlite3.connect(str(get_db_path()))
+    started = time.perf_counter()
+    conn = sqlite3.connect(str(get_db_path()), factory=InstrumentedConnection)
     conn.row_factory = sqlite3.Row  # Enable dict-like access
     try:
         yield conn
@@ -38,6 +43,8 @@ def get_db() -> Generator[sqlite3.Connection, None, None]:
         raise
     finally:
         conn.close()
+        if settings.METRICS_ENABLED:
+            DB_CONNECTION_DURATION.observe(time.perf_counter() - started)
 
 
 def init_db() -> None:
@@ -0,0 +1,171 @@
+"""
+SQL instrumentation for connections opened by get_db.
+
+Cursors time each statement from execute through its fetch calls. That
+time feeds the per-request statistics (telemetry.queries) and the
+slow-query log: a statement slower than DB_SLOW_QUERY_MS is logged once
+with its parameters reduced to their types and its EXPLAIN QUERY PLAN. A
+progress handler counts SQLite VM instructions per connection, so slow
+entries also show how much work the statement did.
+"""
+
+import logging
+import sqlite3
+import time
+from functools import lru_cache
+
+from config import get_settings
+from telemetry import DB_QUERY_DURATION, current_query_stats
+
+settings = get_settings()
+logger = logging.getLogger("certtrack.sql")
+
+_OPERATIONS = frozenset({
+    "select", "insert", "update", "delete", "with", "replace", "create", "drop", "alter", "pragma",
+})
+_EXPLAINABLE = frozenset({"select", "insert", "update", "delete", "with", "replace"})
+
+# VM instructions between progress callbacks
+PROGRESS_STEPS = 1000
+
+_SLOW_SECONDS = settings.DB_SLOW_QUERY_MS / 1000
+
+
+@lru_cache(maxsize=1024)
+def _operation(sql: str) -> str:
+    """Metrics label of a statement: its leading keyword."""
+    keyword = sql.lstrip().split(None, 1)[0].lower() if sql.strip() else ""
+    return keyword if keyword in _OPERATIONS else "other"
+
+
+def redact_parameters(parameters) -> str:
+    """Parameter types only: values may be emails, hashes or personal data."""
+    if parameters is None:
+        return "(one set per row)"
+
+    def describe(value) -> str:
+        return "NULL" if value is None else type(value).__name__
+
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {describe(v)}" for key, v in parameters.items()) + "}"
+    return "(" + ", ".join(describe(v) for v in parameters) + ")"
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times its current statement across execute and fetches."""
+
+    _sql = None  # No statement executed yet
+
+    def execute(self, sql, parameters=(), /):
+        self._begin(sql, parameters)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._executed(time.perf_counter() - started)
+
+    def executemany(self, sql, parameters, /):
+        self._begin(sql, None)  # The plan of one parameter set would be a guess
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, parameters)
+        finally:
+            self._executed(time.perf_counter() - started, explain=False)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            self._account(time.perf_counter() - started)
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            self._account(time.perf_counter() - started)
+
+    def fetchall(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._account(time.perf_counter() - started)
+
+    def _begin(self, sql: str, parameters) -> None:
+        self._sql = sql
+        self._parameters = parameters
+        self._elapsed = 0.0
+        self._explain = True
+        self._reported_slow = False
+        self._steps_before = self.connection.vm_steps
+
+    def _executed(self, elapsed: float, explain: bool = True) -> None:
+        if settings.METRICS_ENABLED:
+            DB_QUERY_DURATION.labels(_operation(self._sql)).observe(elapsed)
+        stats = current_query_stats()
+        if stats is not None:
+            stats.queries += 1
+        self._explain = explain
+        self._account(elapsed)
+
+    def _account(self, elapsed: float) -> None:
+        """Add execute/fetch time to the statement; log it once it turns slow."""
+        if self._sql is None:
+            return
+        self._elapsed += elapsed
+        stats = current_query_stats()
+        if stats is not None:
+            stats.seconds += elapsed
+
+        if _SLOW_SECONDS <= 0 or self._reported_slow or self._elapsed < _SLOW_SECONDS:
+            return
+        self._reported_slow = True
+        if stats is not None:
+            stats.slow_queries += 1
+
+        operation = _operation(self._sql)
+        plan = "n/a"
+        if self._explain and operation in _EXPLAINABLE:
+            try:
+                rows = sqlite3.Connection.execute(
+                    self.connection, f"EXPLAIN QUERY PLAN {self._sql}", self._parameters
+                ).fetchall()
+                plan = " | ".join(row[3] for row in rows) or "n/a"
+            except sqlite3.Error as e:
+                plan = f"unavailable ({e})"
+        logger.warning(
+            "Slow query %.1f ms (~%d VM steps): %s params=%s plan=%s",
+            self._elapsed * 1000,
+            (self.connection.vm_steps - self._steps_before) * PROGRESS_STEPS,
+            " ".join(self._sql.split()),
+            redact_parameters(self._parameters),
+            plan,
+        )
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose statements are timed by InstrumentedCursor."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.vm_steps = 0
+        if _SLOW_SECONDS > 0:
+            self.set_progress_handler(self._progress, PROGRESS_STEPS)
+        stats = current_query_stats()
+        if stats is not None:
+            stats.connections += 1
+
+    def _progress(self) -> int:
+        self.vm_steps += 1
+        return 0  # Non-zero would abort the statement
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=(), /):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, parameters, /):
+        return self.cursor().executemany(sql, parameters)
@@ -2,8 +2,49 @@
 Database migrations - schema creation and updates.
 """
 
+from .codecs import SQL_NOW_MICROS, iso_to_days, iso_to_micros
 from .connection import get_db
 
+CERTIFICATIONS_TABLE = f"""
+    CREATE TABLE IF NOT EXISTS {{table}} (
+        id              TEXT PRIMARY KEY,
+        employee_id     INTEGER NOT NULL,
+        employee_name   TEXT NOT NULL,
+        employee_email  TEXT NOT NULL,
+        vendor_oem      TEXT NOT NULL,
+        certification_name TEXT NOT NULL,
+        credential_id   TEXT,
+        date_obtained   INTEGER NOT NULL,
+        expiry_date     INTEGER,
+        file_path       TEXT,
+        file_sha256     TEXT,
+        file_mime_type  TEXT,
+        thumbnail_path  TEXT,
+        preview_path    TEXT,
+        validated_by    INTEGER,
+        validated_at    INTEGER,
+        department      TEXT,
+        created_at      INTEGER DEFAULT {SQL_NOW_MICROS},
+        updated_at      INTEGER DEFAULT {SQL_NOW_MICROS},
+        FOREIGN KEY (employee_id) REFERENCES employees(id),
+        FOREIGN KEY (validated_by) REFERENCES employees(id)
+    )
+"""
+
+AUDIT_LOGS_TABLE = f"""
+    CREATE TABLE IF NOT EXISTS {{table}} (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp       INTEGER DEFAULT {SQL_NOW_MICROS},
+        actor_role      TEXT NOT NULL,
+        actor_email     TEXT NOT NULL,
+        action          TEXT NOT NULL,
+        entity_type     TEXT NOT NULL,
+        entity_id       TEXT,
+        notes           TEXT,
+        ip_address      TEXT
+    )
+"""
+
 
 def create_tables() -> None:
     """Create all database tables if they don't exist."""
@@ -22,40 +63,52 @@ def create_tables() -> None:
             )
         """)
 
-        # Certifications table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS certifications (
-                id              TEXT PRIMARY KEY,
-                employee_id     INTEGER NOT NULL,
-                employee_name   TEXT NOT NULL,
-                employee_email  TEXT NOT NULL,
-                vendor_oem      TEXT NOT NULL,
-                certification_name TEXT NOT NULL,
-                credential_id   TEXT,
-                date_obtained   TEXT NOT NULL,
-                expiry_date     TEXT,
-                file_path       TEXT,
-                validated_by    INTEGER,
-                validated_at    TEXT,
-                created_at      TEXT DEFAULT (datetime('now')),
-                updated_at      TEXT DEFAULT (datetime('now')),
-                FOREIGN KEY (employee_id) REFERENCES employees(id),
-                FOREIGN KEY (validated_by) REFERENCES employees(id)
+        # Certifications and audit logs (dates as epoch days, timestamps as
+        # epoch microseconds; see database.codecs)
+        conn.execute(CERTIFICATIONS_TABLE.format(table="certifications"))
+        conn.execute(AUDIT_LOGS_TABLE.format(table="audit_logs"))
+
+        # Content-addressed upload blobs, reference counted by certifications
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS upload_blobs (
+                sha256          TEXT PRIMARY KEY,
+                path            TEXT NOT NULL,
+                size_bytes      INTEGER NOT NULL,
+                ref_count       INTEGER NOT NULL DEFAULT 0,
+                created_at      TEXT DEFAULT (datetime('now'))
             )
         """)
 
-        # Audit logs table
+        # Background job state (cursors) and single-worker leases
         conn.execute("""
-            CREATE TABLE IF NOT EXISTS audit_logs (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp       TEXT DEFAULT (datetime('now')),
-                actor_role      TEXT NOT NULL,
-                actor_email     TEXT NOT NULL,
-                action          TEXT NOT NULL,
-                entity_type     TEXT NOT NULL,
-                entity_id       TEXT,
-                notes           TEXT,
-                ip_address      TEXT
+            CREATE TABLE IF NOT EXISTS maintenance_state (
+                key             TEXT PRIMARY KEY,
+                value           TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS maintenance_leases (
+                name            TEXT PRIMARY KEY,
+                owner           TEXT NOT NULL,
+                expires_at      REAL NOT NULL
+            )
+        """)
+
+        # Persistent tier of the advisory response cache
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS advisory_cache (
+                key             TEXT PRIMARY KEY,
+                payload         TEXT NOT NULL,
+                expires_at      REAL NOT NULL
+            )
+        """)
+
+        # Write counters bumped by triggers; readers compare them to tell
+        # whether data they cached (e.g. the coverage matrix) is stale
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS write_versions (
+                name            TEXT PRIMARY KEY,
+                version         INTEGER NOT NULL DEFAULT 0
             )
         """)
 
@@ -67,6 +120,30 @@ def create_tables() -> None:
             )
         """)
 
+        # Columns added after the initial schema
+        _add_column_if_missing(conn, "certifications", "file_sha256", "TEXT")
+        _add_column_if_missing(conn, "certifications", "file_mime_type", "TEXT")
+        _add_column_if_missing(conn, "certifications", "thumbnail_path", "TEXT")
+        _add_column_if_missing(conn, "certifications", "preview_path", "TEXT")
+        _add_column_if_missing(conn, "certifications", "department", "TEXT")
+
+        # ISO text dates from before the integer encoding
+        _migrate_dates_to_integers(conn)
+
+        # Owner's department copied onto certifications for the department
+        # reports (like employee_name/email); kept current by a trigger
+        _backfill_certification_departments(conn)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_employees_department
+            AFTER UPDATE OF department ON employees
+            BEGIN
+                UPDATE certifications SET department = NEW.department
+                WHERE employee_id = NEW.id;
+            END
+        """)
+
+        _create_write_version_triggers(conn)
+
         # Create indexes
         conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_certs_employee 
@@ -84,6 +161,148 @@ def create_tables() -> None:
             CREATE INDEX IF NOT EXISTS idx_audit_entity 
             ON audit_logs(entity_type, entity_id)
         """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_audit_timestamp
+            ON audit_logs(timestamp)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_certs_file_sha
+            ON certifications(file_sha256)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_certs_file_path
+            ON certifications(file_path)
+        """)
+        # Department reports: validated certs by expiry, the validation
+        # backlog by age. Partial, so each report scans only its rows in
+        # department order; validated_at makes them covering
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_certs_dept_validated
+            ON certifications(department, expiry_date, validated_at)
+            WHERE validated_at IS NOT NULL
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_certs_dept_pending
+            ON certifications(department, created_at, validated_at)
+            WHERE validated_at IS NULL
+        """)
+        # Coverage matrix: one ordered pass per vendor, without the table
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_certs_vendor_coverage
+            ON certifications(vendor_oem, employee_id, expiry_date, validated_at)
+        """)
+        # Rows the department backfill still has to visit (normally none)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_certs_no_department
+            ON certifications(employee_id)
+            WHERE department IS NULL
+        """)
+
+
+def _add_column_if_missing(conn, table: str, column: str, definition: str) -> None:
+    """Add a column to an existing table (SQLite has no ADD COLUMN IF NOT EXISTS)."""
+    columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+# Writes that change what the coverage matrix shows, per table
+_VERSIONED_WRITES = {
+    "certifications": ("INSERT", "DELETE", "UPDATE OF employee_id, vendor_oem, expiry_date, validated_at"),
+    "employees": ("INSERT", "DELETE", "UPDATE OF name, email, department"),
+}
+
+
+def _create_write_version_triggers(conn) -> None:
+    """Bump write_versions.<table> on every write that matters to cached readers."""
+    for table, events in _VERSIONED_WRITES.items():
+        conn.execute("INSERT OR IGNORE INTO write_versions (name, version) VALUES (?, 0)", (table,))
+        for event in events:
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.split()[0].lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE write_versions SET version = version + 1 WHERE name = '{table}';
+                END
+            """)
+
+
+def _backfill_certification_departments(conn) -> None:
+    """Set certifications.department where it is missing (new column, bulk loads)."""
+    conn.execute("""
+        UPDATE certifications
+        SET department = (
+            SELECT department FROM employees WHERE employees.id = certifications.employee_id
+        )
+        WHERE department IS NULL
+          AND (
+            SELECT department FROM employees WHERE employees.id = certifications.employee_id
+          ) IS NOT NULL
+    """)
+
+
+def _column_type(conn, table: str, column: str) -> str:
+    """Declared type of a column ('' if it does not exist)."""
+    for row in conn.execute(f"PRAGMA table_info({table})"):
+        if row["name"] == column:
+            return row["type"].upper()
+    return ""
+
+
+def _migrate_dates_to_integers(conn) -> None:
+    """
+    Rebuild certifications and audit_logs with integer date columns.
+
+    SQLite cannot change a column's type in place, so each legacy table is
+    copied into a new one (converting with the same parsers the repositories
+    used on read), dropped and replaced. Its indexes go with it and are
+    recreated on the integer columns by create_tables. Runs in one
+    transaction; a failure leaves the legacy tables untouched.
+    """
+    rebuild_certs = _column_type(conn, "certifications", "date_obtained") == "TEXT"
+    rebuild_audit = _column_type(conn, "audit_logs", "timestamp") == "TEXT"
+    if not (rebuild_certs or rebuild_audit):
+        return
+
+    conn.create_function("iso_to_days", 1, iso_to_days, deterministic=True)
+    conn.create_function("iso_to_micros", 1, iso_to_micros, deterministic=True)
+
+    conn.execute("SAVEPOINT integer_dates")
+    if rebuild_certs:
+        conn.execute(CERTIFICATIONS_TABLE.format(table="certifications_new"))
+        conn.execute("""
+            INSERT INTO certifications_new (
+                id, employee_id, employee_name, employee_email, vendor_oem,
+                certification_name, credential_id, date_obtained, expiry_date,
+                file_path, file_sha256, file_mime_type, thumbnail_path,
+                preview_path, validated_by, validated_at, created_at, updated_at
+            )
+            SELECT
+                id, employee_id, employee_name, employee_email, vendor_oem,
+                certification_name, credential_id, iso_to_days(date_obtained),
+                iso_to_days(expiry_date), file_path, file_sha256, file_mime_type,
+                thumbnail_path, preview_path, validated_by, iso_to_micros(validated_at),
+                iso_to_micros(created_at), iso_to_micros(updated_at)
+            FROM certifications
+        """)
+        conn.execute("DROP TABLE certifications")
+        conn.execute("ALTER TABLE certifications_new RENAME TO certifications")
+
+    if rebuild_audit:
+        conn.execute(AUDIT_LOGS_TABLE.format(table="audit_logs_new"))
+        conn.execute("""
+            INSERT INTO audit_logs_new (
+                id, timestamp, actor_role, actor_email, action, entity_type,
+                entity_id, notes, ip_address
+            )
+            SELECT
+                id, iso_to_micros(timestamp), actor_role, actor_email, action,
+                entity_type, entity_id, notes, ip_address
+            FROM audit_logs
+        """)
+        conn.execute("DROP TABLE audit_logs")
+        conn.execute("ALTER TABLE audit_logs_new RENAME TO audit_logs")
+    conn.execute("RELEASE integer_dates")
 
 
 def seed_demo_users() -> None:
@@ -117,9 +336,10 @@ def seed_demo_users() -> None:
 
             if not existing:
                 password_hash = hash_password(user["password"])
+                # Every uvicorn worker seeds at startup; the first one wins
                 conn.execute(
                     """
-                    INSERT INTO employees (email, password_hash, name, role, department)
+                    INSERT OR IGNORE INTO employees (email, password_hash, name, role, department)
                     VALUES (?, ?, ?, ?, ?)
                     """,
                     (
@@ -3,9 +3,19 @@
 from .employee_repo import EmployeeRepository
 from .certification_repo import CertificationRepository
 from .audit_repo import AuditRepository
+from .advisory_cache_repo import AdvisoryCacheRepository
+from .blob_repo import BlobRepository
+from .maintenance_repo import MaintenanceRepository
+from .coverage_repo import CoverageRepository
+from .report_repo import ReportRepository
 
 __all__ = [
     "EmployeeRepository",
     "CertificationRepository",
     "AuditRepository",
+    "AdvisoryCacheRepository",
+    "BlobRepository",
+    "MaintenanceRepository",
+    "CoverageRepository",
+    "ReportRepository",
 ]
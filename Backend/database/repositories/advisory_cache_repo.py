@@ -0,0 +1,51 @@
+"""Advisory cache repository (persistent tier of the advisory cache)."""
+
+import time
+from typing import Optional
+
+from database.connection import get_db
+from telemetry import traced_methods
+
+
+@traced_methods
+class AdvisoryCacheRepository:
+    """Repository for cached advisory responses."""
+
+    @staticmethod
+    def get(key: str) -> Optional[tuple[str, float]]:
+        """
+        Get a cached payload if it has not expired.
+
+        Returns:
+            Tuple of (JSON payload, expires_at epoch seconds) or None
+        """
+        with get_db() as conn:
+            row = conn.execute(
+                "SELECT payload, expires_at FROM advisory_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+            return (row["payload"], row["expires_at"]) if row else None
+
+    @staticmethod
+    def set(key: str, payload: str, expires_at: float) -> None:
+        """Store a payload until expires_at (epoch seconds)."""
+        with get_db() as conn:
+            conn.execute(
+                """
+                INSERT INTO advisory_cache (key, payload, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    payload = excluded.payload,
+                    expires_at = excluded.expires_at
+                """,
+                (key, payload, expires_at),
+            )
+
+    @staticmethod
+    def purge_expired() -> int:
+        """Delete expired entries; returns the number removed."""
+        with get_db() as conn:
+            cursor = conn.execute(
+                "DELETE FROM advisory_cache WHERE expires_at <= ?",
+                (time.time(),),
+            )
+            return cursor.rowcount
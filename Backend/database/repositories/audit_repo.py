@@ -1,13 +1,15 @@
 """Audit repository for database operations."""
 
-from datetime import datetime
 from typing import Optional
 
+from database.codecs import micros_to_datetime
 from database.connection import get_db
 from models.audit import AuditAction, AuditLogResponse
 from models.employee import RoleEnum
+from telemetry import traced_methods
 
 
+@traced_methods
 class AuditRepository:
     """Repository for audit log database operations."""
 
@@ -57,7 +59,7 @@ class AuditRepository:
             if row:
                 return AuditLogResponse(
                     id=row["id"],
-                    timestamp=datetime.fromisoformat(row["timestamp"]),
+                    timestamp=micros_to_datetime(row["timestamp"]),
                     actor_role=RoleEnum(row["actor_role"]),
                     actor_email=row["actor_email"],
                     action=AuditAction(row["action"]),
@@ -75,7 +77,7 @@ class AuditRepository:
             rows = conn.execute(
                 """
                 SELECT * FROM audit_logs 
-                ORDER BY timestamp DESC 
+                ORDER BY timestamp DESC, id DESC
                 LIMIT ? OFFSET ?
                 """,
                 (limit, offset),
@@ -84,7 +86,7 @@ class AuditRepository:
             return [
                 AuditLogResponse(
                     id=row["id"],
-                    timestamp=datetime.fromisoformat(row["timestamp"]),
+                    timestamp=micros_to_datetime(row["timestamp"]),
                     actor_role=RoleEnum(row["actor_role"]),
                     actor_email=row["actor_email"],
                     action=AuditAction(row["action"]),
@@ -104,7 +106,7 @@ class AuditRepository:
                 """
                 SELECT * FROM audit_logs 
                 WHERE entity_type = ? AND entity_id = ?
-                ORDER BY timestamp DESC
+                ORDER BY timestamp DESC, id DESC
                 """,
                 (entity_type, entity_id),
             ).fetchall()
@@ -112,7 +114,7 @@ class AuditRepository:
             return [
                 AuditLogResponse(
                     id=row["id"],
-                    timestamp=datetime.fromisoformat(row["timestamp"]),
+                    timestamp=micros_to_datetime(row["timestamp"]),
                     actor_role=RoleEnum(row["actor_role"]),
                     actor_email=row["actor_email"],
                     action=AuditAction(row["action"]),
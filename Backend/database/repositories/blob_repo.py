@@ -0,0 +1,161 @@
+"""Upload blob repository for content-addressed file storage."""
+
+from typing import Callable, Optional
+
+from database.connection import get_db
+from telemetry import traced_methods
+
+
+@traced_methods
+class BlobRepository:
+    """
+    Repository for reference-counted upload blobs.
+
+    Blobs are keyed by SHA-256. The file operation passed to ``acquire`` and
+    ``release`` runs while the SQLite write lock is held, so placing a blob
+    and freeing the same blob can never interleave across workers.
+    """
+
+    @staticmethod
+    def acquire(
+        sha256: str,
+        path: str,
+        size_bytes: int,
+        materialize: Callable[[str], None],
+    ) -> tuple[str, int]:
+        """
+        Take a reference on a blob, registering it on first use.
+
+        Args:
+            sha256: Content hash
+            path: Path to use if the blob is new
+            size_bytes: File size in bytes
+            materialize: Called with the canonical path to put the file in place
+
+        Returns:
+            Tuple of (canonical blob path, reference count after acquiring)
+        """
+        with get_db() as conn:
+            row = conn.execute(
+                """
+                INSERT INTO upload_blobs (sha256, path, size_bytes, ref_count)
+                VALUES (?, ?, ?, 1)
+                ON CONFLICT(sha256) DO UPDATE SET ref_count = ref_count + 1
+                RETURNING path, ref_count
+                """,
+                (sha256, path, size_bytes),
+            ).fetchone()
+
+            materialize(row["path"])
+            return row["path"], row["ref_count"]
+
+    @staticmethod
+    def release(sha256: str, unlink: Callable[[str], None]) -> int:
+        """
+        Drop a reference on a blob, freeing it when none remain.
+
+        Args:
+            sha256: Content hash
+            unlink: Called with the blob path once the last reference is gone
+
+        Returns:
+            Remaining reference count
+        """
+        with get_db() as conn:
+            row = conn.execute(
+                """
+                UPDATE upload_blobs SET ref_count = ref_count - 1
+                WHERE sha256 = ?
+                RETURNING path, ref_count
+                """,
+                (sha256,),
+            ).fetchone()
+
+            if row is None:
+                return 0
+
+            if row["ref_count"] <= 0:
+                conn.execute("DELETE FROM upload_blobs WHERE sha256 = ?", (sha256,))
+                unlink(row["path"])
+                return 0
+
+            return row["ref_count"]
+
+    @staticmethod
+    def find_known_hashes(hashes: list[str]) -> set[str]:
+        """Return which of the given hashes have a blob row."""
+        if not hashes:
+            return set()
+        with get_db() as conn:
+            placeholders = ",".join("?" * len(hashes))
+            rows = conn.execute(
+                f"SELECT sha256 FROM upload_blobs WHERE sha256 IN ({placeholders})",
+                hashes,
+            ).fetchall()
+            return {row["sha256"] for row in rows}
+
+    @staticmethod
+    def get_legacy_file_paths() -> list[str]:
+        """Return the file paths of certifications stored before blobs."""
+        with get_db() as conn:
+            rows = conn.execute(
+                """
+                SELECT file_path FROM certifications
+                WHERE file_sha256 IS NULL AND file_path IS NOT NULL
+                """
+            ).fetchall()
+            return [row["file_path"] for row in rows]
+
+    @staticmethod
+    def reclaim_if_orphaned(
+        path: str,
+        sha256: Optional[str],
+        unlink: Callable[[str], None],
+        location: Optional[str] = None,
+    ) -> bool:
+        """
+        Re-check a suspected orphan under the write lock and delete it.
+
+        Args:
+            path: File path under the current upload root
+            sha256: Blob hash the file belongs to, if any
+            unlink: Called with the path if nothing references it
+            location: Path relative to the upload root (e.g. "12/abc.pdf");
+                a certification path ending in it counts as a reference
+                whatever root it was stored under
+
+        Returns:
+            True if the file was reclaimed
+        """
+        suffix = None
+        if location is not None:
+            escaped = location.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            suffix = f"%/{escaped}"
+        with get_db() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            referenced = conn.execute(
+                """
+                SELECT 1 FROM certifications
+                WHERE file_path = ? OR file_path = ? OR file_path LIKE ? ESCAPE '\\'
+                UNION ALL
+                SELECT 1 FROM upload_blobs WHERE sha256 = ?
+                LIMIT 1
+                """,
+                (path, location, suffix, sha256),
+            ).fetchone()
+
+            if referenced:
+                return False
+
+            unlink(path)
+            return True
+
+    @staticmethod
+    def get_ref_count(sha256: str) -> int:
+        """Get the current reference count for a blob (0 if unknown)."""
+        with get_db() as conn:
+            row = conn.execute(
+                "SELECT ref_count FROM upload_blobs WHERE sha256 = ?",
+                (sha256,),
+            ).fetchone()
+            return row["ref_count"] if row else 0
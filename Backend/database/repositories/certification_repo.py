@@ -1,16 +1,41 @@
 """Certification repository for database operations."""
 
 from datetime import datetime, date
+from functools import lru_cache
 from typing import Optional
 
+from pydantic import EmailStr, TypeAdapter
+
+from database.codecs import (
+    date_to_days,
+    days_to_date,
+    micros_to_datetime,
+    now_micros,
+)
 from database.connection import get_db
 from models.certification import (
     CertificationResponse,
     CertificationStatus,
+    certification_list_adapter,
     compute_certification_status,
 )
+from telemetry import traced_methods
+
+_EMAIL_ADAPTER = TypeAdapter(EmailStr)
+
 
+@lru_cache(maxsize=65536)
+def _normalize_email(value: str) -> str:
+    """
+    EmailStr normalization, memoized.
 
+    Distinct addresses are bounded by headcount; a miss costs a full IDNA
+    domain check, so the cache must hold every employee's address.
+    """
+    return _EMAIL_ADAPTER.validate_python(value)
+
+
+@traced_methods
 class CertificationRepository:
     """Repository for certification database operations."""
 
@@ -38,32 +63,73 @@ class CertificationRepository:
         return f"CERT-{current_year}-{next_number:04d}"
 
     @staticmethod
-    def _row_to_response(row) -> CertificationResponse:
-        """Convert database row to CertificationResponse."""
+    def _row_values(row) -> dict:
+        """
+        Parse a database row into CertificationResponse field values.
+
+        Keys are in model field order, which the JSON fast path relies on.
+        """
         expiry_date = (
-            date.fromisoformat(row["expiry_date"]) if row["expiry_date"] else None
+            days_to_date(row["expiry_date"]) if row["expiry_date"] is not None else None
         )
         validated_at = (
-            datetime.fromisoformat(row["validated_at"]) if row["validated_at"] else None
+            micros_to_datetime(row["validated_at"]) if row["validated_at"] is not None else None
         )
 
         status = compute_certification_status(expiry_date, validated_at)
 
-        return CertificationResponse(
-            id=row["id"],
-            employee_id=row["employee_id"],
-            employee_name=row["employee_name"],
-            employee_email=row["employee_email"],
+        return dict(
             vendor_oem=row["vendor_oem"],
             certification_name=row["certification_name"],
             credential_id=row["credential_id"],
-            date_obtained=date.fromisoformat(row["date_obtained"]),
+            date_obtained=days_to_date(row["date_obtained"]),
             expiry_date=expiry_date,
+            id=row["id"],
+            employee_id=row["employee_id"],
+            employee_name=row["employee_name"],
+            employee_email=row["employee_email"],
             file_path=row["file_path"],
+            file_sha256=row["file_sha256"],
+            file_mime_type=row["file_mime_type"],
+            thumbnail_path=row["thumbnail_path"],
+            preview_path=row["preview_path"],
             status=status,
             validated_by=row["validated_by"],
             validated_at=validated_at,
-            created_at=datetime.fromisoformat(row["created_at"]),
+            created_at=micros_to_datetime(row["created_at"]),
+        )
+
+    @staticmethod
+    def _row_to_response(row) -> CertificationResponse:
+        """Convert database row to CertificationResponse."""
+        return CertificationResponse(**CertificationRepository._row_values(row))
+
+    @staticmethod
+    def _row_to_trusted_response(row) -> CertificationResponse:
+        """
+        Convert a database row to CertificationResponse without validation.
+
+        Rows were validated by CertificationCreate on the way in, so field
+        constraints and the expiry validator cannot fail here. The one
+        transformation validation applies, EmailStr normalization, is kept,
+        so the result serializes byte-identically to _row_to_response.
+        """
+        return CertificationResponse.model_construct(
+            **CertificationRepository._row_to_record(row)
+        )
+
+    @staticmethod
+    def _row_to_record(row) -> dict:
+        """Trusted row as a plain dict for certification_list_adapter."""
+        values = CertificationRepository._row_values(row)
+        values["employee_email"] = _normalize_email(values["employee_email"])
+        return values
+
+    @staticmethod
+    def _rows_to_json(rows) -> bytes:
+        """Serialize trusted rows straight to a JSON array of certifications."""
+        return certification_list_adapter.dump_json(
+            [CertificationRepository._row_to_record(row) for row in rows]
         )
 
     @staticmethod
@@ -77,6 +143,8 @@ class CertificationRepository:
         credential_id: Optional[str] = None,
         expiry_date: Optional[date] = None,
         file_path: Optional[str] = None,
+        file_sha256: Optional[str] = None,
+        file_mime_type: Optional[str] = None,
     ) -> CertificationResponse:
         """Create a new certification."""
         cert_id = CertificationRepository.generate_cert_id()
@@ -87,9 +155,13 @@ class CertificationRepository:
                 INSERT INTO certifications (
                     id, employee_id, employee_name, employee_email,
                     vendor_oem, certification_name, credential_id,
-                    date_obtained, expiry_date, file_path
+                    date_obtained, expiry_date, file_path, file_sha256,
+                    file_mime_type, department
+                )
+                VALUES (
+                    ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                    (SELECT department FROM employees WHERE id = ?)
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     cert_id,
@@ -99,9 +171,12 @@ class CertificationRepository:
                     vendor_oem,
                     certification_name,
                     credential_id,
-                    date_obtained.isoformat(),
-                    expiry_date.isoformat() if expiry_date else None,
+                    date_to_days(date_obtained),
+                    date_to_days(expiry_date) if expiry_date else None,
                     file_path,
+                    file_sha256,
+                    file_mime_type,
+                    employee_id,
                 ),
             )
 
@@ -129,7 +204,18 @@ class CertificationRepository:
                 (employee_id,),
             ).fetchall()
 
-            return [CertificationRepository._row_to_response(row) for row in rows]
+            return [CertificationRepository._row_to_trusted_response(row) for row in rows]
+
+    @staticmethod
+    def get_by_employee_json(employee_id: int) -> bytes:
+        """Get an employee's certifications as a serialized JSON array."""
+        with get_db() as conn:
+            rows = conn.execute(
+                "SELECT * FROM certifications WHERE employee_id = ? ORDER BY created_at DESC",
+                (employee_id,),
+            ).fetchall()
+
+        return CertificationRepository._rows_to_json(rows)
 
     @staticmethod
     def get_all() -> list[CertificationResponse]:
@@ -139,23 +225,51 @@ class CertificationRepository:
                 "SELECT * FROM certifications ORDER BY created_at DESC"
             ).fetchall()
 
-            return [CertificationRepository._row_to_response(row) for row in rows]
+            return [CertificationRepository._row_to_trusted_response(row) for row in rows]
+
+    @staticmethod
+    def get_all_json() -> bytes:
+        """Get all certifications as a serialized JSON array."""
+        with get_db() as conn:
+            rows = conn.execute(
+                "SELECT * FROM certifications ORDER BY created_at DESC"
+            ).fetchall()
+
+        return CertificationRepository._rows_to_json(rows)
 
     @staticmethod
     def validate(cert_id: str, validated_by: int) -> Optional[CertificationResponse]:
         """Validate a certification."""
+        now = now_micros()
         with get_db() as conn:
             conn.execute(
                 """
                 UPDATE certifications
-                SET validated_by = ?, validated_at = datetime('now'), updated_at = datetime('now')
+                SET validated_by = ?, validated_at = ?, updated_at = ?
                 WHERE id = ?
                 """,
-                (validated_by, cert_id),
+                (validated_by, now, now, cert_id),
             )
 
         return CertificationRepository.get_by_id(cert_id)
 
+    @staticmethod
+    def set_previews(
+        cert_id: str,
+        thumbnail_path: Optional[str],
+        preview_path: Optional[str],
+    ) -> None:
+        """Record generated thumbnail/preview paths for a certification."""
+        with get_db() as conn:
+            conn.execute(
+                """
+                UPDATE certifications
+                SET thumbnail_path = ?, preview_path = ?
+                WHERE id = ?
+                """,
+                (thumbnail_path, preview_path, cert_id),
+            )
+
     @staticmethod
     def delete(cert_id: str) -> bool:
         """Delete a certification."""
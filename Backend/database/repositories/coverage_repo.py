@@ -0,0 +1,79 @@
+"""Coverage repository: certification data as columnar arrays."""
+
+from datetime import date
+
+from database.codecs import date_to_days
+from database.connection import get_db
+from telemetry import traced_methods
+
+# Packed value layout of get_vendor_columns: employee_id << STATE_BITS | state
+STATE_BITS = 2
+
+
+@traced_methods
+class CoverageRepository:
+    """Repository for the employee x vendor coverage matrix."""
+
+    @staticmethod
+    def get_write_versions() -> tuple[int, int]:
+        """
+        Trigger-maintained write counters of certifications and employees.
+
+        Returns:
+            (certifications version, employees version); any write that
+            can change the matrix increments one of them
+        """
+        with get_db() as conn:
+            versions = dict(conn.execute("SELECT name, version FROM write_versions").fetchall())
+        return versions.get("certifications", 0), versions.get("employees", 0)
+
+    @staticmethod
+    def get_employees() -> list[tuple]:
+        """
+        All employees, the matrix rows.
+
+        Returns:
+            (id, name, email, department) tuples ordered by department
+            (employees without one first), then id
+        """
+        with get_db() as conn:
+            return conn.execute(
+                "SELECT id, name, email, department FROM employees ORDER BY department, id"
+            ).fetchall()
+
+    @staticmethod
+    def get_vendor_columns(today: date) -> list[tuple]:
+        """
+        Certifications grouped by vendor as packed integer arrays.
+
+        SQLite walks idx_certs_vendor_coverage once and concatenates each
+        vendor's values into one string that NumPy parses in C, so no
+        Python object is created per certification. Each value is
+        ``employee_id << STATE_BITS | state`` with state 1 (not validated),
+        2 (expired) or 3 (active or never expires) as of ``today``.
+
+        Args:
+            today: Day that separates expired from active certifications
+
+        Returns:
+            (vendor_oem as stored, int64 array) pairs
+        """
+        import numpy as np
+
+        with get_db() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT vendor_oem, group_concat(
+                    (employee_id << {STATE_BITS}) | CASE
+                        WHEN validated_at IS NULL THEN 1
+                        WHEN expiry_date < ? THEN 2
+                        ELSE 3
+                    END
+                )
+                FROM certifications
+                GROUP BY vendor_oem
+                """,
+                (date_to_days(today),),
+            ).fetchall()
+
+        return [(vendor, np.fromstring(packed, dtype=np.int64, sep=",")) for vendor, packed in rows]
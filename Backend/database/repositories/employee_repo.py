@@ -5,8 +5,10 @@ from typing import Optional
 
 from database.connection import get_db
 from models.employee import EmployeeInDB, RoleEnum
+from telemetry import traced_methods
 
 
+@traced_methods
 class EmployeeRepository:
     """Repository for employee database operations."""
 
@@ -0,0 +1,64 @@
+"""Maintenance state repository (background job cursors and leases)."""
+
+import time
+from typing import Optional
+
+from database.connection import get_db
+from telemetry import traced_methods
+
+
+@traced_methods
+class MaintenanceRepository:
+    """Repository for small key/value state kept by background jobs."""
+
+    @staticmethod
+    def get_state(key: str) -> Optional[str]:
+        """Get a stored value."""
+        with get_db() as conn:
+            row = conn.execute(
+                "SELECT value FROM maintenance_state WHERE key = ?",
+                (key,),
+            ).fetchone()
+            return row["value"] if row else None
+
+    @staticmethod
+    def set_state(key: str, value: Optional[str]) -> None:
+        """Store a value (None clears it)."""
+        with get_db() as conn:
+            conn.execute(
+                """
+                INSERT INTO maintenance_state (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                """,
+                (key, value),
+            )
+
+    @staticmethod
+    def try_acquire_lease(name: str, owner: str, ttl_seconds: float) -> bool:
+        """
+        Take or renew a named lease so only one worker runs a job.
+
+        Args:
+            name: Lease name
+            owner: Unique owner ID (e.g. hostname:pid)
+            ttl_seconds: How long the lease is valid without renewal
+
+        Returns:
+            True if this owner holds the lease
+        """
+        now = time.time()
+        with get_db() as conn:
+            row = conn.execute(
+                """
+                INSERT INTO maintenance_leases (name, owner, expires_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    owner = excluded.owner,
+                    expires_at = excluded.expires_at
+                WHERE maintenance_leases.owner = excluded.owner
+                   OR maintenance_leases.expires_at < ?
+                RETURNING owner
+                """,
+                (name, owner, now + ttl_seconds, now),
+            ).fetchone()
+            return row is not None
@@ -0,0 +1,128 @@
+"""Department report repository (aggregates over certifications)."""
+
+from datetime import date
+
+from database.codecs import date_to_days, micros_to_datetime
+from database.connection import get_db
+from models.report import (
+    DepartmentBacklog,
+    DepartmentExpiringCount,
+    DepartmentStatusCounts,
+)
+from telemetry import traced_methods
+
+
+@traced_methods
+class ReportRepository:
+    """
+    Repository for department roll-ups.
+
+    Queries group by certifications.department (copied from the owner) and
+    are shaped to match the partial indexes idx_certs_dept_validated and
+    idx_certs_dept_pending, so each one reads a single index in
+    department order without touching the table or sorting.
+    """
+
+    @staticmethod
+    def get_status_counts(today: date) -> list[DepartmentStatusCounts]:
+        """
+        Count certifications per department by status.
+
+        Args:
+            today: Day that separates expired from active certifications
+
+        Returns:
+            One entry per department, ordered by department
+        """
+        counts: dict = {}
+        with get_db() as conn:
+            for row in conn.execute(
+                """
+                SELECT department, COUNT(*) AS validated, COUNT(expiry_date) AS expiring,
+                       COUNT(CASE WHEN expiry_date < ? THEN 1 END) AS expired
+                FROM certifications
+                WHERE validated_at IS NOT NULL
+                GROUP BY department
+                """,
+                (date_to_days(today),),
+            ):
+                counts[row["department"]] = DepartmentStatusCounts(
+                    department=row["department"],
+                    total=row["validated"],
+                    active=row["expiring"] - row["expired"],
+                    expired=row["expired"],
+                    never_expires=row["validated"] - row["expiring"],
+                )
+            for row in conn.execute(
+                """
+                SELECT department, COUNT(*) AS pending
+                FROM certifications
+                WHERE validated_at IS NULL
+                GROUP BY department
+                """
+            ):
+                entry = counts.setdefault(
+                    row["department"], DepartmentStatusCounts(department=row["department"])
+                )
+                entry.in_progress = row["pending"]
+                entry.total += row["pending"]
+
+        return sorted(counts.values(), key=lambda c: (c.department is not None, c.department or ""))
+
+    @staticmethod
+    def get_expiring_counts(today: date, days: int) -> list[DepartmentExpiringCount]:
+        """
+        Count validated certifications per department expiring soon.
+
+        Args:
+            today: First day of the window
+            days: Window length; certifications expiring on today + days are included
+
+        Returns:
+            Departments with at least one expiring certification
+        """
+        start = date_to_days(today)
+        with get_db() as conn:
+            rows = conn.execute(
+                """
+                SELECT department, COUNT(*) AS expiring
+                FROM certifications
+                WHERE validated_at IS NOT NULL AND expiry_date BETWEEN ? AND ?
+                GROUP BY department
+                ORDER BY department
+                """,
+                (start, start + days),
+            ).fetchall()
+
+        return [
+            DepartmentExpiringCount(department=row["department"], expiring=row["expiring"])
+            for row in rows
+        ]
+
+    @staticmethod
+    def get_backlog() -> list[DepartmentBacklog]:
+        """
+        Count certifications per department waiting for validation.
+
+        Returns:
+            Departments with pending certifications and the oldest submission
+        """
+        with get_db() as conn:
+            rows = conn.execute(
+                """
+                SELECT department, COUNT(*) AS pending, MIN(created_at) AS oldest
+                FROM certifications
+                WHERE validated_at IS NULL
+                GROUP BY department
+                ORDER BY department
+                """
+            ).fetchall()
+
+        return [
+            DepartmentBacklog(
+                department=row["department"],
+                pending=row["pending"],
+                oldest_submitted_at=micros_to_datetime(row["oldest"]),
+            )
+            for row in rows
+        ]
@@ -4,6 +4,7 @@ CertTrack Backend - FastAPI Application Entry Point.
 Certificate Tracking & Advisory Workflow application.
 """
 
+import asyncio
 import sys
 from pathlib import Path
 
@@ -12,25 +13,48 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from config import get_settings
 from database import init_db
 from database.migrations import seed_demo_users
 from middleware import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    QueryStatsMiddleware,
     RateLimitMiddleware,
     RequestLoggerMiddleware,
     RequestSizeLimitMiddleware,
+    TracingMiddleware,
 )
 from routers import (
     auth_router,
     certification_router,
     advisory_router,
     audit_router,
+    metrics_router,
+    profiling_router,
+    report_router,
+)
+from services.advisory_service import (
+    prewarm_advisory_service,
+    shutdown_advisory_service,
+)
+from services.preview_service import PreviewService
+from services.upload_gc import UploadGarbageCollector
+from telemetry import (
+    configure_logging,
+    start_metrics_export,
+    start_tracing,
+    stop_metrics_export,
+    stop_tracing,
 )
 
 settings = get_settings()
 
+# Structured logs written from a background thread
+configure_logging(settings.LOG_LEVEL, settings.LOG_FORMAT, settings.LOG_QUEUE_SIZE)
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
@@ -47,17 +71,54 @@ app.add_middleware(
     allow_origins=settings.cors_origins_list,
     allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type"],
+    allow_headers=["Authorization", "Content-Type", "X-Request-ID"],
+    expose_headers=["X-Request-ID"],
+)
+
+# Response compression (inside logging/rate limiting: their timings and
+# small error bodies are unaffected)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+        cache_entries=settings.COMPRESSION_CACHE_ENTRIES,
+        cache_max_bytes=settings.COMPRESSION_CACHE_MAX_MB * 1024 * 1024,
+    )
+
+# Per-request SQL statement counts and query budget
+app.add_middleware(
+    QueryStatsMiddleware,
+    query_budget=settings.DB_QUERY_BUDGET,
+    debug_headers=settings.DEBUG,
 )
 
-# Request logging
-app.add_middleware(RequestLoggerMiddleware)
+# On-demand profiling (inside logging: records logged while profiling
+# keep their request ID)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Request logging with correlation IDs (sampled for successful reads)
+app.add_middleware(
+    RequestLoggerMiddleware,
+    sample_rate=settings.LOG_SAMPLE_RATE,
+    slow_ms=settings.LOG_SLOW_REQUEST_MS,
+)
+
+# Request metrics (inside rate limiting: 429s are counted by the limiter)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 # Rate limiting from settings
 if settings.RATE_LIMIT_ENABLED:
     app.add_middleware(
         RateLimitMiddleware,
         requests_per_minute=settings.RATE_LIMIT_REQUESTS_PER_MINUTE,
+        backend=settings.RATE_LIMIT_BACKEND,
+        sqlite_path=settings.RATE_LIMIT_SQLITE_PATH,
+        max_clients=settings.RATE_LIMIT_MAX_CLIENTS,
     )
 
 # File size limit from settings
@@ -66,30 +127,48 @@ app.add_middleware(
     max_size=settings.max_upload_size_bytes,
 )
 
+# Tracing (outermost, so the root span covers every other middleware)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
 # ========== Routers ==========
 
 app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 app.include_router(certification_router, prefix="/certs", tags=["Certifications"])
 app.include_router(advisory_router, prefix="/advisory", tags=["AI Advisory"])
 app.include_router(audit_router, prefix="/audit", tags=["Audit Logs"])
+app.include_router(report_router, prefix="/reports", tags=["Reports"])
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router, prefix="/metrics")
+if settings.PROFILING_ENABLED:
+    app.include_router(profiling_router, prefix="/admin/profiling", tags=["Profiling"])
 
-# ========== Static Files ==========
-
-# Create uploads directory if it doesn't exist
-uploads_path = Path(settings.UPLOAD_DIR)
-uploads_path.mkdir(parents=True, exist_ok=True)
-
-# Serve uploaded files
-app.mount("/uploads", StaticFiles(directory=str(uploads_path)), name="uploads")
+# Uploaded files are served by GET /certs/{cert_id}/file with authorization
 
 # ========== Startup Events ==========
 
 
 @app.on_event("startup")
 async def startup():
-    """Initialize database and seed demo users on startup."""
+    """Initialize database, seed demo users and start background jobs."""
     init_db()
     seed_demo_users()
+    start_metrics_export()
+    start_tracing()
+    UploadGarbageCollector.start()
+    if settings.ADVISORY_PREWARM:
+        # Keep a reference so the task is not garbage collected
+        app.state.advisory_prewarm = asyncio.create_task(prewarm_advisory_service())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background workers."""
+    await UploadGarbageCollector.stop()
+    PreviewService.shutdown()
+    await shutdown_advisory_service()
+    stop_metrics_export()
+    stop_tracing()
 
 
 # ========== Health Check ==========
@@ -1,11 +1,23 @@
 """Middleware package for CertTrack."""
 
+from .client_ip import get_client_ip
+from .compression import CompressionMiddleware
+from .metrics import MetricsMiddleware
+from .profiling import ProfilingMiddleware
+from .query_stats import QueryStatsMiddleware
 from .rate_limiter import RateLimitMiddleware
 from .request_logger import RequestLoggerMiddleware
 from .size_limiter import RequestSizeLimitMiddleware
+from .tracing import TracingMiddleware
 
 __all__ = [
+    "get_client_ip",
+    "CompressionMiddleware",
+    "MetricsMiddleware",
+    "ProfilingMiddleware",
+    "QueryStatsMiddleware",
     "RateLimitMiddleware",
     "RequestLoggerMiddleware",
     "RequestSizeLimitMiddleware",
+    "TracingMiddleware",
 ]
@@ -0,0 +1,35 @@
+"""Client IP resolution shared by middleware and routers."""
+
+from starlette.types import Scope
+
+
+def get_client_ip(scope: Scope) -> str:
+    """
+    Resolve the client IP once per request and cache it in scope state.
+
+    Checks the X-Forwarded-For header first (for proxies), then the
+    connection peer address.
+
+    Args:
+        scope: ASGI connection scope (``request.scope`` in handlers)
+
+    Returns:
+        Client IP address or "unknown"
+    """
+    state = scope.setdefault("state", {})
+    client_ip = state.get("client_ip")
+    if client_ip is not None:
+        return client_ip
+
+    client_ip = None
+    for name, value in scope.get("headers", ()):
+        if name == b"x-forwarded-for":
+            client_ip = value.decode("latin-1").split(",")[0].strip()
+            break
+
+    if not client_ip:
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+
+    state["client_ip"] = client_ip
+    return client_ip
@@ -0,0 +1,232 @@
+"""Response compression middleware."""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Media types worth compressing; text/event-stream is excluded explicitly
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/problem+json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+})
+
+
+def _load_brotli():
+    """The brotli module, or None when it is not installed (gzip only)."""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+@lru_cache(maxsize=256)
+def negotiate_encoding(accept_encoding: str, brotli_available: bool) -> Optional[str]:
+    """
+    Pick the response encoding from an Accept-Encoding header.
+
+    Honors q-values (q=0 refuses) and ``*``; prefers br over gzip on ties.
+
+    Returns:
+        "br", "gzip" or None for identity
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        if name:
+            weights[name.strip()] = weight
+
+    supported = ("br", "gzip") if brotli_available else ("gzip",)
+    best, best_weight = None, 0.0
+    for encoding in supported:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class CompressedBodyCache:
+    """
+    LRU of compressed bodies keyed by (encoding, digest of the plain body).
+
+    Dashboards re-fetch identical list payloads; hashing a body is over 15x
+    cheaper than gzipping it. Bounded by entry count and total compressed bytes.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()  # Large bodies are compressed in the threadpool
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple[str, bytes]) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple[str, bytes], value: bytes) -> None:
+        if self.max_entries <= 0 or len(value) > self.max_bytes // 4:
+            return  # One huge body must not flush everything else
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = value
+            self._size += len(value)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+class CompressionMiddleware:
+    """
+    Middleware to gzip/brotli-compress responses (pure ASGI).
+
+    Only complete single-message bodies of compressible media types above
+    ``minimum_size`` are compressed; streamed responses (SSE, file
+    downloads) and already-encoded ones pass through untouched. Bodies of
+    ``offload_size`` or more are compressed in the threadpool so the event
+    loop keeps serving other requests.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        offload_size: int = 64 * 1024,
+        cache_entries: int = 128,
+        cache_max_bytes: int = 16 * 1024 * 1024,
+    ):
+        """
+        Initialize compression.
+
+        Args:
+            app: ASGI app
+            minimum_size: Smallest body (bytes) worth compressing
+            gzip_level: zlib level 1-9
+            brotli_quality: Brotli quality 0-11 (11 is far too slow for dynamic bodies)
+            offload_size: Bodies at least this large are compressed off the event loop
+            cache_entries: Compressed bodies kept for identical payloads (0 disables)
+            cache_max_bytes: Total size cap of the cache
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.cache = CompressedBodyCache(cache_entries, cache_max_bytes)
+
+        self._encoders = {
+            "gzip": lambda body: gzip.compress(body, compresslevel=gzip_level, mtime=0),
+        }
+        brotli = _load_brotli()
+        if brotli is not None:
+            self._encoders["br"] = lambda body: brotli.compress(
+                body, quality=brotli_quality, mode=brotli.MODE_TEXT
+            )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Compress eligible responses for clients that accept it."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), "br" in self._encoders
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def compressing_send(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                if self._compressible(message):
+                    start_message = message  # Held until the body is known
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+
+            passthrough = True  # Whatever happens next, this response is decided
+            body = message.get("body", b"")
+            if (
+                message["type"] != "http.response.body"
+                or message.get("more_body", False)
+                or len(body) < self.minimum_size
+            ):
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) >= self.offload_size:
+                compressed = await run_in_threadpool(self._encode, body, encoding)
+            else:
+                compressed = self._encode(body, encoding)
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"  # Different bytes than the identity representation
+            start_message["headers"] = headers.raw
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, compressing_send)
+
+    @staticmethod
+    def _compressible(message: Message) -> bool:
+        status = message["status"]
+        if status < 200 or status in (204, 206, 304):
+            return False
+        headers = Headers(raw=message["headers"])
+        if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+            return False
+        media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        if media_type == "text/event-stream":
+            return False
+        return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+    def _encode(self, body: bytes, encoding: str) -> bytes:
+        """Compress, reusing the cached result for an identical body."""
+        key = (encoding, hashlib.sha256(body).digest())
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = self._encoders[encoding](body)
+            self.cache.put(key, compressed)
+        return compressed
@@ -0,0 +1,58 @@
+"""Request metrics middleware."""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from telemetry import HTTP_REQUEST_DURATION
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the matched route, e.g. ``/certs/{cert_id}/file``.
+
+    Routes of included routers may report their path relative to the
+    router prefix; the prefix is then taken from the concrete path, which
+    has as many trailing segments as the template.
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return "unmatched"
+    depth = template.count("/")
+    path = scope["path"]
+    return (path.rsplit("/", depth)[0] if depth else path) + template
+
+
+class MetricsMiddleware:
+    """
+    Middleware to record request durations per route template (pure ASGI).
+
+    The router stores the matched route in the scope, so the label is e.g.
+    ``/certs/{cert_id}`` rather than every concrete id. Requests that match
+    no route are labeled ``unmatched``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Time the request until its last response message."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"], route_template(scope), str(status_code)
+            ).observe(time.perf_counter() - start_time)
@@ -0,0 +1,78 @@
+"""On-demand request profiling middleware."""
+
+import asyncio
+
+from jose import JWTError
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from auth.jwt_handler import decode_token
+from telemetry.profiling import ProfileTriggers, RequestProfile
+
+from .metrics import route_template
+
+
+def _manager_email(headers: Headers) -> str:
+    """Email of the manager whose access token authorizes the request, or ""."""
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return ""
+    try:
+        payload = decode_token(token)
+    except JWTError:
+        return ""
+    if payload.get("type") != "access" or payload.get("role") != "manager":
+        return ""
+    return payload.get("sub", "")
+
+
+class ProfilingMiddleware:
+    """
+    Middleware to profile selected requests (pure ASGI).
+
+    A request is profiled when a route armed through the admin API
+    matches it, or when it carries ``X-Profile: 1`` together with a
+    manager's access token. The profile ID is returned in the
+    X-Profile-Id response header; results are written in the background
+    once the request has finished.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Profile the request if it was selected."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = self._select(scope)
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile.id
+            await send(message)
+
+        profile.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.route = route_template(scope)
+            # Snapshot and write in the background, outside the request's time
+            asyncio.get_running_loop().run_in_executor(None, profile.stop)
+
+    @staticmethod
+    def _select(scope: Scope):
+        headers = Headers(scope=scope)
+        if headers.get("x-profile") == "1":
+            manager = _manager_email(headers)
+            if manager:
+                return RequestProfile(scope["method"], scope["path"], "header", manager)
+        trigger = ProfileTriggers.claim(scope["method"], scope["path"])
+        if trigger is not None:
+            return RequestProfile(scope["method"], scope["path"], "armed", trigger["armed_by"])
+        return None
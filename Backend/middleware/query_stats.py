@@ -0,0 +1,72 @@
+"""Per-request SQL statistics middleware."""
+
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import get_settings
+from telemetry import DB_QUERY_BUDGET_EXCEEDED, track_queries
+
+from .metrics import route_template
+
+settings = get_settings()
+logger = logging.getLogger("certtrack.sql")
+
+
+class QueryStatsMiddleware:
+    """
+    Middleware to count SQL statements and connections per request (pure ASGI).
+
+    Requests running more than ``query_budget`` statements are logged and
+    counted in metrics; that usually means a query in a loop (N+1). In
+    debug mode the counts are also returned as X-DB-* response headers.
+    """
+
+    def __init__(self, app: ASGIApp, query_budget: int = 0, debug_headers: bool = False):
+        """
+        Initialize query statistics.
+
+        Args:
+            app: ASGI app
+            query_budget: Statements allowed per request (0 disables the check)
+            debug_headers: Add X-DB-Queries/-Connections/-Time-Ms headers
+        """
+        self.app = app
+        self.query_budget = query_budget
+        self.debug_headers = debug_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Track statements while the request is served."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start" and self.debug_headers:
+                    # Statements run while streaming the body are not included
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(stats.queries)
+                    headers["X-DB-Connections"] = str(stats.connections)
+                    headers["X-DB-Time-Ms"] = f"{stats.seconds * 1000:.2f}"
+                    if self.query_budget and stats.queries > self.query_budget:
+                        headers["X-DB-Query-Budget-Exceeded"] = str(self.query_budget)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if self.query_budget and stats.queries > self.query_budget:
+                    route = route_template(scope)
+                    DB_QUERY_BUDGET_EXCEEDED.labels(route).inc()
+                    logger.warning(
+                        "Query budget exceeded: %s %s ran %d statements on %d connections "
+                        "(budget %d, %.1f ms in SQLite)",
+                        scope["method"],
+                        route,
+                        stats.queries,
+                        stats.connections,
+                        self.query_budget,
+                        stats.seconds * 1000,
+                    )
@@ -1,77 +1,247 @@
-"""In-memory rate limiting middleware."""
+"""Sliding-window rate limiting middleware."""
 
+import math
+import sqlite3
+import threading
 import time
-from collections import defaultdict
-from typing import Callable
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from telemetry import RATE_LIMIT_REJECTIONS
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+from .client_ip import get_client_ip
+
+WINDOW_SECONDS = 60
+
+
+def _sliding_estimate(previous: int, current: int, elapsed: float) -> float:
+    """Weight the previous window by how much of it still overlaps."""
+    return previous * (1 - elapsed / WINDOW_SECONDS) + current
+
+
+class MemoryRateLimitBackend:
+    """
+    Per-process sliding-window counters in an LRU-bounded table.
+
+    Each client costs one small list ``[window_id, current, previous]``;
+    the least recently seen client is evicted once ``max_clients`` is hit.
+    """
+
+    blocking = False
+
+    def __init__(self, limit: int, max_clients: int = 10000):
+        self.limit = limit
+        self.max_clients = max_clients
+        self.clients: OrderedDict[str, list[int]] = OrderedDict()
+
+    def hit(self, client_ip: str, now: float) -> Optional[int]:
+        """
+        Record a request.
+
+        Returns:
+            None if allowed, otherwise seconds until the client may retry
+        """
+        window_id, offset = divmod(now, WINDOW_SECONDS)
+        window_id = int(window_id)
+
+        entry = self.clients.get(client_ip)
+        if entry is None:
+            entry = [window_id, 0, 0]
+            self.clients[client_ip] = entry
+            if len(self.clients) > self.max_clients:
+                self.clients.popitem(last=False)
+        else:
+            self.clients.move_to_end(client_ip)
+            if entry[0] != window_id:
+                # Roll forward: the old current becomes previous only if adjacent
+                entry[2] = entry[1] if entry[0] == window_id - 1 else 0
+                entry[1] = 0
+                entry[0] = window_id
+
+        if _sliding_estimate(entry[2], entry[1], offset) >= self.limit:
+            return max(1, math.ceil(WINDOW_SECONDS - offset))
+
+        entry[1] += 1
+        return None
+
+
+class SQLiteRateLimitBackend:
     """
-    Simple in-memory rate limiting middleware.
-    
-    WARNING: This is hackathon-grade. For production:
-    - Use Redis-backed rate limiting
-    - Consider using slowapi library
+    Sliding-window counters shared by all workers through a SQLite file.
+
+    Every check is a single-row read and write inside ``BEGIN IMMEDIATE``,
+    so concurrent workers serialize on the write lock and never double count.
+    Stale rows are pruned periodically to bound the table. Checks can wait
+    up to the busy timeout for another worker, so they run in the threadpool.
+    """
+
+    blocking = True
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, limit: int, db_path: str, max_clients: int = 10000):
+        self.limit = limit
+        self.max_clients = max_clients
+        self._hits_since_prune = 0
+        self._lock = threading.Lock()
+
+        path = Path(db_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(
+            str(path),
+            timeout=5.0,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                client          TEXT PRIMARY KEY,
+                window_id       INTEGER NOT NULL,
+                current         INTEGER NOT NULL,
+                previous        INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+
+    def hit(self, client_ip: str, now: float) -> Optional[int]:
+        """
+        Record a request.
+
+        Returns:
+            None if allowed, otherwise seconds until the client may retry
+        """
+        window_id, offset = divmod(now, WINDOW_SECONDS)
+        window_id = int(window_id)
+
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT window_id, current, previous FROM rate_limits WHERE client = ?",
+                    (client_ip,),
+                ).fetchone()
+
+                if row is None:
+                    current, previous = 0, 0
+                elif row[0] == window_id:
+                    current, previous = row[1], row[2]
+                else:
+                    current, previous = 0, (row[1] if row[0] == window_id - 1 else 0)
+
+                if _sliding_estimate(previous, current, offset) >= self.limit:
+                    conn.execute("COMMIT")
+                    return max(1, math.ceil(WINDOW_SECONDS - offset))
+
+                conn.execute(
+                    """
+                    INSERT INTO rate_limits (client, window_id, current, previous)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(client) DO UPDATE SET
+                        window_id = excluded.window_id,
+                        current = excluded.current,
+                        previous = excluded.previous
+                    """,
+                    (client_ip, window_id, current + 1, previous),
+                )
+
+                self._hits_since_prune += 1
+                if self._hits_since_prune >= self.PRUNE_EVERY:
+                    self._hits_since_prune = 0
+                    self._prune(window_id)
+
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        return None
+
+    def _prune(self, window_id: int) -> None:
+        """Drop clients that no longer affect any decision, then cap the table."""
+        self.conn.execute(
+            "DELETE FROM rate_limits WHERE window_id < ?",
+            (window_id - 1,),
+        )
+        self.conn.execute(
+            """
+            DELETE FROM rate_limits WHERE client IN (
+                SELECT client FROM rate_limits
+                ORDER BY window_id ASC, current ASC
+                LIMIT max(0, (SELECT COUNT(*) FROM rate_limits) - ?)
+            )
+            """,
+            (self.max_clients,),
+        )
+
+
+class RateLimitMiddleware:
+    """
+    Sliding-window-counter rate limiting middleware (pure ASGI).
+
+    Each client keeps two counters (current and previous minute), so a check
+    is constant work regardless of the request rate. Use the ``sqlite``
+    backend to share limits across uvicorn workers.
     """
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         requests_per_minute: int = 100,
+        backend: str = "memory",
+        sqlite_path: str = "data/ratelimit.db",
+        max_clients: int = 10000,
     ):
         """
         Initialize rate limiter.
-        
+
         Args:
-            app: Starlette/FastAPI app
+            app: ASGI app
             requests_per_minute: Max requests per minute per IP
+            backend: "memory" (per-process) or "sqlite" (shared across workers)
+            sqlite_path: Database file for the sqlite backend
+            max_clients: Maximum number of tracked client IPs
         """
-        super().__init__(app)
+        self.app = app
         self.requests_per_minute = requests_per_minute
-        self.requests: dict[str, list[float]] = defaultdict(list)
-
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP from request."""
-        # Check X-Forwarded-For header first (for proxies)
-        forwarded = request.headers.get("x-forwarded-for")
-        if forwarded:
-            return forwarded.split(",")[0].strip()
-        return request.client.host if request.client else "unknown"
-
-    def _is_rate_limited(self, client_ip: str) -> bool:
-        """Check if client is rate limited."""
-        now = time.time()
-        window_start = now - 60  # 1 minute window
-
-        # Clean old requests
-        self.requests[client_ip] = [
-            ts for ts in self.requests[client_ip] if ts > window_start
-        ]
-
-        # Check limit
-        if len(self.requests[client_ip]) >= self.requests_per_minute:
-            return True
-
-        # Record this request
-        self.requests[client_ip].append(now)
-        return False
-
-    async def dispatch(self, request: Request, call_next: Callable):
+
+        if backend == "sqlite":
+            self.backend = SQLiteRateLimitBackend(
+                requests_per_minute, sqlite_path, max_clients
+            )
+        elif backend == "memory":
+            self.backend = MemoryRateLimitBackend(requests_per_minute, max_clients)
+        else:
+            raise ValueError(f"Unknown rate limit backend: {backend}")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request with rate limiting."""
-        client_ip = self._get_client_ip(request)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.backend.blocking:
+            retry_after = await run_in_threadpool(self.backend.hit, get_client_ip(scope), time.time())
+        else:
+            retry_after = self.backend.hit(get_client_ip(scope), time.time())
 
-        if self._is_rate_limited(client_ip):
-            return JSONResponse(
+        if retry_after is not None:
+            RATE_LIMIT_REJECTIONS.inc()
+            response = JSONResponse(
                 status_code=429,
                 content={
                     "detail": "Too many requests. Please slow down.",
-                    "retry_after": 60,
+                    "retry_after": retry_after,
                 },
-                headers={"Retry-After": "60"},
+                headers={"Retry-After": str(retry_after)},
             )
+            await response(scope, receive, send)
+            return
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
@@ -1,46 +1,112 @@
 """Request logging middleware."""
 
 import logging
+import random
+import re
 import time
-from typing import Callable
+import uuid
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from config import get_settings
+from telemetry.logs import reset_request_id, set_request_id
 
-settings = get_settings()
+from .client_ip import get_client_ip
+from .metrics import route_template
 
-# Configure logger
-logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
 logger = logging.getLogger("certtrack.requests")
 
+# Accepted inbound request IDs (anything else is replaced, never logged)
+_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,128}")
 
-class RequestLoggerMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all requests."""
 
-    async def dispatch(self, request: Request, call_next: Callable):
+class RequestLoggerMiddleware:
+    """
+    Middleware to log requests as structured records (pure ASGI).
+
+    Every request gets a correlation ID, taken from a well-formed
+    X-Request-ID header or generated, bound to all records logged while
+    it is served and returned in the X-Request-ID response header.
+    Successful GET/HEAD requests are logged at ``sample_rate``; errors,
+    writes and requests slower than ``slow_ms`` are always logged.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0, slow_ms: float = 1000.0):
+        """
+        Initialize request logging.
+
+        Args:
+            app: ASGI app
+            sample_rate: Share of successful GET/HEAD requests logged (0-1)
+            slow_ms: Requests at least this slow are always logged
+        """
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Log request details and timing."""
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Get client IP
-        forwarded = request.headers.get("x-forwarded-for")
-        client_ip = forwarded.split(",")[0].strip() if forwarded else (
-            request.client.host if request.client else "unknown"
-        )
+        request_id = Headers(scope=scope).get("x-request-id", "")
+        if not _REQUEST_ID.fullmatch(request_id):
+            request_id = uuid.uuid4().hex
+        token = set_request_id(request_id)
+
+        start_time = time.perf_counter()
+        status_code = 500
 
-        # Process request
-        response = await call_next(request)
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
 
-        # Calculate duration
-        duration_ms = (time.time() - start_time) * 1000
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            self._log(scope, status_code, duration_ms)
+            reset_request_id(token)
 
-        # Log request
-        logger.info(
-            f"{request.method} {request.url.path} "
-            f"[{response.status_code}] "
-            f"{duration_ms:.2f}ms "
-            f"IP:{client_ip}"
+    def _log(self, scope: Scope, status_code: int, duration_ms: float) -> None:
+        method = scope["method"]
+        sampled = (
+            status_code < 400
+            and duration_ms < self.slow_ms
+            and method in ("GET", "HEAD")
+            and self.sample_rate < 1.0
         )
+        if sampled and random.random() >= self.sample_rate:
+            return
 
-        return response
+        level = logging.INFO
+        if status_code >= 500:
+            level = logging.ERROR
+        elif status_code >= 400 or duration_ms >= self.slow_ms:
+            level = logging.WARNING
+        if not logger.isEnabledFor(level):
+            return
+
+        fields = {
+            "method": method,
+            "path": scope["path"],
+            "route": route_template(scope),
+            "status": status_code,
+            "duration_ms": round(duration_ms, 2),
+            "client_ip": get_client_ip(scope),
+        }
+        if sampled:
+            fields["sample_rate"] = self.sample_rate  # Weight for counting from logs
+        logger.log(
+            level,
+            "%s %s [%d] %.2fms",
+            method,
+            scope["path"],
+            status_code,
+            duration_ms,
+            extra=fields,
+        )
@@ -1,44 +1,92 @@
 """Request size limiting middleware."""
 
-from typing import Callable
-
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class RequestTooLarge(Exception):
+    """Raised from receive() once the streamed body passes the limit."""
+
 
+class RequestSizeLimitMiddleware:
+    """
+    Middleware to limit request body size (pure ASGI).
 
-class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware to limit request body size."""
+    Rejects oversized ``Content-Length`` up front and counts bytes as the
+    body streams, so chunked uploads are cut off with 413 mid-stream
+    instead of being buffered in full.
+    """
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         max_size: int = 10 * 1024 * 1024,  # 10MB default
     ):
         """
         Initialize size limiter.
-        
+
         Args:
-            app: Starlette/FastAPI app
+            app: ASGI app
             max_size: Maximum request body size in bytes
         """
-        super().__init__(app)
+        self.app = app
         self.max_size = max_size
 
-    async def dispatch(self, request: Request, call_next: Callable):
-        """Check request size before processing."""
-        content_length = request.headers.get("content-length")
-
-        if content_length:
-            try:
-                if int(content_length) > self.max_size:
-                    return JSONResponse(
-                        status_code=413,
-                        content={
-                            "detail": f"Request too large. Maximum size: {self.max_size // (1024*1024)}MB",
-                        },
-                    )
-            except ValueError:
-                pass  # Invalid content-length header, let it through
-
-        return await call_next(request)
+    def _too_large_response(self) -> JSONResponse:
+        return JSONResponse(
+            status_code=413,
+            content={
+                "detail": f"Request too large. Maximum size: {self.max_size // (1024*1024)}MB",
+            },
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Enforce the body size limit while the request streams."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    if int(value) > self.max_size:
+                        await self._too_large_response()(scope, receive, send)
+                        return
+                except ValueError:
+                    pass  # Invalid content-length header, fall back to counting
+                break
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            if exceeded:
+                return {"type": "http.disconnect"}
+
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    exceeded = True
+                    raise RequestTooLarge()
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if exceeded:
+                return  # Drop whatever the app answers; the 413 wins
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            # Body parsers may wrap RequestTooLarge in their own errors
+            if not exceeded:
+                raise
+
+        if exceeded and not response_started:
+            await self._too_large_response()(scope, receive, send)
@@ -0,0 +1,55 @@
+"""Request tracing middleware."""
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from telemetry.tracing import activate, start_trace
+
+from .metrics import route_template
+
+
+class TracingMiddleware:
+    """
+    Middleware to open the root span of sampled requests (pure ASGI).
+
+    Sampling is decided here, once per request, from the W3C traceparent
+    header or TRACING_SAMPLE_RATE. The span is named after the route
+    template once routing has happened, e.g. ``GET /certs/{cert_id}``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Trace the request until its last response message."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        root = start_trace(scope["method"], Headers(scope=scope).get("traceparent", ""))
+        if root is None:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with activate(root):
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = route_template(scope)
+                root.name = f"{scope['method']} {route}"
+                root.attributes.update({
+                    "http.request.method": scope["method"],
+                    "url.path": scope["path"],
+                    "http.route": route,
+                    "http.response.status_code": status_code,
+                })
+                if status_code >= 500 and root.error is None:
+                    root.error = f"HTTP {status_code}"
@@ -15,6 +15,15 @@ from .certification import (
 )
 from .audit import AuditAction, AuditLogCreate, AuditLogResponse
 from .advisory import AdvisoryOutput, CertRecommendation
+from .profiling import (
+    ProfileSummary,
+    ProfilingStatus,
+    ProfilingTrigger,
+    ProfilingTriggerCreate,
+)
+from .coverage import CoverageGap, CoverageMatrix, CoverageRow, CoverageState
+from .report import DepartmentBacklog, DepartmentExpiringCount, DepartmentStatusCounts
+from .upload import GCReport, StoredUpload
 
 __all__ = [
     "EmployeeBase",
@@ -31,4 +40,17 @@ __all__ = [
     "AuditLogResponse",
     "AdvisoryOutput",
     "CertRecommendation",
+    "ProfileSummary",
+    "ProfilingStatus",
+    "ProfilingTrigger",
+    "ProfilingTriggerCreate",
+    "CoverageGap",
+    "CoverageMatrix",
+    "CoverageRow",
+    "CoverageState",
+    "DepartmentBacklog",
+    "DepartmentExpiringCount",
+    "DepartmentStatusCounts",
+    "GCReport",
+    "StoredUpload",
 ]
@@ -30,7 +30,32 @@ class AdvisoryRequest(BaseModel):
     current_certifications: list[str] = Field(default_factory=list)
 
 
-# LangChain prompt templates
+class CatalogCertification(BaseModel):
+    """Entry of the bundled certification catalog used by the offline recommender."""
+
+    name: str
+    vendor: str
+    difficulty: str = Field(..., pattern="^(Beginner|Intermediate|Advanced)$")
+    prep_time: str
+    prerequisites: list[str] = Field(default_factory=list)
+    skills: list[str] = Field(default_factory=list)
+    aliases: list[str] = Field(default_factory=list)
+
+
+class AdvisoryCacheStats(BaseModel):
+    """Advisory cache counters."""
+
+    memory_hits: int = 0
+    persistent_hits: int = 0
+    coalesced: int = 0
+    misses: int = 0
+    hit_ratio: float = 0.0
+    memory_entries: int = 0
+    avg_miss_seconds: float = 0.0
+    latency_saved_seconds: float = 0.0
+
+
+# LangChain prompt templates (f-string format: literal braces are doubled)
 ADVISORY_SYSTEM_PROMPT = """You are a professional certification advisor for enterprise IT professionals.
 
 ## STRICT RULES
@@ -43,19 +68,19 @@ ADVISORY_SYSTEM_PROMPT = """You are a professional certification advisor for ent
 6. Include certification difficulty level (Beginner/Intermediate/Advanced).
 
 ## OUTPUT SCHEMA (STRICT)
-{
+{{
   "recommendations": [
-    {
+    {{
       "certification_name": "string",
       "vendor": "string",
       "difficulty": "Beginner|Intermediate|Advanced",
       "reason": "string (max 50 words)",
       "estimated_prep_time": "string (e.g., '2-3 months')"
-    }
+    }}
   ],
   "confidence": "high|medium|low",
   "clarification_needed": null | "string (question if skills are ambiguous)"
-}
+}}
 """
 
 ADVISORY_USER_TEMPLATE = """Based on the employee profile below, recommend relevant certifications.
@@ -66,5 +91,8 @@ ADVISORY_USER_TEMPLATE = """Based on the employee profile below, recommend relev
 ## Existing Certifications
 {current_certifications}
 
+## Catalog Shortlist (pre-ranked; keep, reorder or replace as appropriate)
+{candidates}
+
 {format_instructions}
 """
@@ -4,7 +4,8 @@ from datetime import date, datetime
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter, field_validator
+from typing_extensions import TypedDict
 
 
 class CertificationStatus(str, Enum):
@@ -48,6 +49,10 @@ class CertificationResponse(CertificationBase):
     employee_name: str
     employee_email: EmailStr
     file_path: Optional[str] = None
+    file_sha256: Optional[str] = None
+    file_mime_type: Optional[str] = None
+    thumbnail_path: Optional[str] = None
+    preview_path: Optional[str] = None
     status: CertificationStatus
     validated_by: Optional[int] = None
     validated_at: Optional[datetime] = None
@@ -59,6 +64,16 @@ class CertificationResponse(CertificationBase):
         from_attributes = True
 
 
+# Serialization-only mirror of CertificationResponse for trusted database rows.
+# Dumping plain dicts through it skips model construction and validation, and
+# produces the same JSON as the model (dicts must use the model's field order).
+CertificationRecord = TypedDict(
+    "CertificationRecord",
+    {name: field.annotation for name, field in CertificationResponse.model_fields.items()},
+)
+certification_list_adapter = TypeAdapter(list[CertificationRecord])
+
+
 class CertificationValidate(BaseModel):
     """Model for validating a certification."""
 
@@ -0,0 +1,42 @@
+"""Certification coverage Pydantic models."""
+
+from datetime import date
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class CoverageState(str, Enum):
+    """Best certification an employee holds from one vendor."""
+
+    MISSING = "missing"
+    PENDING = "pending"  # Submitted, not validated yet
+    EXPIRED = "expired"
+    ACTIVE = "active"  # Includes certifications that never expire
+
+
+class CoverageRow(BaseModel):
+    """One employee's coverage, aligned with CoverageMatrix.vendors."""
+
+    employee_id: int
+    name: str
+    email: str
+    department: Optional[str] = None
+    coverage: list[CoverageState]
+
+
+class CoverageMatrix(BaseModel):
+    """Employees x vendors coverage."""
+
+    as_of: date
+    vendors: list[str]
+    employees: list[CoverageRow]
+
+
+class CoverageGap(BaseModel):
+    """A department where no employee reaches the requested state for a vendor."""
+
+    department: Optional[str] = None
+    vendor: str
+    employees: int
@@ -0,0 +1,55 @@
+"""Request profiling Pydantic models."""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProfilingTriggerCreate(BaseModel):
+    """Model for arming profiling of a route."""
+
+    route: str = Field(..., min_length=1, max_length=200)  # Full template, e.g. /certs/{cert_id}
+    method: str = Field(default="*", max_length=10)  # HTTP method or "*"
+    count: int = Field(default=1, ge=1, le=100)  # Requests to profile
+
+
+class ProfilingTrigger(BaseModel):
+    """An armed route and how many more requests will be profiled."""
+
+    route: str
+    method: str
+    remaining: int
+    armed_by: str
+    armed_at: str
+
+
+class AllocationSite(BaseModel):
+    """Source line that allocated memory during a profiled request."""
+
+    location: str
+    size_diff_bytes: int
+    count_diff: int
+
+
+class ProfileSummary(BaseModel):
+    """Details of one stored profile."""
+
+    id: str
+    created_at: str
+    method: str
+    path: str
+    route: str
+    status: int
+    duration_ms: float
+    cpu_samples: int
+    interval_ms: float
+    trigger: str  # "armed" or "header"
+    requested_by: Optional[str] = None
+    top_allocations: list[AllocationSite] = []
+
+
+class ProfilingStatus(BaseModel):
+    """Armed routes and stored profiles (newest first)."""
+
+    triggers: list[ProfilingTrigger]
+    profiles: list[ProfileSummary]
@@ -0,0 +1,32 @@
+"""Department report Pydantic models."""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class DepartmentStatusCounts(BaseModel):
+    """Certifications of one department by computed status."""
+
+    department: Optional[str] = None  # None = employees without a department
+    total: int = 0
+    active: int = 0
+    expired: int = 0
+    in_progress: int = 0
+    never_expires: int = 0
+
+
+class DepartmentExpiringCount(BaseModel):
+    """Validated certifications of one department expiring within the window."""
+
+    department: Optional[str] = None
+    expiring: int
+
+
+class DepartmentBacklog(BaseModel):
+    """Certifications of one department waiting for validation."""
+
+    department: Optional[str] = None
+    pending: int
+    oldest_submitted_at: datetime
@@ -0,0 +1,21 @@
+"""Uploaded file Pydantic models."""
+
+from pydantic import BaseModel
+
+
+class StoredUpload(BaseModel):
+    """Result of streaming an upload to disk."""
+
+    path: str
+    size_bytes: int
+    sha256: str
+    mime_type: str  # Sniffed from magic bytes, not client-supplied
+
+
+class GCReport(BaseModel):
+    """Summary of one upload garbage-collection pass."""
+
+    files_scanned: int = 0
+    orphans_reclaimed: int = 0
+    bytes_reclaimed: int = 0
+    duration_seconds: float = 0.0
@@ -4,10 +4,16 @@ from .auth_router import auth_router
 from .certification_router import certification_router
 from .advisory_router import advisory_router
 from .audit_router import audit_router
+from .metrics_router import metrics_router
+from .profiling_router import profiling_router
+from .report_router import report_router
 
 __all__ = [
     "auth_router",
     "certification_router",
     "advisory_router",
     "audit_router",
+    "metrics_router",
+    "profiling_router",
+    "report_router",
 ]
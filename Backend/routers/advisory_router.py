@@ -1,9 +1,18 @@
 """AI Advisory router."""
 
-from fastapi import APIRouter, Depends, Request
+from typing import AsyncIterator
 
-from auth.dependencies import get_current_user
-from models.advisory import AdvisoryOutput, AdvisoryRequest
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from auth.dependencies import get_current_user, require_role
+from middleware.client_ip import get_client_ip
+from models.advisory import (
+    AdvisoryCacheStats,
+    AdvisoryOutput,
+    AdvisoryRequest,
+    CertRecommendation,
+)
 from models.audit import AuditAction
 from models.employee import RoleEnum
 from services.advisory_service import get_advisory_service, AdvisoryService
@@ -16,6 +25,7 @@ advisory_router = APIRouter()
 async def get_recommendations(
     request: Request,
     advisory_request: AdvisoryRequest,
+    fast: bool = Query(default=False),
     user: dict = Depends(get_current_user),
     advisory_service: AdvisoryService = Depends(get_advisory_service),
 ):
@@ -24,13 +34,17 @@ async def get_recommendations(
     
     Args:
         advisory_request: Skills and current certifications
+        fast: Return immediately from the cache or the offline catalog
+            instead of waiting for the LLM
         user: Current authenticated user
         advisory_service: Advisory service instance
         
     Returns:
         AI-generated recommendations
     """
-    result = await advisory_service.get_recommendations_with_fallback(advisory_request)
+    result = await advisory_service.get_recommendations_with_fallback(
+        advisory_request, fast=fast
+    )
 
     # Log advisory request
     AuditService.log(
@@ -39,15 +53,70 @@ async def get_recommendations(
         action=AuditAction.ADVISORY,
         entity_type="advisory",
         notes=f"Skills: {', '.join(advisory_request.skills[:5])}...",
-        ip_address=_get_client_ip(request),
+        ip_address=get_client_ip(request.scope),
     )
 
     return result
 
 
-def _get_client_ip(request: Request) -> str:
-    """Extract client IP from request."""
-    forwarded = request.headers.get("x-forwarded-for")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host if request.client else "unknown"
+@advisory_router.post("/stream")
+async def stream_recommendations(
+    request: Request,
+    advisory_request: AdvisoryRequest,
+    user: dict = Depends(get_current_user),
+    advisory_service: AdvisoryService = Depends(get_advisory_service),
+):
+    """
+    Stream AI recommendations as Server-Sent Events.
+
+    Emits one ``recommendation`` event per CertRecommendation as soon as it
+    is parsed, then a ``summary`` event with the full AdvisoryOutput.
+
+    Args:
+        advisory_request: Skills and current certifications
+        user: Current authenticated user
+        advisory_service: Advisory service instance
+
+    Returns:
+        text/event-stream response
+    """
+    # Log advisory request
+    AuditService.log(
+        actor_role=RoleEnum(user["role"]),
+        actor_email=user["sub"],
+        action=AuditAction.ADVISORY,
+        entity_type="advisory",
+        notes=f"Skills: {', '.join(advisory_request.skills[:5])}... (stream)",
+        ip_address=get_client_ip(request.scope),
+    )
+
+    return StreamingResponse(
+        _sse_events(advisory_service.stream_recommendations(advisory_request)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _sse_events(
+    items: AsyncIterator[CertRecommendation | AdvisoryOutput],
+) -> AsyncIterator[str]:
+    """Format streamed advisory items as Server-Sent Events."""
+    async for item in items:
+        event = "recommendation" if isinstance(item, CertRecommendation) else "summary"
+        yield f"event: {event}\ndata: {item.model_dump_json()}\n\n"
+
+
+@advisory_router.get("/cache/stats", response_model=AdvisoryCacheStats)
+async def get_cache_stats(
+    user: dict = Depends(require_role(["manager"])),
+    advisory_service: AdvisoryService = Depends(get_advisory_service),
+):
+    """
+    Get advisory cache hit ratio and estimated latency saved (manager only).
+
+    Counters are per worker process.
+
+    Returns:
+        Cache statistics
+    """
+    return advisory_service.cache.snapshot()
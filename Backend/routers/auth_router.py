@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, HTTPException, Request, status
 
+from middleware.client_ip import get_client_ip
 from models.audit import AuditAction
 from models.employee import LoginRequest, TokenResponse, EmployeeCreate, EmployeeResponse, RoleEnum
 from services.auth_service import AuthService
@@ -36,7 +37,7 @@ async def login(request: Request, login_data: LoginRequest):
         action=AuditAction.LOGIN,
         entity_type="auth",
         notes="Successful login",
-        ip_address=_get_client_ip(request),
+        ip_address=get_client_ip(request.scope),
     )
 
     return result
@@ -69,15 +70,7 @@ async def register(request: Request, employee_data: EmployeeCreate):
         entity_type="employee",
         entity_id=str(result.id),
         notes="New user registration",
-        ip_address=_get_client_ip(request),
+        ip_address=get_client_ip(request.scope),
     )
 
     return result
-
-
-def _get_client_ip(request: Request) -> str:
-    """Extract client IP from request."""
-    forwarded = request.headers.get("x-forwarded-for")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host if request.client else "unknown"
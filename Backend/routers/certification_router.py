@@ -1,16 +1,25 @@
 """Certification router."""
 
+from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import FileResponse, Response
+from starlette.concurrency import run_in_threadpool
 
 from auth.dependencies import get_current_user, require_role
 from config import get_settings
+from middleware.client_ip import get_client_ip
 from models.audit import AuditAction
 from models.certification import CertificationCreate, CertificationResponse
 from models.employee import RoleEnum
 from services.audit_service import AuditService
-from services.certification_service import CertificationService
+from services.certification_service import (
+    CertificationService,
+    UnsupportedFileTypeError,
+    UploadTooLargeError,
+)
+from services.preview_service import PreviewService
 
 settings = get_settings()
 certification_router = APIRouter()
@@ -44,35 +53,7 @@ async def create_certification(
     """
     from datetime import date as date_type
 
-    # Validate file if provided
-    file_path = None
-    if file:
-        # Check MIME type
-        content = await file.read()
-        await file.seek(0)
-
-        # Simple MIME check (in production, use python-magic)
-        if file.content_type not in settings.allowed_mime_types_list:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File type not allowed. Allowed: {settings.ALLOWED_MIME_TYPES}",
-            )
-
-        # Check file size
-        if len(content) > settings.max_upload_size_bytes:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File too large. Maximum: {settings.MAX_UPLOAD_SIZE_MB}MB",
-            )
-
-        # Save file
-        file_path = CertificationService.save_upload_file(
-            file_content=content,
-            filename=file.filename,
-            employee_id=user["user_id"],
-        )
-
-    # Parse dates
+    # Parse dates before touching the disk
     try:
         date_obtained_parsed = date_type.fromisoformat(date_obtained)
         expiry_date_parsed = date_type.fromisoformat(expiry_date) if expiry_date else None
@@ -91,15 +72,41 @@ async def create_certification(
         expiry_date=expiry_date_parsed,
     )
 
+    # Validate and stream file if provided
+    stored = None
+    if file:
+        # Sniff the type from magic bytes and stream into the blob store,
+        # enforcing the size limit as chunks arrive
+        try:
+            stored = await CertificationService.save_upload_file(
+                file=file,
+                max_size=settings.max_upload_size_bytes,
+                allowed_types=settings.allowed_mime_types_list,
+            )
+        except UnsupportedFileTypeError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File type not allowed. Allowed: {settings.ALLOWED_MIME_TYPES}",
+            )
+        except UploadTooLargeError:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File too large. Maximum: {settings.MAX_UPLOAD_SIZE_MB}MB",
+            )
+
     # Create certification
     cert = CertificationService.create_certification(
         employee_id=user["user_id"],
         employee_name=user["name"],
         employee_email=user["sub"],
         data=cert_data,
-        file_path=file_path,
+        upload=stored,
     )
 
+    # Render thumbnail/preview in the background
+    if stored:
+        PreviewService.schedule(cert.id, stored.path, stored.sha256, stored.mime_type)
+
     # Log upload
     AuditService.log(
         actor_role=RoleEnum(user["role"]),
@@ -108,7 +115,7 @@ async def create_certification(
         entity_type="certification",
         entity_id=cert.id,
         notes=f"Uploaded: {certification_name}",
-        ip_address=_get_client_ip(request),
+        ip_address=get_client_ip(request.scope),
     )
 
     return cert
@@ -120,11 +127,17 @@ async def get_my_certifications(
 ):
     """
     Get current user's certifications.
+
+    Rows are serialized straight to JSON in the threadpool; response_model
+    only documents the shape.
     
     Returns:
         List of user's certifications
     """
-    return CertificationService.get_employee_certifications(user["user_id"])
+    body = await run_in_threadpool(
+        CertificationService.get_employee_certifications_json, user["user_id"]
+    )
+    return Response(content=body, media_type="application/json")
 
 
 @certification_router.get("", response_model=list[CertificationResponse])
@@ -133,11 +146,15 @@ async def get_all_certifications(
 ):
     """
     Get all certifications (manager only).
+
+    Rows are serialized straight to JSON in the threadpool; response_model
+    only documents the shape.
     
     Returns:
         List of all certifications
     """
-    return CertificationService.get_all_certifications()
+    body = await run_in_threadpool(CertificationService.get_all_certifications_json)
+    return Response(content=body, media_type="application/json")
 
 
 @certification_router.get("/{cert_id}", response_model=CertificationResponse)
@@ -172,6 +189,79 @@ async def get_certification(
     return cert
 
 
+@certification_router.get("/{cert_id}/file")
+async def download_certification_file(
+    request: Request,
+    cert_id: str,
+    variant: str = Query(default="original", pattern="^(original|thumbnail|preview)$"),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Download a certification's file, thumbnail or preview.
+
+    Content-addressed files are served with a strong ETag (the SHA-256) and
+    an immutable Cache-Control, so repeat views come from the browser
+    cache. Range requests are answered with 206.
+
+    Args:
+        cert_id: Certification ID
+        variant: original, thumbnail or preview
+
+    Returns:
+        File response, or 304 if the client copy is current
+    """
+    cert = CertificationService.get_certification(cert_id)
+
+    if not cert:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Certification not found",
+        )
+
+    # Employees can only view their own certifications
+    if user["role"] == "employee" and cert.employee_id != user["user_id"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Cannot access other employee's certification",
+        )
+
+    if variant == "thumbnail":
+        file_path, media_type = cert.thumbnail_path, "image/webp"
+    elif variant == "preview":
+        file_path, media_type = cert.preview_path, "image/webp"
+    else:
+        file_path, media_type = cert.file_path, cert.file_mime_type
+
+    headers = {"Cache-Control": "private, no-cache"}
+    if cert.file_sha256 and file_path:
+        # Blob and derivative contents never change for a given hash, so a
+        # revalidation is answered from the row without touching the disk
+        etag = f'"{cert.file_sha256}-{variant}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "private, max-age=31536000, immutable",
+        }
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Never serve anything outside the upload directory
+    upload_root = Path(settings.UPLOAD_DIR).resolve()
+    resolved = Path(file_path).resolve() if file_path else None
+    if not resolved or not resolved.is_relative_to(upload_root) or not resolved.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found",
+        )
+
+    return FileResponse(
+        resolved,
+        media_type=media_type,
+        headers=headers,
+        content_disposition_type="inline",
+        filename=f"{cert_id}{resolved.suffix}",
+    )
+
+
 @certification_router.post("/{cert_id}/validate", response_model=CertificationResponse)
 async def validate_certification(
     request: Request,
@@ -206,7 +296,7 @@ async def validate_certification(
         entity_type="certification",
         entity_id=cert_id,
         notes=f"Validated: {cert.certification_name}",
-        ip_address=_get_client_ip(request),
+        ip_address=get_client_ip(request.scope),
     )
 
     return cert
@@ -246,15 +336,7 @@ async def delete_certification(
             entity_type="certification",
             entity_id=cert_id,
             notes=f"Deleted: {cert.certification_name}",
-            ip_address=_get_client_ip(request),
+            ip_address=get_client_ip(request.scope),
         )
 
     return {"message": "Certification deleted successfully"}
-
-
-def _get_client_ip(request: Request) -> str:
-    """Extract client IP from request."""
-    forwarded = request.headers.get("x-forwarded-for")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host if request.client else "unknown"
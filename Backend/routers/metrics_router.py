@@ -0,0 +1,31 @@
+"""Metrics router."""
+
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from config import get_settings
+from telemetry import CONTENT_TYPE, render_metrics
+
+settings = get_settings()
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("", include_in_schema=False)
+def get_metrics(request: Request):
+    """
+    Prometheus scrape endpoint (sync: merging worker files reads from disk).
+
+    Returns:
+        Metrics in the Prometheus text exposition format
+    """
+    if settings.METRICS_BEARER_TOKEN:
+        expected = f"Bearer {settings.METRICS_BEARER_TOKEN}"
+        if not hmac.compare_digest(request.headers.get("authorization", ""), expected):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
@@ -0,0 +1,117 @@
+"""Request profiling router (manager only)."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse
+
+from auth.dependencies import require_role
+from models.profiling import (
+    ProfileSummary,
+    ProfilingStatus,
+    ProfilingTrigger,
+    ProfilingTriggerCreate,
+)
+from telemetry.profiling import ProfileStore, ProfileTriggers
+
+profiling_router = APIRouter()
+
+
+@profiling_router.get("", response_model=ProfilingStatus)
+def get_profiling_status(user: dict = Depends(require_role(["manager"]))):
+    """
+    List armed routes and stored profiles (manager only).
+
+    Returns:
+        Armed triggers of this worker and all stored profiles, newest first
+    """
+    return ProfilingStatus(triggers=ProfileTriggers.active(), profiles=ProfileStore.list())
+
+
+@profiling_router.post("/triggers", response_model=ProfilingTrigger)
+def arm_profiling(
+    body: ProfilingTriggerCreate,
+    request: Request,
+    user: dict = Depends(require_role(["manager"])),
+):
+    """
+    Profile the next requests to a route (manager only).
+
+    Args:
+        body: Route template, method and number of requests
+
+    Returns:
+        The armed trigger
+
+    Raises:
+        HTTPException: If the route or method does not exist
+    """
+    method = body.method.upper()
+    operations = request.app.openapi()["paths"].get(body.route)
+    if operations is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown route template: {body.route}",
+        )
+    if method != "*" and method.lower() not in operations:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{body.route} does not accept {method}",
+        )
+    return ProfileTriggers.arm(body.route, method, body.count, user.get("sub", ""))
+
+
+@profiling_router.delete("/triggers")
+def disarm_profiling(
+    route: str = Query(..., min_length=1),
+    method: str = Query(default="*"),
+    user: dict = Depends(require_role(["manager"])),
+):
+    """
+    Stop profiling a route (manager only).
+
+    Args:
+        route: Route template the trigger was armed with
+        method: Method the trigger was armed with
+
+    Returns:
+        Whether a trigger was removed
+    """
+    return {"disarmed": ProfileTriggers.disarm(route, method.upper())}
+
+
+@profiling_router.get("/{profile_id}", response_model=ProfileSummary)
+def get_profile(profile_id: str, user: dict = Depends(require_role(["manager"]))):
+    """
+    Get the details of one profile (manager only).
+
+    Args:
+        profile_id: Profile ID (X-Profile-Id response header)
+
+    Returns:
+        Request details and top allocation sites
+    """
+    path = ProfileStore.path(profile_id, "json")
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return ProfileSummary.model_validate_json(path.read_bytes())
+
+
+@profiling_router.get("/{profile_id}/{kind}")
+def download_profile(
+    profile_id: str,
+    kind: str,
+    user: dict = Depends(require_role(["manager"])),
+):
+    """
+    Download collapsed stacks for a flamegraph (manager only).
+
+    Args:
+        profile_id: Profile ID
+        kind: "cpu" (sample counts) or "mem" (bytes allocated)
+
+    Returns:
+        Folded stacks, one "frame;frame;... value" line per stack
+    """
+    path = ProfileStore.path(profile_id, kind) if kind in ("cpu", "mem") else None
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=path.name)
@@ -0,0 +1,117 @@
+"""Department report router (manager only)."""
+
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query, Response
+from starlette.concurrency import run_in_threadpool
+
+from auth.dependencies import require_role
+from models.coverage import CoverageGap, CoverageMatrix, CoverageState
+from models.report import (
+    DepartmentBacklog,
+    DepartmentExpiringCount,
+    DepartmentStatusCounts,
+)
+from services.coverage_service import CoverageService
+from services.report_service import ReportService
+
+report_router = APIRouter()
+
+
+@report_router.get("/departments/status", response_model=list[DepartmentStatusCounts])
+async def get_department_status(
+    user: dict = Depends(require_role(["manager"])),
+):
+    """
+    Get certification counts by status per department (manager only).
+
+    Returns:
+        Totals and active/expired/in-progress/never-expiring counts per department
+    """
+    return await run_in_threadpool(ReportService.get_department_status)
+
+
+@report_router.get("/departments/expiring", response_model=list[DepartmentExpiringCount])
+async def get_department_expiring(
+    days: int = Query(default=30, ge=1, le=365),
+    user: dict = Depends(require_role(["manager"])),
+):
+    """
+    Get validated certifications expiring soon per department (manager only).
+
+    Args:
+        days: Window from today, inclusive
+
+    Returns:
+        Expiring counts for departments with at least one
+    """
+    return await run_in_threadpool(ReportService.get_department_expiring, days)
+
+
+@report_router.get("/departments/backlog", response_model=list[DepartmentBacklog])
+async def get_department_backlog(
+    user: dict = Depends(require_role(["manager"])),
+):
+    """
+    Get the validation backlog per department (manager only).
+
+    Returns:
+        Pending counts and oldest submission for departments with a backlog
+    """
+    return await run_in_threadpool(ReportService.get_department_backlog)
+
+
+@report_router.get("/coverage", response_model=CoverageMatrix)
+async def get_coverage_matrix(
+    department: Optional[str] = None,
+    vendor: Optional[list[str]] = Query(default=None),
+    fmt: Literal["json", "csv"] = Query(default="json", alias="format"),
+    user: dict = Depends(require_role(["manager"])),
+):
+    """
+    Get the employee x vendor certification coverage matrix (manager only).
+
+    Each cell is the best state of the employee's certifications from
+    that vendor: active, expired, pending or missing. The matrix is
+    cached until the next certification or employee write; response_model
+    only documents the JSON shape.
+
+    Args:
+        department: Only employees of this department
+        vendor: Only these vendors (repeatable, case-insensitive)
+        format: "json" or "csv"
+
+    Returns:
+        The matrix as JSON, or as CSV with one column per vendor
+    """
+    if fmt == "csv":
+        body = await run_in_threadpool(CoverageService.get_matrix_csv, department, vendor)
+        return Response(
+            content=body,
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="coverage.csv"'},
+        )
+    matrix = await run_in_threadpool(CoverageService.get_matrix, department, vendor)
+    return Response(content=matrix.model_dump_json(), media_type="application/json")
+
+
+@report_router.get("/coverage/gaps", response_model=list[CoverageGap])
+async def get_coverage_gaps(
+    vendor: Optional[str] = None,
+    state: CoverageState = CoverageState.ACTIVE,
+    user: dict = Depends(require_role(["manager"])),
+):
+    """
+    Get departments where nobody covers a vendor (manager only).
+
+    E.g. ``?vendor=Azure`` lists departments with zero active Azure
+    certifications; ``state=expired`` also counts lapsed ones as coverage.
+
+    Args:
+        vendor: Only this vendor (default: every vendor)
+        state: Minimum state that counts as covered
+
+    Returns:
+        Department and vendor pairs without coverage
+    """
+    return await run_in_threadpool(CoverageService.get_gaps, vendor, state)
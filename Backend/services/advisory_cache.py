@@ -0,0 +1,204 @@
+"""Two-tier advisory response cache with single-flight de-duplication."""
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from database.repositories import AdvisoryCacheRepository
+from models.advisory import AdvisoryCacheStats, AdvisoryOutput, AdvisoryRequest
+
+logger = logging.getLogger("certtrack.advisory_cache")
+
+# Purge expired persistent entries every N writes
+PURGE_EVERY = 500
+
+
+def normalize_request(request: AdvisoryRequest) -> AdvisoryRequest:
+    """
+    Canonical form of an advisory request.
+
+    Skills and certifications are stripped, case-folded, de-duplicated and
+    sorted, so "AWS, Python" and "python, aws " share one cache entry and
+    one prompt.
+    """
+    def canonical(values: list[str]) -> list[str]:
+        return sorted({v.strip().casefold() for v in values if v.strip()})
+
+    return AdvisoryRequest(
+        skills=canonical(request.skills),
+        current_certifications=canonical(request.current_certifications),
+    )
+
+
+def cache_key(request: AdvisoryRequest) -> str:
+    """Stable hash of a normalized request."""
+    payload = json.dumps(
+        [request.skills, request.current_certifications],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class AdvisoryCache:
+    """
+    In-memory LRU in front of a persistent SQLite tier, each with its own TTL.
+
+    SQLite reads and writes run in the threadpool, so a busy database never
+    stalls the event loop.
+
+    Concurrent misses for the same key share one in-flight computation,
+    which finishes (and fills the cache) even if its callers are cancelled.
+    """
+
+    def __init__(self, memory_size: int, memory_ttl: float, persistent_ttl: float):
+        self.memory_size = memory_size
+        self.memory_ttl = memory_ttl
+        self.persistent_ttl = persistent_ttl
+        self._memory: OrderedDict[str, tuple[float, AdvisoryOutput]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._writes = 0
+
+        self.stats = AdvisoryCacheStats()
+        # Moving average of miss latency, used to estimate time saved per hit
+        self._avg_miss_seconds = 0.0
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[AdvisoryOutput]],
+    ) -> AdvisoryOutput:
+        """
+        Return the cached result for key, computing it at most once at a time.
+
+        Args:
+            key: Cache key from cache_key()
+            compute: Coroutine factory producing the result on a miss
+
+        Returns:
+            Cached or freshly computed advisory output
+        """
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._memory.move_to_end(key)
+                self._record_hit("memory")
+                return entry[1]
+            del self._memory[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats.coalesced += 1
+            self._record_hit(None)
+        else:
+            # The computation is its own task, so a cancelled caller (e.g. a
+            # disconnected client) never cancels it for the others
+            inflight = asyncio.get_running_loop().create_task(self._compute(key, compute, now))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(functools.partial(self._finish_inflight, key))
+        return await asyncio.shield(inflight)
+
+    async def _compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[AdvisoryOutput]],
+        now: float,
+    ) -> AdvisoryOutput:
+        result = await self._get_persistent(key, now)
+        if result is None:
+            started = time.perf_counter()
+            result = await compute()
+            self._record_miss(time.perf_counter() - started)
+            await self._set_persistent(key, result, now)
+        else:
+            self._record_hit("persistent")
+
+        self._set_memory(key, result, now)
+        return result
+
+    def _finish_inflight(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark retrieved so failures nobody waited for do not log warnings
+        if not task.cancelled():
+            task.exception()
+
+    async def peek(self, key: str) -> Optional[AdvisoryOutput]:
+        """Look up key in both tiers without computing (counts as a hit)."""
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None and entry[0] > now:
+            self._memory.move_to_end(key)
+            self._record_hit("memory")
+            return entry[1]
+
+        result = await self._get_persistent(key, now)
+        if result is not None:
+            self._record_hit("persistent")
+            self._set_memory(key, result, now)
+        return result
+
+    async def put(self, key: str, result: AdvisoryOutput) -> None:
+        """Store a result computed outside get_or_compute (e.g. a stream)."""
+        now = time.time()
+        await self._set_persistent(key, result, now)
+        self._set_memory(key, result, now)
+
+    async def _get_persistent(self, key: str, now: float) -> Optional[AdvisoryOutput]:
+        try:
+            row = await run_in_threadpool(AdvisoryCacheRepository.get, key)
+        except Exception:
+            logger.exception("Advisory cache read failed")
+            return None
+        if row is None:
+            return None
+        return AdvisoryOutput.model_validate_json(row[0])
+
+    async def _set_persistent(self, key: str, result: AdvisoryOutput, now: float) -> None:
+        try:
+            await run_in_threadpool(
+                AdvisoryCacheRepository.set, key, result.model_dump_json(), now + self.persistent_ttl
+            )
+            self._writes += 1
+            if self._writes % PURGE_EVERY == 0:
+                await run_in_threadpool(AdvisoryCacheRepository.purge_expired)
+        except Exception:
+            logger.exception("Advisory cache write failed")
+
+    def _set_memory(self, key: str, result: AdvisoryOutput, now: float) -> None:
+        self._memory[key] = (now + self.memory_ttl, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _record_hit(self, tier: Optional[str]) -> None:
+        if tier == "memory":
+            self.stats.memory_hits += 1
+        elif tier == "persistent":
+            self.stats.persistent_hits += 1
+        self.stats.latency_saved_seconds += self._avg_miss_seconds
+
+    def _record_miss(self, seconds: float) -> None:
+        self.stats.misses += 1
+        if self._avg_miss_seconds == 0.0:
+            self._avg_miss_seconds = seconds
+        else:
+            self._avg_miss_seconds = 0.9 * self._avg_miss_seconds + 0.1 * seconds
+
+    def snapshot(self) -> AdvisoryCacheStats:
+        """Current counters plus derived hit ratio."""
+        stats = self.stats.model_copy()
+        lookups = stats.memory_hits + stats.persistent_hits + stats.coalesced + stats.misses
+        stats.hit_ratio = round((lookups - stats.misses) / lookups, 4) if lookups else 0.0
+        stats.memory_entries = len(self._memory)
+        stats.avg_miss_seconds = round(self._avg_miss_seconds, 4)
+        stats.latency_saved_seconds = round(stats.latency_saved_seconds, 3)
+        return stats
@@ -1,18 +1,36 @@
-"""AI Advisory service using LangChain."""
+"""
+AI Advisory service using LangChain.
 
-from langchain_core.output_parsers import PydanticOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
+LangChain, the OpenAI SDK and httpx take over a second to import, so they
+are imported when the service is first constructed (see
+get_advisory_service and prewarm_advisory_service), not with this module.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Union
+
+from starlette.concurrency import run_in_threadpool
 
 from config import get_settings
 from models.advisory import (
     AdvisoryOutput,
+    CertRecommendation,
     AdvisoryRequest,
     ADVISORY_SYSTEM_PROMPT,
     ADVISORY_USER_TEMPLATE,
 )
+from services.advisory_cache import AdvisoryCache, cache_key, normalize_request
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from services.offline_recommender import get_offline_recommender
+from telemetry import LLM_REJECTIONS, LLM_REQUEST_DURATION, span
+from telemetry.tracing import KIND_CLIENT
 
 settings = get_settings()
+logger = logging.getLogger("certtrack.advisory")
 
 
 class AdvisoryService:
@@ -20,11 +38,32 @@ class AdvisoryService:
 
     def __init__(self):
         """Initialize with settings from environment."""
+        import httpx
+        from langchain_core.output_parsers import JsonOutputParser, PydanticOutputParser
+        from langchain_core.prompts import ChatPromptTemplate
+        from langchain_openai import ChatOpenAI
+
+        # One pooled client for all calls, so connections are kept alive and reused
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.ADVISORY_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.ADVISORY_POOL_MAX_CONNECTIONS,
+                keepalive_expiry=settings.ADVISORY_POOL_KEEPALIVE_SECONDS,
+            ),
+            timeout=httpx.Timeout(
+                settings.ADVISORY_TIMEOUT_SECONDS,
+                connect=settings.ADVISORY_CONNECT_TIMEOUT_SECONDS,
+            ),
+        )
+
         self.llm = ChatOpenAI(
             api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL or None,
             model=settings.OPENAI_MODEL,
             temperature=settings.OPENAI_TEMPERATURE,
             max_tokens=settings.OPENAI_MAX_TOKENS,
+            max_retries=settings.ADVISORY_MAX_RETRIES,
+            http_async_client=self.http_client,
         )
 
         # Create output parser
@@ -39,6 +78,91 @@ class AdvisoryService:
         # Create chain
         self.chain = self.prompt | self.llm | self.output_parser
 
+        # Streaming chain: JsonOutputParser yields growing partial dicts
+        self.stream_chain = self.prompt | self.llm | JsonOutputParser()
+
+        # Catalog-based recommender: shortlist for the LLM, fallback and fast path
+        self.offline = get_offline_recommender()
+
+        # Response cache (memory LRU + SQLite), keyed by normalized input
+        self.cache = AdvisoryCache(
+            memory_size=settings.ADVISORY_CACHE_MEMORY_SIZE,
+            memory_ttl=settings.ADVISORY_CACHE_MEMORY_TTL_SECONDS,
+            persistent_ttl=settings.ADVISORY_CACHE_PERSISTENT_TTL_SECONDS,
+        )
+
+        # Upstream protection: bounded concurrency and fail-fast when unhealthy
+        self.slots = asyncio.Semaphore(settings.ADVISORY_MAX_CONCURRENCY)
+        self.breaker = CircuitBreaker(
+            "advisory_llm",
+            failure_threshold=settings.ADVISORY_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.ADVISORY_BREAKER_RESET_SECONDS,
+        )
+
+    @asynccontextmanager
+    async def _upstream_call(self, mode: str) -> AsyncIterator[None]:
+        """
+        Admit one LLM call through the circuit breaker and concurrency limit.
+
+        The outcome of the body is reported to the breaker. Malformed model
+        output still means the upstream answered, so it counts as healthy.
+        Call time (excluding the wait for a slot) is recorded per outcome.
+
+        Args:
+            mode: Metrics label of the call ("completion" or "stream")
+
+        Raises:
+            CircuitOpenError: If the upstream is considered unhealthy
+            AdvisoryOverloadedError: If no slot frees up in time
+        """
+        from langchain_core.exceptions import OutputParserException
+
+        # Fail fast without queueing while the circuit is open
+        try:
+            self.breaker.raise_if_open()
+        except CircuitOpenError:
+            LLM_REJECTIONS.labels("circuit_open").inc()
+            raise
+        try:
+            await asyncio.wait_for(
+                self.slots.acquire(), settings.ADVISORY_QUEUE_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            LLM_REJECTIONS.labels("overloaded").inc()
+            raise AdvisoryOverloadedError(settings.ADVISORY_MAX_CONCURRENCY) from None
+
+        try:
+            # Re-check after queueing: the circuit may have opened meanwhile
+            try:
+                probe = self.breaker.before_call()
+            except CircuitOpenError:
+                LLM_REJECTIONS.labels("circuit_open").inc()
+                raise
+            started = time.perf_counter()
+            outcome = "success"
+            try:
+                yield
+            except OutputParserException:
+                outcome = "invalid_output"
+                self.breaker.record_success()
+                raise
+            except Exception as e:
+                outcome = "timeout" if isinstance(e, asyncio.TimeoutError) else "error"
+                self.breaker.record_failure()
+                raise
+            except BaseException:
+                # Cancelled or closed: no verdict on upstream health
+                outcome = "cancelled"
+                if probe:
+                    self.breaker.release_probe()
+                raise
+            else:
+                self.breaker.record_success()
+            finally:
+                LLM_REQUEST_DURATION.labels(mode, outcome).observe(time.perf_counter() - started)
+        finally:
+            self.slots.release()
+
     async def get_recommendations(
         self,
         request: AdvisoryRequest,
@@ -52,50 +176,214 @@ class AdvisoryService:
         Returns:
             Structured advisory output
         """
+        # Normalize so identical profiles produce identical prompts
+        request = normalize_request(request)
+        if settings.ADVISORY_MODE == "offline":
+            return self.offline.recommend(request)
+
+        async with self._upstream_call("completion"):
+            with span("llm.chain.ainvoke", KIND_CLIENT, **{"gen_ai.request.model": settings.OPENAI_MODEL}):
+                result = await asyncio.wait_for(
+                    self.chain.ainvoke(self._chain_input(request)),
+                    settings.ADVISORY_TIMEOUT_SECONDS,
+                )
+        return result
+
+    def _chain_input(self, request: AdvisoryRequest) -> dict:
+        """Build prompt variables from a normalized request."""
         # Compress input to minimize tokens
         skills_str = ", ".join(request.skills[:20])  # Cap at 20 skills
         certs_str = ", ".join(request.current_certifications[:10]) or "None"
 
-        result = await self.chain.ainvoke({
+        candidates_str = "None"
+        if settings.ADVISORY_MODE == "hybrid":
+            shortlist = self.offline.recommend(request).recommendations
+            candidates_str = "\n".join(
+                f"- {r.certification_name} ({r.vendor}, {r.difficulty})" for r in shortlist
+            ) or "None"
+
+        return {
             "skills": skills_str,
             "current_certifications": certs_str,
-        })
-        return result
+            "candidates": candidates_str,
+        }
+
+    def _fallback_output(self, request: AdvisoryRequest, error: Exception) -> AdvisoryOutput:
+        """Safe response returned instead of crashing when the AI fails."""
+        if settings.ADVISORY_MODE != "llm":
+            offline = self.offline.recommend(normalize_request(request))
+            if offline.recommendations:
+                return offline
+
+        return AdvisoryOutput(
+            recommendations=[],
+            confidence="low",
+            clarification_needed=(
+                f"AI service temporarily unavailable. Please try again later. "
+                f"Error: {str(error)[:100]}"
+            ),
+        )
 
     async def get_recommendations_with_fallback(
         self,
         request: AdvisoryRequest,
+        fast: bool = False,
     ) -> AdvisoryOutput:
         """
         Graceful degradation if AI fails.
+
+        Successful results are cached; identical concurrent requests share
+        one LLM call. Fallback responses (the catalog result unless
+        ADVISORY_MODE is "llm") are never cached.
         
         Args:
             request: Advisory request
+            fast: Answer without waiting for the LLM (cached result, else catalog)
             
         Returns:
             Advisory output or fallback response
         """
+        if fast or settings.ADVISORY_MODE == "offline":
+            cached = None
+            if settings.ADVISORY_CACHE_ENABLED and settings.ADVISORY_MODE != "offline":
+                cached = await self.cache.peek(cache_key(normalize_request(request)))
+            return cached or self.offline.recommend(normalize_request(request))
+
         try:
-            return await self.get_recommendations(request)
+            if not settings.ADVISORY_CACHE_ENABLED:
+                return await self.get_recommendations(request)
+
+            key = cache_key(normalize_request(request))
+            return await self.cache.get_or_compute(
+                key, lambda: self.get_recommendations(request)
+            )
         except Exception as e:
             # Return safe fallback instead of crashing
-            return AdvisoryOutput(
-                recommendations=[],
-                confidence="low",
-                clarification_needed=(
-                    f"AI service temporarily unavailable. Please try again later. "
-                    f"Error: {str(e)[:100]}"
-                ),
-            )
+            return self._fallback_output(request, e)
+
+    async def stream_recommendations(
+        self,
+        request: AdvisoryRequest,
+    ) -> AsyncIterator[Union[CertRecommendation, AdvisoryOutput]]:
+        """
+        Stream recommendations as soon as each one is fully parsed.
+
+        Yields each CertRecommendation in order, then the complete
+        AdvisoryOutput as the final item (the fallback output on failure).
+        Cached results are replayed immediately; completed streams are cached.
+
+        Args:
+            request: Advisory request
+
+        Yields:
+            Recommendations, then the summary
+        """
+        request = normalize_request(request)
+        key = cache_key(request)
+
+        if settings.ADVISORY_MODE == "offline":
+            cached = self.offline.recommend(request)
+        elif settings.ADVISORY_CACHE_ENABLED:
+            cached = await self.cache.peek(key)
+        else:
+            cached = None
+        if cached is not None:
+            for recommendation in cached.recommendations:
+                yield recommendation
+            yield cached
+            return
+
+        emitted = 0
+        partial: dict = {}
+        try:
+            async with self._upstream_call("stream"):
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + settings.ADVISORY_TIMEOUT_SECONDS
+                stream = self.stream_chain.astream(self._chain_input(request))
+                try:
+                    while True:
+                        # The deadline covers the upstream only, not time spent yielding
+                        async with asyncio.timeout_at(deadline):
+                            try:
+                                partial = await anext(stream)
+                            except StopAsyncIteration:
+                                break
+
+                        items = partial.get("recommendations") or [] if isinstance(partial, dict) else []
+                        # An entry is complete once the next one has started
+                        while emitted < len(items) - 1:
+                            yield CertRecommendation.model_validate(items[emitted])
+                            emitted += 1
+                finally:
+                    await stream.aclose()
+
+            if not partial or not isinstance(partial, dict):
+                from langchain_core.exceptions import OutputParserException
+
+                raise OutputParserException("Model returned no JSON object")
+            output = AdvisoryOutput.model_validate(partial)
+        except Exception as e:
+            fallback = self._fallback_output(request, e)
+            if not emitted:
+                for recommendation in fallback.recommendations:
+                    yield recommendation
+            yield fallback
+            return
+
+        for recommendation in output.recommendations[emitted:]:
+            yield recommendation
+
+        if settings.ADVISORY_CACHE_ENABLED:
+            await self.cache.put(key, output)
+        yield output
+
+    async def aclose(self) -> None:
+        """Close pooled upstream connections."""
+        await self.http_client.aclose()
+
+
+class AdvisoryOverloadedError(Exception):
+    """Raised when every LLM slot stays busy past the queue timeout."""
+
+    def __init__(self, max_concurrency: int):
+        super().__init__(f"All {max_concurrency} advisory slots busy")
+        self.max_concurrency = max_concurrency
 
 
 # Singleton instance
 _advisory_service: AdvisoryService | None = None
+_advisory_service_lock = threading.Lock()
 
 
 def get_advisory_service() -> AdvisoryService:
-    """Factory for advisory service dependency."""
+    """
+    Factory for advisory service dependency.
+
+    The first call imports the LangChain stack; the lock keeps a pre-warm
+    running in the threadpool and a first request from building two.
+    """
     global _advisory_service
     if _advisory_service is None:
-        _advisory_service = AdvisoryService()
+        with _advisory_service_lock:
+            if _advisory_service is None:
+                _advisory_service = AdvisoryService()
     return _advisory_service
+
+
+async def prewarm_advisory_service() -> None:
+    """Build the singleton in the threadpool so imports stay off the event loop."""
+    started = time.perf_counter()
+    try:
+        await run_in_threadpool(get_advisory_service)
+    except Exception:
+        logger.exception("Advisory service pre-warm failed")
+        return
+    logger.info("Advisory service pre-warmed in %.2fs", time.perf_counter() - started)
+
+
+async def shutdown_advisory_service() -> None:
+    """Release the singleton's upstream connections, if it was created."""
+    global _advisory_service
+    if _advisory_service is not None:
+        await _advisory_service.aclose()
+        _advisory_service = None
@@ -5,8 +5,10 @@ from typing import Optional
 from database.repositories import AuditRepository
 from models.audit import AuditAction, AuditLogResponse
 from models.employee import RoleEnum
+from telemetry import traced_methods
 
 
+@traced_methods
 class AuditService:
     """Service for audit logging operations."""
 
@@ -11,8 +11,10 @@ from models.employee import (
     EmployeeResponse,
     TokenResponse,
 )
+from telemetry import traced_methods
 
 
+@traced_methods
 class AuthService:
     """Service for authentication operations."""
 
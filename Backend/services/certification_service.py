@@ -1,19 +1,32 @@
 """Certification service."""
 
-from datetime import date
+import hashlib
+import os
+import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
 
 from config import get_settings
-from database.repositories import CertificationRepository
+from database.repositories import BlobRepository, CertificationRepository
 from models.certification import (
     CertificationCreate,
     CertificationResponse,
 )
+from models.upload import StoredUpload
+from services.file_types import MIME_EXTENSIONS, SNIFF_BYTES, sniff_mime_type
+from services.preview_service import PreviewService
+from telemetry import UPLOAD_BYTES, traced_methods
 
 settings = get_settings()
 
+# Bytes read from the upload and written to disk per threadpool hop
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
 
+@traced_methods
 class CertificationService:
     """Service for certification operations."""
 
@@ -23,32 +36,40 @@ class CertificationService:
         employee_name: str,
         employee_email: str,
         data: CertificationCreate,
-        file_path: Optional[str] = None,
+        upload: Optional[StoredUpload] = None,
     ) -> CertificationResponse:
         """
         Create a new certification.
-        
+
         Args:
             employee_id: ID of the employee
             employee_name: Name of the employee
             employee_email: Email of the employee
             data: Certification creation data
-            file_path: Optional path to uploaded file
-            
+            upload: Optional stored upload (already holds a blob reference)
+
         Returns:
             Created certification response
         """
-        return CertificationRepository.create(
-            employee_id=employee_id,
-            employee_name=employee_name,
-            employee_email=employee_email,
-            vendor_oem=data.vendor_oem,
-            certification_name=data.certification_name,
-            credential_id=data.credential_id,
-            date_obtained=data.date_obtained,
-            expiry_date=data.expiry_date,
-            file_path=file_path,
-        )
+        try:
+            return CertificationRepository.create(
+                employee_id=employee_id,
+                employee_name=employee_name,
+                employee_email=employee_email,
+                vendor_oem=data.vendor_oem,
+                certification_name=data.certification_name,
+                credential_id=data.credential_id,
+                date_obtained=data.date_obtained,
+                expiry_date=data.expiry_date,
+                file_path=upload.path if upload else None,
+                file_sha256=upload.sha256 if upload else None,
+                file_mime_type=upload.mime_type if upload else None,
+            )
+        except Exception:
+            # Give back the reference taken by save_upload_file
+            if upload:
+                BlobRepository.release(upload.sha256, _unlink_blob)
+            raise
 
     @staticmethod
     def get_certification(cert_id: str) -> Optional[CertificationResponse]:
@@ -65,6 +86,16 @@ class CertificationService:
         """Get all certifications (manager view)."""
         return CertificationRepository.get_all()
 
+    @staticmethod
+    def get_employee_certifications_json(employee_id: int) -> bytes:
+        """Get an employee's certifications, pre-serialized for list responses."""
+        return CertificationRepository.get_by_employee_json(employee_id)
+
+    @staticmethod
+    def get_all_certifications_json() -> bytes:
+        """Get all certifications, pre-serialized for list responses."""
+        return CertificationRepository.get_all_json()
+
     @staticmethod
     def validate_certification(
         cert_id: str,
@@ -72,11 +103,11 @@ class CertificationService:
     ) -> Optional[CertificationResponse]:
         """
         Validate a certification.
-        
+
         Args:
             cert_id: Certification ID
             validated_by: ID of the manager validating
-            
+
         Returns:
             Updated certification or None if not found
         """
@@ -84,36 +115,137 @@ class CertificationService:
 
     @staticmethod
     def delete_certification(cert_id: str) -> bool:
-        """Delete a certification."""
-        return CertificationRepository.delete(cert_id)
+        """Delete a certification and release its file blob."""
+        cert = CertificationRepository.get_by_id(cert_id)
+        if not cert:
+            return False
+
+        deleted = CertificationRepository.delete(cert_id)
+        if deleted and cert.file_sha256:
+            BlobRepository.release(cert.file_sha256, _unlink_blob)
+        return deleted
 
     @staticmethod
-    def save_upload_file(
-        file_content: bytes,
-        filename: str,
-        employee_id: int,
-    ) -> str:
+    async def save_upload_file(
+        file: UploadFile,
+        max_size: int,
+        allowed_types: list[str],
+    ) -> StoredUpload:
         """
-        Save uploaded file and return the path.
-        
+        Stream an uploaded file into the content-addressed blob store.
+
+        The type is sniffed from the first chunk's magic bytes, and anything
+        not in allowed_types is rejected before a byte is written or the
+        rest of the file is read. Chunks are written to a temp file from the
+        threadpool while the size and SHA-256 are tracked incrementally, so
+        memory stays at one chunk per upload. If a blob with the same hash
+        already exists the temp file is dropped and only its reference count
+        goes up; otherwise the temp file is fsynced and renamed into place
+        atomically.
+
+        The returned upload holds a blob reference; pass it to
+        create_certification, which releases it if the insert fails.
+
         Args:
-            file_content: Raw file bytes
-            filename: Original filename
-            employee_id: Employee ID for directory
-            
+            file: Uploaded file
+            max_size: Maximum file size in bytes
+            allowed_types: MIME types accepted after sniffing
+
         Returns:
-            Relative file path
+            Stored upload with blob path, size, SHA-256 and detected type
+
+        Raises:
+            UnsupportedFileTypeError: If the content is not an allowed type
+            UploadTooLargeError: If the file exceeds max_size
         """
-        upload_dir = Path(settings.UPLOAD_DIR) / str(employee_id)
-        upload_dir.mkdir(parents=True, exist_ok=True)
+        chunk = await file.read(max(UPLOAD_CHUNK_SIZE, SNIFF_BYTES))
+        mime_type = sniff_mime_type(chunk)
+        if mime_type not in allowed_types:
+            raise UnsupportedFileTypeError(mime_type)
+
+        upload_root = Path(settings.UPLOAD_DIR)
+        tmp = await run_in_threadpool(_open_temp_file, upload_root / ".tmp")
+
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            while chunk:
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLargeError(max_size)
+                await run_in_threadpool(_write_chunk, tmp, digest, chunk)
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+
+            sha256 = digest.hexdigest()
+            ext = MIME_EXTENSIONS.get(mime_type, "")
+            blob_path = upload_root / "blobs" / sha256[:2] / f"{sha256}{ext}"
+
+            path, _ = await run_in_threadpool(_store_blob, tmp, sha256, blob_path, size)
+        finally:
+            await run_in_threadpool(_discard_temp_file, tmp)
+
+        UPLOAD_BYTES.observe(size)
+        return StoredUpload(
+            path=path,
+            size_bytes=size,
+            sha256=sha256,
+            mime_type=mime_type,
+        )
+
+
+class UnsupportedFileTypeError(Exception):
+    """Raised when an upload's magic bytes match no allowed type."""
+
+    def __init__(self, detected: Optional[str]):
+        super().__init__(f"Unsupported file type: {detected or 'unknown'}")
+        self.detected = detected
+
+
+class UploadTooLargeError(Exception):
+    """Raised when a streamed upload exceeds the size limit."""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"Upload exceeds {max_size} bytes")
+        self.max_size = max_size
+
+
+def _open_temp_file(tmp_dir: Path) -> BinaryIO:
+    """Create a temp file on the same filesystem as the blob store."""
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    return tempfile.NamedTemporaryFile(dir=tmp_dir, prefix="upload-", delete=False)
+
+
+def _write_chunk(tmp: BinaryIO, digest: "hashlib._Hash", chunk: bytes) -> None:
+    """Hash and write one chunk (runs in the threadpool)."""
+    digest.update(chunk)
+    tmp.write(chunk)
+
+
+def _store_blob(tmp: BinaryIO, sha256: str, blob_path: Path, size: int) -> tuple[str, int]:
+    """Take a blob reference, moving the temp file into place if it is new."""
+    tmp.flush()
+    if not blob_path.exists():
+        # Likely a new blob: fsync outside the database write lock
+        os.fsync(tmp.fileno())
+
+    def materialize(path: str) -> None:
+        target = Path(path)
+        if target.exists():
+            return  # Duplicate content; the temp file is discarded
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp.close()
+        os.replace(tmp.name, target)
+
+    return BlobRepository.acquire(sha256, str(blob_path), size, materialize)
+
 
-        # Generate unique filename
-        import uuid
-        ext = Path(filename).suffix
-        unique_name = f"{uuid.uuid4()}{ext}"
-        file_path = upload_dir / unique_name
+def _discard_temp_file(tmp: BinaryIO) -> None:
+    """Close and remove the temp file if it was not moved into the store."""
+    tmp.close()
+    Path(tmp.name).unlink(missing_ok=True)
 
-        with open(file_path, "wb") as f:
-            f.write(file_content)
 
-        return str(file_path)
+def _unlink_blob(path: str) -> None:
+    """Remove a blob file and its derivatives once the last reference is gone."""
+    Path(path).unlink(missing_ok=True)
+    PreviewService.remove_derivatives(Path(path).stem)
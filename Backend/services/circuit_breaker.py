@@ -0,0 +1,112 @@
+"""Circuit breaker for calls to unreliable upstream services."""
+
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger("certtrack.circuit_breaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit open; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with half-open probing.
+
+    - closed: calls pass; ``failure_threshold`` consecutive failures open it
+    - open: calls are rejected until ``reset_timeout`` has elapsed
+    - half_open: a single probe call is let through; success closes the
+      circuit, failure re-opens it for another ``reset_timeout``
+
+    State is per process and only touched from the event loop, so no lock
+    is needed.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def raise_if_open(self) -> None:
+        """
+        Cheap pre-check that rejects without changing state.
+
+        Lets callers fail fast before queueing for a resource; the call must
+        still be admitted with before_call() once it is about to go out.
+
+        Raises:
+            CircuitOpenError: If the circuit is open and not yet due a probe
+        """
+        if self.state == OPEN:
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(self.name, remaining)
+
+    def before_call(self) -> bool:
+        """
+        Admit or reject a call.
+
+        Returns:
+            True if this call is the half-open probe
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a
+                probe already in flight
+        """
+        if self.state == CLOSED:
+            return False
+
+        remaining = self._opened_at + self.reset_timeout - time.monotonic()
+        if self.state == OPEN and remaining <= 0:
+            self._transition(HALF_OPEN)
+
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        raise CircuitOpenError(self.name, max(remaining, 0.0))
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        self.failures = 0
+        self._probe_in_flight = False
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a failed call (error or deadline exceeded)."""
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            if self.state != OPEN:
+                self._transition(OPEN)
+
+    def release_probe(self) -> None:
+        """Give up a half-open probe that ended without a verdict (e.g. cancelled)."""
+        self._probe_in_flight = False
+
+    def retry_after(self) -> Optional[float]:
+        """Seconds until the next probe is allowed, or None when closed."""
+        if self.state == CLOSED:
+            return None
+        return max(self._opened_at + self.reset_timeout - time.monotonic(), 0.0)
+
+    def _transition(self, state: str) -> None:
+        logger.warning("Circuit %s: %s -> %s", self.name, self.state, state)
+        self.state = state
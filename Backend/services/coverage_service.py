@@ -0,0 +1,281 @@
+"""Employee x vendor certification coverage."""
+
+import csv
+import io
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from database.repositories import CoverageRepository
+from database.repositories.coverage_repo import STATE_BITS
+from models.coverage import CoverageGap, CoverageMatrix, CoverageRow, CoverageState
+from telemetry import traced_methods
+
+# Matrix cell codes; a cell holds the best state of the employee's
+# certifications from that vendor
+STATES = (CoverageState.MISSING, CoverageState.PENDING, CoverageState.EXPIRED, CoverageState.ACTIVE)
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+
+
+def vendor_key(vendor: str) -> str:
+    """Vendors are matched ignoring case and surrounding whitespace."""
+    return vendor.strip().casefold()
+
+
+@dataclass
+class CoverageData:
+    """
+    The matrix as NumPy arrays.
+
+    Rows are employees ordered by department, so each department is the
+    contiguous slice starting at ``department_starts[i]``.
+    """
+
+    as_of: date
+    versions: tuple[int, int]
+    employee_ids: object  # int64[E]
+    names: list[str]
+    emails: list[str]
+    departments: list[Optional[str]]  # Per row
+    department_names: list[Optional[str]]  # Distinct, in row order
+    department_starts: object  # intp[D]
+    vendors: list[str]
+    states: object  # int8[E, V] of STATE_CODES
+
+    def vendor_index(self, vendor: str) -> Optional[int]:
+        key = vendor_key(vendor)
+        for i, name in enumerate(self.vendors):
+            if vendor_key(name) == key:
+                return i
+        return None
+
+
+def build_coverage(today: date, versions: tuple[int, int]) -> CoverageData:
+    """
+    Load certifications and employees and compute the matrix.
+
+    Args:
+        today: Day that separates expired from active certifications
+        versions: Write versions read before loading (the cache key)
+
+    Returns:
+        The computed matrix
+    """
+    import numpy as np
+
+    employees = CoverageRepository.get_employees()
+    columns = CoverageRepository.get_vendor_columns(today)
+
+    employee_ids = np.fromiter((row[0] for row in employees), dtype=np.int64, count=len(employees))
+    departments = [row[3] for row in employees]
+
+    # Spellings of one vendor ("AWS", "aws ") share a column named after
+    # the most frequent one; columns are then ordered by name
+    columns = sorted(columns, key=lambda c: -len(c[1]))
+    column_of: dict[str, int] = {}
+    vendors: list[str] = []
+    for vendor, _ in columns:
+        if vendor_key(vendor) not in column_of:
+            column_of[vendor_key(vendor)] = len(vendors)
+            vendors.append(vendor.strip())
+    order = sorted(range(len(vendors)), key=lambda i: vendor_key(vendors[i]))
+    position = {vendor_key(vendors[i]): n for n, i in enumerate(order)}
+    vendors = [vendors[i] for i in order]
+
+    states = np.zeros((len(employee_ids), len(vendors)), dtype=np.int8)
+    if columns and len(employee_ids):
+        packed = np.concatenate([values for _, values in columns])
+        vendor_codes = np.repeat(
+            [position[vendor_key(vendor)] for vendor, _ in columns],
+            [len(values) for _, values in columns],
+        )
+        owners = packed >> STATE_BITS
+        # Employee id -> matrix row; certifications of deleted employees drop out
+        row_of = np.full(int(max(employee_ids.max(), owners.max())) + 1, -1, dtype=np.int64)
+        row_of[employee_ids] = np.arange(len(employee_ids))
+        rows = row_of[owners]
+        known = rows >= 0
+        np.maximum.at(
+            states,
+            (rows[known], vendor_codes[known]),
+            (packed[known] & ((1 << STATE_BITS) - 1)).astype(np.int8),
+        )
+
+    starts = [i for i in range(len(departments)) if i == 0 or departments[i] != departments[i - 1]]
+    return CoverageData(
+        as_of=today,
+        versions=versions,
+        employee_ids=employee_ids,
+        names=[row[1] for row in employees],
+        emails=[row[2] for row in employees],
+        departments=departments,
+        department_names=[departments[i] for i in starts],
+        department_starts=np.array(starts, dtype=np.intp),
+        vendors=vendors,
+        states=states,
+    )
+
+
+@traced_methods
+class CoverageService:
+    """
+    Service for the coverage matrix and gap queries.
+
+    The matrix is built once and reused until a certification or
+    employee write bumps its trigger-maintained write version (checked
+    with one small query per call) or the date changes. Each worker
+    keeps its own copy.
+    """
+
+    _lock = threading.Lock()
+    _data: Optional[CoverageData] = None
+
+    @classmethod
+    def get_data(cls) -> CoverageData:
+        """Current matrix, rebuilt if certifications or employees changed."""
+        today = date.today()
+        versions = CoverageRepository.get_write_versions()
+        data = cls._data
+        if data is not None and data.versions == versions and data.as_of == today:
+            return data
+        with cls._lock:
+            data = cls._data
+            if data is None or data.versions != versions or data.as_of != today:
+                data = cls._data = build_coverage(today, versions)
+        return data
+
+    @classmethod
+    def get_matrix(
+        cls,
+        department: Optional[str] = None,
+        vendors: Optional[list[str]] = None,
+    ) -> CoverageMatrix:
+        """
+        Coverage per employee and vendor.
+
+        Args:
+            department: Only employees of this department
+            vendors: Only these vendors (default: all)
+
+        Returns:
+            The (filtered) matrix
+        """
+        data = cls.get_data()
+        rows, names, states = cls._slice(data, department, vendors)
+        return CoverageMatrix.model_construct(
+            as_of=data.as_of,
+            vendors=names,
+            employees=[
+                CoverageRow.model_construct(
+                    employee_id=int(data.employee_ids[row]),
+                    name=data.names[row],
+                    email=data.emails[row],
+                    department=data.departments[row],
+                    coverage=[STATES[code] for code in codes],
+                )
+                for row, codes in zip(rows, states.tolist())
+            ],
+        )
+
+    @classmethod
+    def get_matrix_csv(
+        cls,
+        department: Optional[str] = None,
+        vendors: Optional[list[str]] = None,
+    ) -> str:
+        """
+        Coverage matrix as CSV: one row per employee, one column per vendor.
+
+        Args:
+            department: Only employees of this department
+            vendors: Only these vendors (default: all)
+
+        Returns:
+            CSV text with a header row
+        """
+        data = cls.get_data()
+        rows, names, states = cls._slice(data, department, vendors)
+        labels = [state.value for state in STATES]
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(["employee_id", "name", "email", "department", *names])
+        for row, codes in zip(rows, states.tolist()):
+            writer.writerow([
+                int(data.employee_ids[row]),
+                data.names[row],
+                data.emails[row],
+                data.departments[row] or "",
+                *(labels[code] for code in codes),
+            ])
+        return out.getvalue()
+
+    @classmethod
+    def get_gaps(
+        cls,
+        vendor: Optional[str] = None,
+        state: CoverageState = CoverageState.ACTIVE,
+    ) -> list[CoverageGap]:
+        """
+        Departments in which nobody reaches ``state`` for a vendor.
+
+        E.g. vendor="Azure" lists departments with zero active Azure
+        certifications. States are ordered missing < pending < expired <
+        active, so state=expired means "never certified, even lapsed".
+
+        Args:
+            vendor: Only this vendor (default: every vendor)
+            state: Minimum state that counts as covered
+
+        Returns:
+            (department, vendor) pairs without coverage
+        """
+        import numpy as np
+
+        data = cls.get_data()
+        _, names, states = cls._slice(data, None, [vendor] if vendor else None)
+        if not len(data.employee_ids):
+            return []
+        covered = (states >= STATE_CODES[state]).astype(np.int32)
+        per_department = np.add.reduceat(covered, data.department_starts, axis=0)
+        sizes = np.diff(np.append(data.department_starts, len(data.employee_ids)))
+        gaps = []
+        for d, c in zip(*np.nonzero(per_department == 0)):
+            gaps.append(CoverageGap(
+                department=data.department_names[d],
+                vendor=names[c],
+                employees=int(sizes[d]),
+            ))
+        return gaps
+
+    @staticmethod
+    def _slice(data: CoverageData, department: Optional[str], vendors: Optional[list[str]]):
+        """
+        Rows, vendor names and cell states for the filters.
+
+        Vendors nobody holds a certification from get an all-missing column.
+        """
+        import numpy as np
+
+        if department is None:
+            rows = np.arange(len(data.employee_ids))
+        elif department in data.department_names:
+            # Rows are grouped by department
+            d = data.department_names.index(department)
+            end = data.department_starts[d + 1] if d + 1 < len(data.department_starts) else len(data.employee_ids)
+            rows = np.arange(data.department_starts[d], end)
+        else:
+            rows = np.arange(0)
+
+        if not vendors:
+            return rows, data.vendors, data.states[rows]
+        names = []
+        states = np.zeros((len(rows), len(vendors)), dtype=np.int8)
+        for i, vendor in enumerate(vendors):
+            column = data.vendor_index(vendor)
+            if column is None:
+                names.append(vendor.strip())
+            else:
+                names.append(data.vendors[column])
+                states[:, i] = data.states[rows, column]
+        return rows, names, states
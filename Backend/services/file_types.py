@@ -0,0 +1,37 @@
+"""Signature-based file type detection for uploads."""
+
+from typing import Optional
+
+# Leading bytes needed to tell every supported type apart
+SNIFF_BYTES = 1024
+
+# MIME type -> stored file extension
+MIME_EXTENSIONS = {
+    "application/pdf": ".pdf",
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+}
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_JPEG_SIGNATURE = b"\xff\xd8\xff"
+_PDF_SIGNATURE = b"%PDF-"
+
+
+def sniff_mime_type(head: bytes) -> Optional[str]:
+    """
+    Detect a file's MIME type from its first bytes.
+
+    Args:
+        head: Leading bytes of the file (at least SNIFF_BYTES if available)
+
+    Returns:
+        Detected MIME type, or None if the signature is not recognized
+    """
+    if head.startswith(_PNG_SIGNATURE):
+        return "image/png"
+    if head.startswith(_JPEG_SIGNATURE):
+        return "image/jpeg"
+    # Readers accept the PDF header anywhere in the first 1024 bytes
+    if _PDF_SIGNATURE in head[:SNIFF_BYTES]:
+        return "application/pdf"
+    return None
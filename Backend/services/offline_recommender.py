@@ -0,0 +1,262 @@
+"""Offline certification recommender over the bundled catalog."""
+
+import json
+import math
+import re
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+
+from config import get_settings
+from models.advisory import (
+    AdvisoryOutput,
+    AdvisoryRequest,
+    CatalogCertification,
+    CertRecommendation,
+)
+
+settings = get_settings()
+
+BUNDLED_CATALOG = Path(__file__).with_name("cert_catalog.json")
+MAX_RECOMMENDATIONS = 5
+
+# Skills implied by held certifications count for less than stated ones
+HELD_SKILL_WEIGHT = 0.25
+# Candidates scoring below this cosine similarity are never recommended
+MIN_SCORE = 0.05
+PREREQS_MET_BOOST = 1.25
+PREREQS_MISSING_PENALTY = 0.6
+HIGH_CONFIDENCE_SCORE = 0.3
+
+STOPWORDS = frozenset({"a", "and", "for", "in", "of", "the", "to", "with"})
+# Words that never identify a certification on their own
+GENERIC_WORDS = frozenset({"cert", "certificate", "certification", "certified", "exam"})
+
+_SEPARATORS = re.compile(r"[\s\-_:,()]+")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_SEPARATORS.split(text.casefold())).strip()
+
+
+def _tokens(phrase: str) -> list[str]:
+    return [t for t in phrase.split(" ") if t and t not in STOPWORDS]
+
+
+class OfflineRecommender:
+    """
+    Ranks catalog certifications against a skill profile without any LLM.
+
+    Each certification is a TF-IDF vector over its skill tags and vendor.
+    Multi-word tags contribute the whole phrase and its words as terms, so
+    "cloud architecture" also matches a profile that only says
+    "architecture". Queries walk an inverted index (term -> postings), so a
+    lookup only touches certifications sharing a term with the profile.
+
+    Certifications the user holds, and their prerequisites, are excluded;
+    candidates whose prerequisites are all held get a boost, and advanced
+    ones with missing prerequisites a penalty. Skills implied by held
+    certifications only re-rank candidates that match a stated skill.
+    """
+
+    def __init__(self, catalog: list[CatalogCertification], synonyms: dict[str, str]):
+        self.catalog = catalog
+        self.synonyms = {_normalize(k): _normalize(v) for k, v in synonyms.items()}
+        self._by_name = {cert.name: i for i, cert in enumerate(catalog)}
+
+        # Exact-name lookup for held certifications (names, codes, aliases)
+        self._held_lookup: dict[str, int] = {}
+        for i, cert in enumerate(catalog):
+            for alias in [cert.name, *cert.aliases]:
+                self._held_lookup[_normalize(alias)] = i
+        self._name_tokens = [set(_tokens(_normalize(cert.name))) for cert in catalog]
+        self._vendor_tokens = [set(_tokens(_normalize(cert.vendor))) for cert in catalog]
+
+        # Term frequencies per certification
+        doc_terms: list[dict[str, int]] = []
+        for cert in catalog:
+            counts: dict[str, int] = defaultdict(int)
+            for phrase in [*cert.skills, cert.vendor]:
+                for term in self._terms(_normalize(phrase)):
+                    counts[term] += 1
+            doc_terms.append(counts)
+
+        doc_freq: dict[str, int] = defaultdict(int)
+        for counts in doc_terms:
+            for term in counts:
+                doc_freq[term] += 1
+
+        n = len(catalog)
+        self.idf = {term: math.log((n + 1) / (df + 1)) + 1 for term, df in doc_freq.items()}
+
+        self._postings: dict[str, list[tuple[int, float]]] = defaultdict(list)
+        self._norms = [0.0] * n
+        for i, counts in enumerate(doc_terms):
+            for term, tf in counts.items():
+                weight = (1 + math.log(tf)) * self.idf[term]
+                self._postings[term].append((i, weight))
+                self._norms[i] += weight * weight
+        self._norms = [math.sqrt(x) or 1.0 for x in self._norms]
+
+    @classmethod
+    def from_file(cls, path: Path) -> "OfflineRecommender":
+        """Load a catalog JSON file (``synonyms`` and ``certifications`` keys)."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(
+            catalog=[CatalogCertification.model_validate(c) for c in data["certifications"]],
+            synonyms=data.get("synonyms", {}),
+        )
+
+    def _canonical(self, phrase: str) -> str:
+        return self.synonyms.get(phrase, phrase)
+
+    def _terms(self, phrase: str) -> list[str]:
+        """Index terms of a normalized phrase: the phrase plus its words."""
+        phrase = self._canonical(phrase)
+        words = [self._canonical(t) for t in _tokens(phrase)]
+        return [phrase, *words] if len(words) > 1 else words or [phrase]
+
+    def resolve_held(self, certifications: list[str]) -> set[int]:
+        """
+        Map free-text held certifications to catalog indexes.
+
+        Exact names, exam codes and aliases match directly. Otherwise all
+        distinctive words of the text must appear in exactly one catalog
+        name (so "Azure Administrator" resolves, but "AWS Certified" does
+        not).
+        """
+        held: set[int] = set()
+        for text in certifications:
+            normalized = _normalize(text)
+            if normalized in self._held_lookup:
+                held.add(self._held_lookup[normalized])
+                continue
+
+            words = set(_tokens(normalized)) - GENERIC_WORDS
+            matches = [
+                i for i, name_tokens in enumerate(self._name_tokens)
+                if words - self._vendor_tokens[i] and words <= name_tokens
+            ]
+            if len(matches) == 1:
+                held.add(matches[0])
+        return held
+
+    def _with_prerequisites(self, held: set[int]) -> set[int]:
+        """Held certifications plus everything they (transitively) build on."""
+        covered = set(held)
+        stack = list(held)
+        while stack:
+            for name in self.catalog[stack.pop()].prerequisites:
+                i = self._by_name.get(name)
+                if i is not None and i not in covered:
+                    covered.add(i)
+                    stack.append(i)
+        return covered
+
+    def recommend(self, request: AdvisoryRequest, limit: int = MAX_RECOMMENDATIONS) -> AdvisoryOutput:
+        """
+        Recommend certifications for a profile.
+
+        Args:
+            request: Skills and current certifications (any casing)
+            limit: Maximum number of recommendations
+
+        Returns:
+            Advisory output in the same shape the LLM produces
+        """
+        held = self.resolve_held(request.current_certifications)
+        excluded = self._with_prerequisites(held)
+
+        # Query vector: stated skills, plus skills implied by held certifications
+        query: dict[str, float] = {}
+        source: dict[str, str] = {}  # term -> stated skill it came from
+        for skill in request.skills:
+            phrase = _normalize(skill)
+            for term in self._terms(phrase):
+                query[term] = 1.0
+                source.setdefault(term, self._canonical(phrase))
+        for i in held:
+            for skill in self.catalog[i].skills:
+                for term in self._terms(_normalize(skill)):
+                    query.setdefault(term, HELD_SKILL_WEIGHT)
+
+        scores: dict[int, float] = defaultdict(float)
+        matched: dict[int, list[str]] = defaultdict(list)
+        query_norm = 0.0
+        for term, weight in query.items():
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            q = weight * idf
+            query_norm += q * q
+            for i, d in self._postings[term]:
+                scores[i] += q * d
+                if term in source:
+                    matched[i].append(source[term])
+        query_norm = math.sqrt(query_norm) or 1.0
+
+        ranked: list[tuple[float, int]] = []
+        for i, dot in scores.items():
+            # Held certifications only refine the ranking of stated-skill matches
+            if i in excluded or (source and not matched[i]):
+                continue
+            score = dot / (query_norm * self._norms[i])
+            prerequisites = [self._by_name.get(p) for p in self.catalog[i].prerequisites]
+            if prerequisites and all(p in held for p in prerequisites):
+                score *= PREREQS_MET_BOOST
+            elif self.catalog[i].difficulty == "Advanced" and any(
+                p not in excluded for p in prerequisites
+            ):
+                score *= PREREQS_MISSING_PENALTY
+            if score >= MIN_SCORE:
+                ranked.append((score, i))
+        ranked.sort(key=lambda item: (-item[0], self.catalog[item[1]].name))
+        ranked = ranked[:limit]
+
+        if not ranked:
+            return AdvisoryOutput(
+                recommendations=[],
+                confidence="low",
+                clarification_needed=(
+                    "No catalog certifications match these skills. "
+                    "Which technologies or roles are you targeting?"
+                ),
+            )
+
+        recommendations = [
+            CertRecommendation(
+                certification_name=self.catalog[i].name,
+                vendor=self.catalog[i].vendor,
+                difficulty=self.catalog[i].difficulty,
+                reason=self._reason(i, matched[i], held),
+                estimated_prep_time=self.catalog[i].prep_time,
+            )
+            for _, i in ranked
+        ]
+        confident = ranked[0][0] >= HIGH_CONFIDENCE_SCORE and len(ranked) >= 3
+        return AdvisoryOutput(
+            recommendations=recommendations,
+            confidence="high" if confident else "medium",
+        )
+
+    def _reason(self, i: int, matched: list[str], held: set[int]) -> str:
+        """Short explanation built from the matched skills and held prerequisites."""
+        cert = self.catalog[i]
+        skills = list(dict.fromkeys(matched))[:3]
+        parts = []
+        if skills:
+            parts.append(f"Matches your experience with {', '.join(skills)}.")
+        built_on = [p for p in cert.prerequisites if self._by_name.get(p) in held]
+        if built_on:
+            parts.append(f"Builds on your {built_on[0]}.")
+        elif cert.difficulty == "Beginner":
+            parts.append("A good entry point with no prerequisites.")
+        if not parts:
+            parts.append("Related to the skills covered by your current certifications.")
+        return " ".join(parts)[:200]
+
+
+@lru_cache()
+def get_offline_recommender() -> OfflineRecommender:
+    """Recommender over ADVISORY_CATALOG_PATH, or the bundled catalog."""
+    return OfflineRecommender.from_file(Path(settings.ADVISORY_CATALOG_PATH or BUNDLED_CATALOG))
@@ -0,0 +1,182 @@
+"""Background thumbnail and preview generation for uploaded certificates."""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from config import get_settings
+from database.repositories import CertificationRepository
+
+settings = get_settings()
+logger = logging.getLogger("certtrack.previews")
+
+# Images smaller than this (and within PREVIEW_MAX_PX) are served as-is
+RECOMPRESS_MIN_BYTES = 512 * 1024
+
+
+class PreviewService:
+    """
+    Generates small derivatives of uploaded files off the request path.
+
+    Rendering runs in a process pool so Pillow/pdfium never hold the GIL of
+    the serving process. Derivatives are keyed by the blob's SHA-256, so
+    duplicate uploads reuse what was already rendered.
+    """
+
+    _pool: Optional[ProcessPoolExecutor] = None
+    _tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def derivative_paths(sha256: str) -> tuple[Path, Path]:
+        """Return (thumbnail_path, preview_path) for a blob."""
+        base = Path(settings.UPLOAD_DIR) / "previews" / sha256[:2]
+        return base / f"{sha256}-thumb.webp", base / f"{sha256}-preview.webp"
+
+    @classmethod
+    def schedule(cls, cert_id: str, file_path: str, sha256: str, mime_type: str) -> None:
+        """
+        Queue derivative generation for a new certification.
+
+        Args:
+            cert_id: Certification to attach the derivatives to
+            file_path: Blob path of the original upload
+            sha256: Content hash of the upload
+            mime_type: Sniffed MIME type of the upload
+        """
+        if not settings.PREVIEWS_ENABLED:
+            return
+
+        task = asyncio.create_task(cls._generate(cert_id, file_path, sha256, mime_type))
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+
+    @classmethod
+    async def _generate(cls, cert_id: str, file_path: str, sha256: str, mime_type: str) -> None:
+        """Render derivatives in the pool and record them on the certification."""
+        thumb_path, preview_path = cls.derivative_paths(sha256)
+        try:
+            loop = asyncio.get_running_loop()
+            thumbnail, preview = await loop.run_in_executor(
+                cls._get_pool(),
+                render_derivatives,
+                file_path,
+                mime_type,
+                str(thumb_path),
+                str(preview_path),
+                settings.THUMBNAIL_SIZE_PX,
+                settings.PREVIEW_MAX_PX,
+            )
+            await run_in_threadpool(
+                CertificationRepository.set_previews, cert_id, thumbnail, preview
+            )
+        except Exception:
+            logger.exception("Preview generation failed for %s", cert_id)
+
+    @classmethod
+    def _get_pool(cls) -> ProcessPoolExecutor:
+        if cls._pool is None:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            cls._pool = ProcessPoolExecutor(
+                max_workers=settings.PREVIEW_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return cls._pool
+
+    @classmethod
+    def remove_derivatives(cls, sha256: str) -> None:
+        """Delete derivatives of a blob that is no longer referenced."""
+        for path in cls.derivative_paths(sha256):
+            path.unlink(missing_ok=True)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the worker pool (pending renders are dropped)."""
+        if cls._pool is not None:
+            cls._pool.shutdown(wait=False, cancel_futures=True)
+            cls._pool = None
+
+
+def render_derivatives(
+    file_path: str,
+    mime_type: str,
+    thumb_path: str,
+    preview_path: str,
+    thumb_size: int,
+    preview_max_px: int,
+) -> tuple[Optional[str], Optional[str]]:
+    """
+    Render a thumbnail and, where useful, a preview (runs in a worker process).
+
+    PDFs get a first-page preview; images get a recompressed preview only
+    when the original is oversized. Existing outputs are reused.
+
+    Returns:
+        Tuple of (thumbnail path or None, preview path or None)
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None, None  # Pillow not installed; previews are optional
+
+    thumb = Path(thumb_path)
+    preview = Path(preview_path)
+    if thumb.exists():
+        return str(thumb), (str(preview) if preview.exists() else None)
+
+    if mime_type == "application/pdf":
+        try:
+            import pypdfium2
+        except ImportError:
+            return None, None
+        pdf = pypdfium2.PdfDocument(file_path)
+        try:
+            page = pdf[0]
+            scale = preview_max_px / max(page.get_size())
+            image = page.render(scale=min(scale, 2.0)).to_pil()
+        finally:
+            pdf.close()
+        needs_preview = True
+    else:
+        image = Image.open(file_path)
+        image.load()
+        needs_preview = (
+            max(image.size) > preview_max_px
+            or Path(file_path).stat().st_size > RECOMPRESS_MIN_BYTES
+        )
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+    thumb.parent.mkdir(parents=True, exist_ok=True)
+    preview_result = None
+    if needs_preview:
+        large = image.copy()
+        large.thumbnail((preview_max_px, preview_max_px))
+        _save_atomic(large, preview, quality=80)
+        preview_result = str(preview)
+
+    image.thumbnail((thumb_size, thumb_size))
+    _save_atomic(image, thumb, quality=70)
+    return str(thumb), preview_result
+
+
+def _save_atomic(image, path: Path, quality: int) -> None:
+    """Write WebP to a temp name and rename, so readers never see partial files."""
+    # Unique name: renders of the same blob may run at the same time
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f"{path.stem}-", suffix=".tmp", delete=False
+    ) as f:
+        tmp = Path(f.name)
+    try:
+        image.save(tmp, format="WEBP", quality=quality, method=4)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
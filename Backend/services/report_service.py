@@ -0,0 +1,31 @@
+"""Department reporting service."""
+
+from datetime import date
+
+from database.repositories import ReportRepository
+from models.report import (
+    DepartmentBacklog,
+    DepartmentExpiringCount,
+    DepartmentStatusCounts,
+)
+from telemetry import traced_methods
+
+
+@traced_methods
+class ReportService:
+    """Service for department-level certification reports."""
+
+    @staticmethod
+    def get_department_status() -> list[DepartmentStatusCounts]:
+        """Certification counts by status per department, as of today."""
+        return ReportRepository.get_status_counts(date.today())
+
+    @staticmethod
+    def get_department_expiring(days: int) -> list[DepartmentExpiringCount]:
+        """Validated certifications per department expiring within `days` days."""
+        return ReportRepository.get_expiring_counts(date.today(), days)
+
+    @staticmethod
+    def get_department_backlog() -> list[DepartmentBacklog]:
+        """Certifications per department waiting for validation."""
+        return ReportRepository.get_backlog()
@@ -0,0 +1,218 @@
+"""Background garbage collection of orphaned upload files."""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from pathlib import Path, PurePath
+from typing import Iterator, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from config import get_settings
+from database.repositories import BlobRepository, MaintenanceRepository
+from models.upload import GCReport
+
+settings = get_settings()
+logger = logging.getLogger("certtrack.upload_gc")
+
+CURSOR_KEY = "upload_gc.cursor"
+LEASE_NAME = "upload_gc"
+
+
+class UploadGarbageCollector:
+    """
+    Reconciles the upload tree against the database and reclaims orphans.
+
+    The tree is walked in a fixed order, one small batch at a time, with a
+    pause between batches to cap I/O. The position is persisted after every
+    batch, so a pass resumes where it stopped after a restart. Only the
+    worker holding the lease sweeps.
+
+    What counts as referenced depends on where a file lives:
+    - ``.tmp/``: never (leftovers of failed uploads)
+    - ``blobs/`` and ``previews/``: the SHA-256 has an upload_blobs row
+    - anything else (legacy per-employee files): a certification's file_path
+      ends in the file's location under the upload root, so renaming or
+      moving UPLOAD_DIR (or starting from another directory) keeps them
+    """
+
+    _task: Optional[asyncio.Task] = None
+    _owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    @classmethod
+    def start(cls) -> None:
+        """Start the periodic sweeper in the background."""
+        if settings.GC_ENABLED and cls._task is None:
+            cls._task = asyncio.create_task(cls._run_forever())
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Cancel the sweeper."""
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    async def _run_forever(cls) -> None:
+        lease_ttl = settings.GC_INTERVAL_SECONDS * 2
+        while True:
+            try:
+                if await run_in_threadpool(
+                    MaintenanceRepository.try_acquire_lease, LEASE_NAME, cls._owner, lease_ttl
+                ):
+                    await cls.run_pass()
+            except Exception:
+                logger.exception("Upload GC pass failed")
+            await asyncio.sleep(settings.GC_INTERVAL_SECONDS)
+
+    @classmethod
+    async def run_pass(cls) -> GCReport:
+        """
+        Sweep the upload tree once, resuming from the stored cursor.
+
+        Returns:
+            Counts and bytes reclaimed during this pass
+        """
+        report = GCReport()
+        started = time.monotonic()
+        root = Path(settings.UPLOAD_DIR)
+        cursor = await run_in_threadpool(MaintenanceRepository.get_state, CURSOR_KEY)
+        # Legacy paths are no longer created, so one snapshot serves the pass;
+        # removals are still re-checked under the write lock
+        legacy = await run_in_threadpool(_legacy_locations)
+
+        while True:
+            batch = await run_in_threadpool(
+                _next_batch, root, _parse_cursor(cursor), settings.GC_BATCH_SIZE
+            )
+            if not batch:
+                break
+
+            reclaimed, freed = await run_in_threadpool(_reclaim_batch, root, batch, legacy)
+            report.files_scanned += len(batch)
+            report.orphans_reclaimed += reclaimed
+            report.bytes_reclaimed += freed
+
+            cursor = "/".join(batch[-1][0])
+            await run_in_threadpool(MaintenanceRepository.set_state, CURSOR_KEY, cursor)
+            await asyncio.sleep(settings.GC_BATCH_PAUSE_SECONDS)
+
+        # Pass complete; the next one starts from the top
+        await run_in_threadpool(MaintenanceRepository.set_state, CURSOR_KEY, None)
+
+        report.duration_seconds = round(time.monotonic() - started, 3)
+        logger.info(
+            "Upload GC pass: scanned=%d reclaimed=%d bytes_reclaimed=%d in %.1fs",
+            report.files_scanned,
+            report.orphans_reclaimed,
+            report.bytes_reclaimed,
+            report.duration_seconds,
+        )
+        return report
+
+
+def _parse_cursor(cursor: Optional[str]) -> tuple[str, ...]:
+    return tuple(cursor.split("/")) if cursor else ()
+
+
+def _walk_after(
+    directory: Path,
+    prefix: tuple[str, ...],
+    cursor: tuple[str, ...],
+) -> Iterator[tuple[tuple[str, ...], os.stat_result]]:
+    """Yield files in component order, skipping everything up to the cursor."""
+    try:
+        entries = sorted(os.scandir(directory), key=lambda e: e.name)
+    except FileNotFoundError:
+        return
+
+    for entry in entries:
+        parts = prefix + (entry.name,)
+        if entry.is_dir(follow_symlinks=False):
+            # Whole subtree sorts before the cursor unless the cursor is inside it
+            if parts < cursor and cursor[: len(parts)] != parts:
+                continue
+            yield from _walk_after(Path(entry.path), parts, cursor)
+        elif entry.is_file(follow_symlinks=False) and parts > cursor:
+            yield parts, entry.stat(follow_symlinks=False)
+
+
+def _next_batch(
+    root: Path,
+    cursor: tuple[str, ...],
+    size: int,
+) -> list[tuple[tuple[str, ...], os.stat_result]]:
+    """Collect the next batch of files after the cursor."""
+    batch = []
+    for item in _walk_after(root, (), cursor):
+        batch.append(item)
+        if len(batch) >= size:
+            break
+    return batch
+
+
+def _blob_hash(parts: tuple[str, ...]) -> Optional[str]:
+    """SHA-256 a blob or derivative file belongs to, from its name."""
+    if parts[0] in ("blobs", "previews"):
+        return parts[-1].split(".")[0].split("-")[0]
+    return None
+
+
+def _legacy_location(path: str) -> tuple[str, ...]:
+    """Employee directory and file name of a legacy path, whatever its root."""
+    return PurePath(path).parts[-2:]
+
+
+def _legacy_locations() -> set[tuple[str, ...]]:
+    return {_legacy_location(path) for path in BlobRepository.get_legacy_file_paths()}
+
+
+def _reclaim_batch(
+    root: Path,
+    batch: list[tuple[tuple[str, ...], os.stat_result]],
+    legacy: set[tuple[str, ...]],
+) -> tuple[int, int]:
+    """Reclaim the orphans in one batch; returns (count, bytes)."""
+    cutoff = time.time() - settings.GC_GRACE_SECONDS
+    candidates = [
+        (str(root.joinpath(*parts)), parts, stat)
+        for parts, stat in batch
+        if stat.st_mtime < cutoff
+    ]
+
+    known_hashes = BlobRepository.find_known_hashes(
+        [h for _, parts, _ in candidates if (h := _blob_hash(parts))]
+    )
+
+    reclaimed = 0
+    freed = 0
+    for path, parts, stat in candidates:
+        sha256 = _blob_hash(parts)
+        if sha256 is not None:
+            if sha256 in known_hashes:
+                continue
+        elif parts[0] != ".tmp" and parts[-2:] in legacy:
+            continue
+
+        if parts[0] == ".tmp":
+            Path(path).unlink(missing_ok=True)
+            removed = True
+        else:
+            removed = BlobRepository.reclaim_if_orphaned(
+                path,
+                sha256,
+                lambda p: Path(p).unlink(missing_ok=True),
+                location=None if sha256 else "/".join(parts),
+            )
+
+        if removed:
+            reclaimed += 1
+            freed += stat.st_size
+
+    return reclaimed, freed
@@ -0,0 +1,53 @@
+"""Telemetry package for CertTrack."""
+
+from .instruments import (
+    BCRYPT_DURATION,
+    DB_CONNECTION_DURATION,
+    DB_QUERY_BUDGET_EXCEEDED,
+    DB_QUERY_DURATION,
+    HTTP_REQUEST_DURATION,
+    LLM_REJECTIONS,
+    LLM_REQUEST_DURATION,
+    LOG_RECORDS_DROPPED,
+    RATE_LIMIT_REJECTIONS,
+    TRACE_SPANS_DROPPED,
+    UPLOAD_BYTES,
+    render_metrics,
+    start_metrics_export,
+    stop_metrics_export,
+)
+from .logs import configure_logging, current_request_id, stop_logging
+from .metrics import CONTENT_TYPE, Counter, Histogram
+from .queries import QueryStats, current_query_stats, track_queries
+from .tracing import span, start_tracing, stop_tracing, traced, traced_methods
+
+__all__ = [
+    "BCRYPT_DURATION",
+    "DB_CONNECTION_DURATION",
+    "DB_QUERY_BUDGET_EXCEEDED",
+    "DB_QUERY_DURATION",
+    "HTTP_REQUEST_DURATION",
+    "LLM_REJECTIONS",
+    "LLM_REQUEST_DURATION",
+    "LOG_RECORDS_DROPPED",
+    "RATE_LIMIT_REJECTIONS",
+    "TRACE_SPANS_DROPPED",
+    "UPLOAD_BYTES",
+    "render_metrics",
+    "start_metrics_export",
+    "stop_metrics_export",
+    "configure_logging",
+    "current_request_id",
+    "stop_logging",
+    "CONTENT_TYPE",
+    "Counter",
+    "Histogram",
+    "QueryStats",
+    "current_query_stats",
+    "track_queries",
+    "span",
+    "start_tracing",
+    "stop_tracing",
+    "traced",
+    "traced_methods",
+]
@@ -0,0 +1,97 @@
+"""
+Application metrics and their export.
+
+Metric names follow Prometheus conventions (base units, ``_total`` for
+counters). Route labels are path templates, never raw paths, so label
+cardinality stays bounded.
+"""
+
+from typing import Optional
+
+from config import get_settings
+
+from .metrics import REGISTRY, Counter, Histogram, MultiprocessExporter, merge_snapshots, render
+
+settings = get_settings()
+
+HTTP_REQUEST_DURATION = Histogram(
+    "certtrack_http_request_duration_seconds",
+    "HTTP request duration by route template and status",
+    ("method", "route", "status"),
+)
+DB_QUERY_DURATION = Histogram(
+    "certtrack_db_query_duration_seconds",
+    "SQLite statement execution time until the first row is available",
+    ("operation",),
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+DB_CONNECTION_DURATION = Histogram(
+    "certtrack_db_connection_duration_seconds",
+    "Time a SQLite connection was held open by get_db, including the commit",
+)
+DB_QUERY_BUDGET_EXCEEDED = Counter(
+    "certtrack_db_query_budget_exceeded_total",
+    "Requests that ran more SQL statements than DB_QUERY_BUDGET",
+    ("route",),
+)
+BCRYPT_DURATION = Histogram(
+    "certtrack_bcrypt_duration_seconds",
+    "bcrypt hashing and verification time",
+    ("operation",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.75, 1.0, 2.0, 5.0),
+)
+LLM_REQUEST_DURATION = Histogram(
+    "certtrack_llm_request_duration_seconds",
+    "Advisory LLM call time by outcome (success, invalid_output, timeout, error, cancelled)",
+    ("mode", "outcome"),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0),
+)
+LLM_REJECTIONS = Counter(
+    "certtrack_llm_rejections_total",
+    "Advisory LLM calls refused before reaching the upstream (circuit_open, overloaded)",
+    ("reason",),
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "certtrack_rate_limit_rejections_total",
+    "Requests answered with 429 by the rate limiter",
+)
+LOG_RECORDS_DROPPED = Counter(
+    "certtrack_log_records_dropped_total",
+    "Log records dropped because the logging queue was full",
+)
+TRACE_SPANS_DROPPED = Counter(
+    "certtrack_trace_spans_dropped_total",
+    "Finished spans dropped because the export queue was full",
+)
+UPLOAD_BYTES = Histogram(
+    "certtrack_upload_bytes",
+    "Size of stored certificate uploads",
+    buckets=(16 << 10, 64 << 10, 256 << 10, 1 << 20, 2 << 20, 5 << 20, 10 << 20, 25 << 20),
+)
+
+_exporter: Optional[MultiprocessExporter] = None
+
+
+def start_metrics_export() -> None:
+    """Start sharing totals with the other workers (METRICS_MULTIPROC_DIR)."""
+    global _exporter
+    if settings.METRICS_MULTIPROC_DIR and _exporter is None:
+        _exporter = MultiprocessExporter(
+            settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_SECONDS
+        )
+        _exporter.start()
+
+
+def stop_metrics_export() -> None:
+    """Write the final totals of this worker."""
+    global _exporter
+    if _exporter is not None:
+        _exporter.stop()
+        _exporter = None
+
+
+def render_metrics() -> bytes:
+    """Exposition of all workers' metrics (reads files, so call from the threadpool)."""
+    if _exporter is not None:
+        return render(_exporter.collect())
+    return render(merge_snapshots([REGISTRY.snapshot()]))
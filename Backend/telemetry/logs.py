@@ -0,0 +1,150 @@
+"""
+Non-blocking structured logging.
+
+Every record goes through a bounded in-memory queue: the logging call
+only formats the message and enqueues it, and a QueueListener thread
+does the JSON encoding and the write to stderr. When the queue is full,
+records are dropped and counted instead of blocking the event loop.
+Each record carries the ID of the request it was logged for.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from .instruments import LOG_RECORDS_DROPPED
+
+_request_id: ContextVar[Optional[str]] = ContextVar("certtrack_request_id", default=None)
+
+# LogRecord attributes that are not user-supplied ``extra`` fields
+_RESERVED = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message", "asctime", "request_id",
+}
+
+_listener: Optional[QueueListener] = None
+
+
+def current_request_id() -> Optional[str]:
+    """ID of the request being served, or None outside a request."""
+    return _request_id.get()
+
+
+def set_request_id(request_id: Optional[str]):
+    """Bind a request ID to the current context; returns the reset token."""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token) -> None:
+    _request_id.reset(token)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra`` fields become top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        elif record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = "-"
+        return super().format(record)
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """Enqueues without waiting; drops (and counts) records when the queue is full."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Runs on the logging thread: capture everything that depends on it.
+        # This is the only root handler, so the record is updated in place.
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            # Tracebacks reference live frames; render them now (errors only)
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        if getattr(record, "request_id", None) is None:
+            record.request_id = _request_id.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+def configure_logging(level: str = "INFO", fmt: str = "json", queue_size: int = 10000) -> None:
+    """
+    Route all logging through a queue to a background writer thread.
+
+    Replaces the root handlers; safe to call more than once (the previous
+    listener is stopped after draining).
+
+    Args:
+        level: Root log level name
+        fmt: "json" or "text"
+        queue_size: Records buffered before new ones are dropped
+    """
+    global _listener
+    stop_logging()
+
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+    records: queue.Queue = queue.Queue(maxsize=queue_size)
+
+    # Caller, thread and process lookups cost more than the rest of a
+    # logging call, and neither format uses them (see the logging HOWTO,
+    # "Optimization")
+    logging._srcfile = None
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_NonBlockingQueueHandler(records))
+    root.setLevel(getattr(logging, level.upper()))
+
+    _listener = QueueListener(records, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
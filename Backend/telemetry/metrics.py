@@ -0,0 +1,352 @@
+"""
+In-process metrics registry with Prometheus text exposition.
+
+Counters and histograms keep one value array per thread: recording is a
+couple of list updates by the owning thread, with no lock on the hot
+path. Readers sum the shards, which may lag a concurrent update by one
+observation. Arrays of exited threads are merged into a retired total.
+
+With several uvicorn workers each process writes its totals to a shared
+directory every few seconds (see MultiprocessExporter), and the worker
+answering /metrics merges those files with its own live values.
+"""
+
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+logger = logging.getLogger("certtrack.metrics")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers cache hits through slow LLM calls
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class _Shard:
+    """A thread's value array; held only by that thread's locals."""
+
+    __slots__ = ("values", "__weakref__")
+
+    def __init__(self, values: list[float]):
+        self.values = values
+
+
+class _Shards:
+    """
+    Per-thread value arrays of one labeled child; totals are summed on read.
+
+    Threadpool workers come and go, so when a thread exits (and its
+    thread-local shard is collected) its values are folded into a retired
+    total and the shard is dropped.
+    """
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._live: dict[int, list[float]] = {}
+        self._retired = [0.0] * size
+        self._next_id = 0
+        self._lock = threading.Lock()  # Taken once per thread, on its first update and exit
+
+    def mine(self) -> list[float]:
+        try:
+            return self._local.shard.values
+        except AttributeError:
+            values = [0.0] * self._size
+            with self._lock:
+                shard_id = self._next_id
+                self._next_id += 1
+                self._live[shard_id] = values
+            shard = _Shard(values)
+            weakref.finalize(shard, self._retire, shard_id)
+            self._local.shard = shard
+            return values
+
+    def _retire(self, shard_id: int) -> None:
+        with self._lock:
+            values = self._live.pop(shard_id)
+            self._retired = [math.fsum(pair) for pair in zip(self._retired, values)]
+
+    def total(self) -> list[float]:
+        with self._lock:
+            shards = [self._retired, *self._live.values()]
+        return [math.fsum(column) for column in zip(*shards)]
+
+
+class _CounterChild:
+    __slots__ = ("_shards",)
+
+    def __init__(self, size: int):
+        self._shards = _Shards(size)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._shards.mine()[0] += amount
+
+
+class _HistogramChild:
+    __slots__ = ("_shards", "_buckets")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self._buckets = buckets
+        # One slot per bucket plus +Inf, then the sum
+        self._shards = _Shards(len(buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        values = self._shards.mine()
+        values[bisect_left(self._buckets, value)] += 1
+        values[-1] += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of the block in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def labels(self, *values: str):
+        """Child for these label values, in labelnames order."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> list[list]:
+        """[label values, totals] per child."""
+        return [[list(key), child._shards.total()] for key, child in list(self._children.items())]
+
+    def describe(self) -> dict:
+        return {"type": self.kind, "help": self.documentation, "labelnames": list(self.labelnames)}
+
+
+class Counter(_Metric):
+    """Monotonic counter."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabeled counter."""
+        self.labels().inc(amount)
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed bucket upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        registry=None,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Observe a value on the unlabeled histogram."""
+        self.labels().observe(value)
+
+    def time(self):
+        """Time a block on the unlabeled histogram."""
+        return self.labels().time()
+
+    def describe(self) -> dict:
+        return {**super().describe(), "buckets": list(self.buckets)}
+
+
+class Registry:
+    """All metrics of the process."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+
+    def snapshot(self) -> dict:
+        """JSON-serializable totals of every metric."""
+        return {
+            name: {**metric.describe(), "samples": metric.samples()}
+            for name, metric in self._metrics.items()
+        }
+
+
+REGISTRY = Registry()
+
+
+def merge_snapshots(snapshots: list[dict]) -> dict:
+    """Sum snapshots of several processes (all metrics are cumulative)."""
+    merged: dict[str, dict] = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, {**metric, "samples": {}})
+            if metric.get("buckets") != target.get("buckets"):
+                continue  # Layout changed between deploys: skip the stale file
+            for labels, values in metric["samples"]:
+                key = tuple(labels)
+                current = target["samples"].get(key)
+                target["samples"][key] = (
+                    list(values) if current is None else [a + b for a, b in zip(current, values)]
+                )
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: list[str], values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def render(merged: dict) -> bytes:
+    """Prometheus text exposition (format 0.0.4) of merged snapshots."""
+    lines = []
+    for name, metric in sorted(merged.items()):
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        names = metric["labelnames"]
+        for labels, values in sorted(metric["samples"].items()):
+            if metric["type"] == "counter":
+                lines.append(f"{name}{_format_labels(names, labels)} {_format_value(values[0])}")
+                continue
+            cumulative = 0.0
+            for bound, count in zip([*metric["buckets"], math.inf], values):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(
+                    f"{name}_bucket{_format_labels(names, labels, le)} {_format_value(cumulative)}"
+                )
+            lines.append(f"{name}_sum{_format_labels(names, labels)} {_format_value(values[-1])}")
+            lines.append(f"{name}_count{_format_labels(names, labels)} {_format_value(cumulative)}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+class MultiprocessExporter:
+    """
+    Shares totals between the worker processes of one server.
+
+    Each worker writes ``<supervisor pid>-<pid>.json`` into the directory
+    every ``interval`` seconds and on shutdown. Workers only merge files of
+    their own supervisor; files of processes that no longer exist are
+    deleted when a worker starts, so totals restart with the server.
+    Values from other workers lag by up to one interval.
+    """
+
+    def __init__(self, directory: str, interval: float, registry: Registry = REGISTRY):
+        self.directory = Path(directory)
+        self.interval = interval
+        self.registry = registry
+        self._group = str(os.getppid())
+        self._path = self.directory / f"{self._group}-{os.getpid()}.json"
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Remove stale files and start the periodic writer thread."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in self.directory.glob("*-*.json"):
+            if not _process_exists(int(path.stem.rpartition("-")[2])):
+                path.unlink(missing_ok=True)
+        self.flush()
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer and write the final totals."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def flush(self) -> None:
+        """Atomically replace this worker's file."""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.registry.snapshot(), f)
+            os.replace(tmp, self._path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def collect(self) -> dict:
+        """Merged totals: this worker's live values plus the others' files."""
+        snapshots = [self.registry.snapshot()]
+        for path in self.directory.glob(f"{self._group}-*.json"):
+            if path == self._path:
+                continue
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue  # Removed or replaced meanwhile
+        return merge_snapshots(snapshots)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Writing metrics snapshot failed")
+
+
+def _process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
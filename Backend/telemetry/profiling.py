@@ -0,0 +1,317 @@
+"""
+On-demand profiling of individual requests.
+
+A profiled request is sampled by a background thread that reads the
+interpreter's stacks every few milliseconds (no tracing hooks, so the
+request itself runs at full speed) while tracemalloc records where
+memory is allocated. Results are written to PROFILING_DIR as:
+
+- ``<id>.cpu.folded``: collapsed stacks with sample counts
+- ``<id>.mem.folded``: collapsed allocation tracebacks with bytes still
+  allocated when the request finished
+- ``<id>.json``: request details and the top allocation sites
+
+The folded files load directly into flamegraph.pl, speedscope or
+inferno. Which requests are profiled is decided by ProfileTriggers; when
+none is armed and profiling is disabled, nothing here runs.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter as _Tally
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from starlette.routing import compile_path
+
+from config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger("certtrack.profiling")
+
+# Stack leaves of threads that are waiting for work rather than running it
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py")
+_PROFILE_ID = re.compile(r"[0-9a-f]{32}")
+
+
+def _frame_name(code) -> str:
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _fold(frame) -> str:
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _on_stack(frame, target) -> bool:
+    while frame is not None:
+        if frame is target:
+            return True
+        frame = frame.f_back
+    return False
+
+
+class StackSampler:
+    """
+    Samples the stacks that run one asyncio task.
+
+    The event-loop thread is sampled only while the task's coroutine
+    frame is on its stack, i.e. while the task is the one running. Busy threadpool threads are sampled too; they cannot
+    be told apart per request, so work that concurrent requests run in
+    the threadpool at the same time is included.
+    """
+
+    def __init__(self, task: asyncio.Task, interval: float):
+        self.task = task
+        self.loop_thread = threading.get_ident()
+        self.interval = interval
+        self.samples: _Tally = _Tally()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        task_frame = self.task.get_coro().cr_frame
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if ident == self.loop_thread:
+                    if not _on_stack(frame, task_frame):
+                        continue
+                elif os.path.basename(frame.f_code.co_filename) in _IDLE_FILES:
+                    continue
+                self.samples[_fold(frame)] += 1
+
+
+class MemoryTracer:
+    """Reference-counted tracemalloc session shared by concurrent profiles."""
+
+    _lock = threading.Lock()
+    _users = 0
+    _started = False
+
+    @classmethod
+    def acquire(cls, frames: int) -> tracemalloc.Snapshot:
+        """Start tracing if needed; returns the baseline snapshot."""
+        with cls._lock:
+            if cls._users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+                cls._started = True
+            cls._users += 1
+        return tracemalloc.take_snapshot()
+
+    @classmethod
+    def release(cls) -> None:
+        with cls._lock:
+            cls._users -= 1
+            if cls._users == 0 and cls._started:
+                tracemalloc.stop()
+                cls._started = False
+
+
+class RequestProfile:
+    """CPU and allocation profile of one request."""
+
+    def __init__(self, method: str, path: str, trigger: str, requested_by: str):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.requested_by = requested_by
+        self.route = "unmatched"
+        self.status = 500
+        self._sampler: Optional[StackSampler] = None
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._started = 0.0
+        self._duration = 0.0
+
+    def start(self) -> None:
+        """Begin profiling the calling task."""
+        self._baseline = MemoryTracer.acquire(settings.PROFILING_TRACEMALLOC_FRAMES)
+        self._sampler = StackSampler(asyncio.current_task(), settings.PROFILING_INTERVAL_MS / 1000)
+        self._started = time.perf_counter()
+        self._sampler.start()
+
+    def stop(self) -> None:
+        """End profiling and write the results (slow: run it in an executor)."""
+        self._duration = time.perf_counter() - self._started
+        self._sampler.stop()
+        try:
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            MemoryTracer.release()
+        try:
+            self._write(snapshot)
+        except Exception:
+            logger.exception("Writing profile %s failed", self.id)
+
+    def _write(self, snapshot: tracemalloc.Snapshot) -> None:
+        directory = Path(settings.PROFILING_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        snapshot = snapshot.filter_traces(ignore)
+        baseline = self._baseline.filter_traces(ignore)
+
+        cpu_lines = [f"{stack} {count}" for stack, count in self._sampler.samples.most_common()]
+        mem_lines = []
+        for stat in snapshot.compare_to(baseline, "traceback"):
+            if stat.size_diff > 0:
+                stack = ";".join(f"{os.path.basename(f.filename)}:{f.lineno}" for f in stat.traceback)
+                mem_lines.append(f"{stack} {stat.size_diff}")
+        top = [
+            {
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+            }
+            for stat in snapshot.compare_to(baseline, "lineno")[:10]
+        ]
+        summary = {
+            "id": self.id,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "duration_ms": round(self._duration * 1000, 2),
+            "cpu_samples": sum(self._sampler.samples.values()),
+            "interval_ms": settings.PROFILING_INTERVAL_MS,
+            "trigger": self.trigger,
+            "requested_by": self.requested_by,
+            "top_allocations": top,
+        }
+
+        (directory / f"{self.id}.cpu.folded").write_text("\n".join(cpu_lines) + "\n", encoding="utf-8")
+        (directory / f"{self.id}.mem.folded").write_text("\n".join(mem_lines) + "\n", encoding="utf-8")
+        # Summary last: listing only shows complete profiles
+        (directory / f"{self.id}.json").write_text(json.dumps(summary), encoding="utf-8")
+        ProfileStore.prune()
+        logger.info("Profiled %s %s in %.1f ms: %s", self.method, self.route, self._duration * 1000, self.id)
+
+
+class ProfileStore:
+    """Profiles on disk, newest first, capped at PROFILING_MAX_PROFILES."""
+
+    @staticmethod
+    def list() -> list[dict]:
+        directory = Path(settings.PROFILING_DIR)
+        if not directory.is_dir():
+            return []
+        summaries = []
+        for path in directory.glob("*.json"):
+            try:
+                summaries.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+        return sorted(summaries, key=lambda s: s["created_at"], reverse=True)
+
+    @staticmethod
+    def path(profile_id: str, kind: str) -> Optional[Path]:
+        """
+        File of one profile.
+
+        Args:
+            profile_id: Profile ID
+            kind: "cpu", "mem" or "json"
+
+        Returns:
+            The path, or None if the profile does not exist
+        """
+        if not _PROFILE_ID.fullmatch(profile_id) or kind not in ("cpu", "mem", "json"):
+            return None
+        suffix = ".json" if kind == "json" else f".{kind}.folded"
+        path = Path(settings.PROFILING_DIR) / f"{profile_id}{suffix}"
+        return path if path.is_file() else None
+
+    @staticmethod
+    def prune() -> None:
+        for summary in ProfileStore.list()[settings.PROFILING_MAX_PROFILES:]:
+            for suffix in (".json", ".cpu.folded", ".mem.folded"):
+                (Path(settings.PROFILING_DIR) / f"{summary['id']}{suffix}").unlink(missing_ok=True)
+
+
+class ProfileTriggers:
+    """
+    Routes armed for profiling and how many more requests to profile.
+
+    State is per process: with several workers, each one profiles the
+    next requests it serves (use the request header to reach all).
+    """
+
+    _lock = threading.Lock()
+    _armed: dict[tuple[str, str], dict] = {}
+
+    @classmethod
+    def arm(cls, route: str, method: str, count: int, armed_by: str) -> dict:
+        """
+        Profile the next ``count`` requests matching a route template.
+
+        Args:
+            route: Full route template, e.g. ``/certs/{cert_id}``
+            method: HTTP method, or "*" for any
+            count: Requests to profile
+            armed_by: Email of the manager arming it
+
+        Returns:
+            The trigger
+        """
+        trigger = {
+            "route": route,
+            "method": method,
+            "remaining": count,
+            "armed_by": armed_by,
+            "armed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "regex": compile_path(route)[0],
+        }
+        with cls._lock:
+            cls._armed[(route, method)] = trigger
+        return trigger
+
+    @classmethod
+    def disarm(cls, route: str, method: str) -> bool:
+        with cls._lock:
+            return cls._armed.pop((route, method), None) is not None
+
+    @classmethod
+    def active(cls) -> list[dict]:
+        with cls._lock:
+            return [{k: v for k, v in t.items() if k != "regex"} for t in cls._armed.values()]
+
+    @classmethod
+    def claim(cls, method: str, path: str) -> Optional[dict]:
+        """
+        Take one profiling slot for a request, if a trigger matches.
+
+        Returns:
+            The matching trigger, or None
+        """
+        if not cls._armed:
+            return None
+        with cls._lock:
+            for key, trigger in cls._armed.items():
+                if trigger["method"] in ("*", method) and trigger["regex"].match(path):
+                    trigger["remaining"] -= 1
+                    if trigger["remaining"] <= 0:
+                        del cls._armed[key]
+                    return trigger
+        return None
@@ -0,0 +1,36 @@
+"""Per-request SQL statistics."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+
+@dataclass
+class QueryStats:
+    """Statements and connections used while serving one request."""
+
+    queries: int = 0
+    connections: int = 0
+    seconds: float = 0.0  # Execute plus fetch time of all statements
+    slow_queries: int = 0
+
+
+# Copied into threadpool calls, which mutate the same QueryStats object
+_current: ContextVar[Optional[QueryStats]] = ContextVar("certtrack_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Stats of the request being served, or None outside a request."""
+    return _current.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count the statements run by the enclosed code."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
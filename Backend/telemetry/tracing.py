@@ -0,0 +1,328 @@
+"""
+Lightweight request tracing with OpenTelemetry-compatible export.
+
+A sampled request gets a root span (see TracingMiddleware); code
+decorated with ``traced`` and blocks in ``span()`` add child spans while
+that request's trace is current. The sampling decision is made once per
+request (head-based) and honors the sampled flag of an incoming W3C
+``traceparent`` header. Unsampled requests have no current span, so
+instrumented calls go straight through after one context lookup, and
+with tracing disabled the decorators return the functions unchanged.
+
+Finished spans are batched by a background thread and exported as
+OTLP/JSON: appended to a file (one ExportTraceServiceRequest per line,
+like the collector's file exporter) or POSTed to an OTLP/HTTP endpoint.
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from config import get_settings
+
+from .instruments import TRACE_SPANS_DROPPED
+
+settings = get_settings()
+logger = logging.getLogger("certtrack.tracing")
+
+# OTLP span kinds and status codes
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+STATUS_ERROR = 2
+
+BATCH_SIZE = 512
+BATCH_SECONDS = 2.0
+
+
+class Span:
+    """One timed operation of a trace."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns",
+                 "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int = KIND_INTERNAL):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: dict = {}
+        self.error: Optional[str] = None
+
+    def end(self) -> None:
+        self.end_ns = time.time_ns()
+        if _exporter is not None:
+            _exporter.submit(self)
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.error is not None:
+            span["status"] = {"code": STATUS_ERROR, "message": self.error}
+        return span
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("certtrack_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """Innermost open span of a sampled request, or None."""
+    return _current.get()
+
+
+def _otlp_attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def parse_traceparent(header: str) -> Optional[tuple[str, str, bool]]:
+    """(trace ID, parent span ID, sampled) from a W3C traceparent header."""
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    try:
+        if int(parts[1], 16) == 0 or int(parts[2], 16) == 0:
+            return None
+        flags = int(parts[3], 16)
+    except ValueError:
+        return None
+    return parts[1].lower(), parts[2].lower(), bool(flags & 1)
+
+
+def start_trace(name: str, traceparent: str = "") -> Optional[Span]:
+    """
+    Sample and open the root span of a request.
+
+    Returns:
+        The root span (already current), or None when not sampled
+    """
+    parent = parse_traceparent(traceparent) if traceparent else None
+    if parent is not None:
+        trace_id, parent_id, sampled = parent
+    else:
+        sampled = random.random() < settings.TRACING_SAMPLE_RATE
+        trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+    if not sampled:
+        return None
+    return Span(name, trace_id, parent_id, KIND_SERVER)
+
+
+@contextmanager
+def activate(span: Span) -> Iterator[Span]:
+    """Make span current for the block and end it afterwards."""
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        span.end()
+
+
+@contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, **attributes) -> Iterator[Optional[Span]]:
+    """Child span of the current one for the block (no-op outside a sampled request)."""
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(name, parent.trace_id, parent.span_id, kind)
+    child.attributes.update(attributes)
+    with activate(child):
+        yield child
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Decorator recording each call of a sync or async function as a span.
+
+    The function is returned unchanged when tracing is disabled.
+
+    Args:
+        name: Span name (default: the function's qualified name)
+    """
+    def decorate(func: Callable) -> Callable:
+        if not settings.TRACING_ENABLED:
+            return func
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                parent = _current.get()
+                if parent is None:
+                    return await func(*args, **kwargs)
+                with activate(Span(span_name, parent.trace_id, parent.span_id)):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            parent = _current.get()
+            if parent is None:
+                return func(*args, **kwargs)
+            with activate(Span(span_name, parent.trace_id, parent.span_id)):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+def traced_methods(cls: type) -> type:
+    """
+    Class decorator applying ``traced`` to every public method.
+
+    Meant for the static-method repository and service classes; private
+    helpers (e.g. per-row converters) are left alone.
+    """
+    if not settings.TRACING_ENABLED:
+        return cls
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_"):
+            continue
+        if isinstance(value, staticmethod):
+            setattr(cls, attr, staticmethod(traced(f"{cls.__name__}.{attr}")(value.__func__)))
+        elif isinstance(value, classmethod):
+            setattr(cls, attr, classmethod(traced(f"{cls.__name__}.{attr}")(value.__func__)))
+        elif inspect.isfunction(value):
+            setattr(cls, attr, traced(f"{cls.__name__}.{attr}")(value))
+    return cls
+
+
+class SpanExporter:
+    """Batches finished spans on a background thread and writes them as OTLP/JSON."""
+
+    def __init__(self, kind: str, file_path: str, endpoint: str, service_name: str,
+                 max_queue: int = 10000):
+        if kind not in ("file", "otlp"):
+            raise ValueError(f"Unknown tracing exporter: {kind}")
+        self.kind = kind
+        self.file_path = Path(file_path)
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        if self.kind == "file":
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Export what is queued and stop the thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            TRACE_SPANS_DROPPED.inc()
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch:
+                try:
+                    self._export(batch)
+                except Exception:
+                    logger.exception("Exporting %d spans failed", len(batch))
+            elif self._stop.is_set():
+                return
+
+    def _next_batch(self) -> list[Span]:
+        batch: list[Span] = []
+        deadline = time.monotonic() + BATCH_SECONDS
+        while len(batch) < BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0 or (self._stop.is_set() and self._queue.empty()):
+                break
+            try:
+                batch.append(self._queue.get(timeout=min(timeout, 0.1)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _export(self, batch: list[Span]) -> None:
+        payload = json.dumps({
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "certtrack"},
+                    "spans": [span.to_otlp() for span in batch],
+                }],
+            }],
+        }, separators=(",", ":"))
+        if self.kind == "file":
+            with open(self.file_path, "a", encoding="utf-8") as f:
+                f.write(payload + "\n")
+            return
+        request = urllib.request.Request(
+            self.endpoint,
+            data=payload.encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=10) as response:
+            response.read()
+
+
+_exporter: Optional[SpanExporter] = None
+
+
+def start_tracing() -> None:
+    """Start the span exporter (no-op unless TRACING_ENABLED)."""
+    global _exporter
+    if settings.TRACING_ENABLED and _exporter is None:
+        _exporter = SpanExporter(
+            settings.TRACING_EXPORTER,
+            settings.TRACING_FILE_PATH,
+            settings.TRACING_OTLP_ENDPOINT,
+            settings.TRACING_SERVICE_NAME,
+        )
+        _exporter.start()
+
+
+def stop_tracing() -> None:
+    """Export queued spans and stop the exporter."""
+    global _exporter
+    if _exporter is not None:
+        exporter, _exporter = _exporter, None
+        exporter.stop()
+
+
+atexit.register(stop_tracing)
@@ -0,0 +1,12 @@
+"""Test configuration: settings that must exist before the app modules import."""
+
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="certtrack-tests-")
+
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("DATABASE_PATH", os.path.join(_tmp, "certtrack.db"))
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_tmp, "uploads"))
+os.environ.setdefault("RATE_LIMIT_SQLITE_PATH", os.path.join(_tmp, "ratelimit.db"))
@@ -0,0 +1,76 @@
+"""Tests for the advisory response cache."""
+
+import asyncio
+
+import pytest
+
+from database.repositories import AdvisoryCacheRepository
+from models.advisory import AdvisoryOutput
+from services.advisory_cache import AdvisoryCache
+
+
+@pytest.fixture(autouse=True)
+def no_persistent_tier(monkeypatch):
+    monkeypatch.setattr(AdvisoryCacheRepository, "get", staticmethod(lambda key: None))
+    monkeypatch.setattr(AdvisoryCacheRepository, "set", staticmethod(lambda key, payload, expires_at: None))
+
+
+def make_cache() -> AdvisoryCache:
+    return AdvisoryCache(memory_size=10, memory_ttl=60, persistent_ttl=60)
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    async def scenario():
+        cache = make_cache()
+        release = asyncio.Event()
+        calls = 0
+        expected = AdvisoryOutput(confidence="high")
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return expected
+
+        leader = asyncio.create_task(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+
+        # E.g. the leader's client disconnected
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await follower is expected
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert calls == 1
+        assert cache.stats.coalesced == 1
+        # The shared result was cached despite the cancellation
+        assert await cache.get_or_compute("k", compute) is expected
+
+    asyncio.run(scenario())
+
+
+def test_failure_reaches_every_waiter_and_is_not_cached():
+    async def scenario():
+        cache = make_cache()
+        release = asyncio.Event()
+
+        async def failing():
+            await release.wait()
+            raise RuntimeError("upstream down")
+
+        waiters = [asyncio.create_task(cache.get_or_compute("k", failing)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        async def recovered():
+            return AdvisoryOutput()
+
+        assert await cache.get_or_compute("k", recovered) == AdvisoryOutput()
+
+    asyncio.run(scenario())
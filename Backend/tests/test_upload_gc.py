@@ -0,0 +1,67 @@
+"""Tests for the orphaned upload sweeper."""
+
+import asyncio
+import os
+import time
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from config import get_settings
+from database.migrations import create_tables
+from database.repositories import CertificationRepository, EmployeeRepository
+from models.employee import RoleEnum
+from services.upload_gc import UploadGarbageCollector
+
+settings = get_settings()
+
+
+@pytest.fixture
+def upload_root(monkeypatch) -> Path:
+    create_tables()
+    monkeypatch.setattr(settings, "GC_BATCH_PAUSE_SECONDS", 0)
+    return Path(settings.UPLOAD_DIR)
+
+
+def old_file(path: Path) -> Path:
+    """Create a file older than the grace period."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"%PDF-1.4 legacy")
+    stale = time.time() - settings.GC_GRACE_SECONDS - 60
+    os.utime(path, (stale, stale))
+    return path
+
+
+def test_legacy_files_survive_upload_dir_change(upload_root):
+    employee = EmployeeRepository.create(
+        email="legacy@example.com",
+        password_hash="x",
+        name="Legacy Owner",
+        role=RoleEnum.EMPLOYEE,
+    )
+    absolute = old_file(upload_root / str(employee.id) / "absolute_1234.pdf")
+    relative = old_file(upload_root / str(employee.id) / "relative_5678.pdf")
+    orphan = old_file(upload_root / str(employee.id) / "orphan_0000.pdf")
+
+    # Stored while UPLOAD_DIR pointed elsewhere
+    for stored in (
+        f"/srv/app/uploads/{employee.id}/{absolute.name}",
+        f"uploads/{employee.id}/{relative.name}",
+    ):
+        CertificationRepository.create(
+            employee_id=employee.id,
+            employee_name=employee.name,
+            employee_email=employee.email,
+            vendor_oem="AWS",
+            certification_name="Legacy",
+            date_obtained=date(2020, 1, 1),
+            file_path=stored,
+        )
+
+    report = asyncio.run(UploadGarbageCollector.run_pass())
+
+    assert absolute.is_file()
+    assert relative.is_file()
+    assert not orphan.exists()
+    assert report.orphans_reclaimed == 1